@@ -7,12 +7,16 @@ with sample data. It shows the basic workflow and how to interpret results.
 """
 
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import backtrader as bt
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -23,8 +27,11 @@ from sclu.utils import Config, get_logger
 # Set up logging
 logger = get_logger(__name__)
 
+# Shared by every function in this module
+_processor = DataProcessor()
 
-def create_sample_data():
+
+def create_sample_data(seed: int = 42):
     """Create sample OHLCV+OI data for demonstration."""
     logger.info("Creating sample data for demonstration...")
     
@@ -33,7 +40,7 @@ def create_sample_data():
     end_date = datetime.now()
     
     # Create 3-minute intervals
-    dates = pd.date_range(start=start_date, end=end_date, freq='3T')
+    dates = pd.date_range(start=start_date, end=end_date, freq='3min')
     
     # Filter for market hours (9:15 AM to 3:30 PM IST)
     dates = dates[
@@ -44,42 +51,34 @@ def create_sample_data():
     # Simulate realistic options data
     base_price = 50.0
     base_oi = 1000000
-    
-    data = []
-    for i, date in enumerate(dates):
-        # Simulate price movement with some trend and noise
-        price_trend = 0.1 * (i / len(dates))  # Slight upward trend
-        noise = (hash(str(date)) % 1000 - 500) / 10000  # Pseudo-random noise
-        
-        price = base_price + price_trend + noise
-        
-        # Create OHLC around the price
-        spread = 0.5
-        open_price = price + (hash(str(date) + "open") % 100 - 50) / 100
-        high_price = max(open_price, price) + spread * abs(hash(str(date) + "high") % 100) / 100
-        low_price = min(open_price, price) - spread * abs(hash(str(date) + "low") % 100) / 100
-        close_price = price
-        
-        # Simulate volume and OI
-        volume = 1000 + abs(hash(str(date) + "vol") % 5000)
-        
-        # Simulate OI with some patterns
-        oi_trend = 50000 * (i / len(dates))  # Growing OI
-        oi_noise = (hash(str(date) + "oi") % 20000 - 10000)
-        oi = max(100000, base_oi + oi_trend + oi_noise)
-        
-        data.append({
-            'datetime': date,
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'volume': int(volume),
-            'oi': int(oi)
-        })
-    
-    df = pd.DataFrame(data)
-    df.set_index('datetime', inplace=True)
+    rng = np.random.default_rng(seed)
+    n = len(dates)
+    
+    # Simulate price movement with a slight upward trend and noise
+    price = base_price + np.linspace(0, 0.1, n, endpoint=False) + rng.standard_normal(n) * 0.05
+    
+    # Create OHLC around the price
+    spread = 0.5
+    open_price = price + rng.standard_normal(n) * 0.01
+    high_price = np.maximum(open_price, price) + spread * rng.random(n)
+    low_price = np.minimum(open_price, price) - spread * rng.random(n)
+    
+    # Simulate volume and OI with a growing OI trend
+    volume = 1000 + rng.integers(0, 5000, n)
+    oi = np.maximum(100000, base_oi + np.linspace(0, 50000, n, endpoint=False) + rng.standard_normal(n) * 10000)
+    
+    # Round prices to the tick in place
+    for prices in (open_price, high_price, low_price, price):
+        np.round(prices, 2, out=prices)
+    
+    df = pd.DataFrame({
+        'open': open_price,
+        'high': high_price,
+        'low': low_price,
+        'close': price,
+        'volume': volume.astype(int),
+        'oi': oi.astype(int)
+    }, index=pd.Index(dates, name='datetime'))
     
     logger.info(f"Created {len(df)} data points from {df.index.min()} to {df.index.max()}")
     return df
@@ -93,7 +92,7 @@ def run_basic_backtest():
     data = create_sample_data()
     
     # Process the data
-    processor = DataProcessor()
+    processor = _processor
     data = processor.clean_data(data)
     data = processor.add_oi_analysis(data)
     
@@ -224,8 +223,65 @@ def run_basic_backtest():
     }
 
 
-def run_parameter_comparison():
-    """Compare different parameter sets."""
+# Sample data for parameter comparison workers, loaded once per worker process
+_worker_data = None
+
+
+def _init_worker(data_path: str) -> None:
+    """Load the shared sample data once in each worker process."""
+    global _worker_data
+    _worker_data = pd.read_pickle(data_path)
+
+
+def _run_one(params: dict) -> dict:
+    """Run a single parameter set backtest on the worker's data."""
+    logger.info(f"Testing {params['name']} parameters...")
+    
+    # Create fresh cerebro for each test
+    cerebro = bt.Cerebro()
+    
+    # Create data feed
+    data_feed = bt.feeds.PandasData(
+        dataname=_worker_data,
+        datetime=None,
+        open='open',
+        high='high',
+        low='low',
+        close='close',
+        volume='volume',
+        openinterest='oi'
+    )
+    
+    cerebro.resampledata(data_feed, timeframe=bt.TimeFrame.Minutes, compression=3)
+    
+    # Add strategy with specific parameters
+    cerebro.addstrategy(
+        SCLUStrategy,
+        sensitivity=params['sensitivity'],
+        feeling=params['feeling']
+    )
+    
+    cerebro.broker.setcash(100000.0)
+    cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
+    
+    # Run backtest
+    starting_value = cerebro.broker.getvalue()
+    cerebro.run()
+    final_value = cerebro.broker.getvalue()
+    
+    total_return = (final_value - starting_value) / starting_value
+    
+    return {
+        'name': params['name'],
+        'sensitivity': params['sensitivity'],
+        'feeling': params['feeling'],
+        'return': total_return,
+        'final_value': final_value
+    }
+
+
+def run_parameter_comparison(max_workers: Optional[int] = None):
+    """Compare different parameter sets, one backtest per worker process."""
     logger.info("Running parameter comparison...")
     
     # Different parameter sets to test
@@ -235,53 +291,19 @@ def run_parameter_comparison():
         {'sensitivity': 0.015, 'feeling': 4000000, 'name': 'Aggressive'},
     ]
     
-    results = []
     data = create_sample_data()
     
-    for params in parameter_sets:
-        logger.info(f"Testing {params['name']} parameters...")
-        
-        # Create fresh cerebro for each test
-        cerebro = bt.Cerebro()
-        
-        # Create data feed
-        data_feed = bt.feeds.PandasData(
-            dataname=data,
-            datetime=None,
-            open='open',
-            high='high',
-            low='low',
-            close='close',
-            volume='volume',
-            openinterest='oi'
-        )
-        
-        cerebro.resampledata(data_feed, timeframe=bt.TimeFrame.Minutes, compression=3)
-        
-        # Add strategy with specific parameters
-        cerebro.addstrategy(
-            SCLUStrategy,
-            sensitivity=params['sensitivity'],
-            feeling=params['feeling']
-        )
-        
-        cerebro.broker.setcash(100000.0)
-        cerebro.addanalyzer(bt.analyzers.Returns, _name='returns')
-        
-        # Run backtest
-        starting_value = cerebro.broker.getvalue()
-        result = cerebro.run()
-        final_value = cerebro.broker.getvalue()
-        
-        total_return = (final_value - starting_value) / starting_value
+    # Write the data once and let each worker load it, instead of pickling it per task
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = str(Path(tmp_dir) / "sample_data.pkl")
+        data.to_pickle(data_path)
         
-        results.append({
-            'name': params['name'],
-            'sensitivity': params['sensitivity'],
-            'feeling': params['feeling'],
-            'return': total_return,
-            'final_value': final_value
-        })
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(data_path,)
+        ) as executor:
+            results = list(executor.map(_run_one, parameter_sets))
     
     # Print comparison
     print("\n" + "="*70)
@@ -18,11 +18,32 @@ import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 
 from sclu.data import DataLoader, DataProcessor
+from sclu.kernels import (
+    REGIME_HIGH_VOLATILITY, REGIME_SIDEWAYS, REGIME_TRENDING_DOWN, REGIME_TRENDING_UP, REGIME_UNKNOWN,
+    SIGNAL_BUY, SIGNAL_SELL, _classify_regimes, _rolling_zscore, _sclu_signal_codes
+)
 from sclu.utils import get_logger
 
+try:
+    import polars as pl
+except ImportError:  # polars is optional, pandas writes the CSV without it
+    pl = None
+
 # Set up logging
 logger = get_logger(__name__)
 
+# Shared by every function in this module
+_processor = DataProcessor()
+
+# Display names for the codes returned by _classify_regimes
+REGIME_NAMES = {
+    REGIME_TRENDING_UP: 'Trending Up',
+    REGIME_TRENDING_DOWN: 'Trending Down',
+    REGIME_SIDEWAYS: 'Sideways',
+    REGIME_HIGH_VOLATILITY: 'High Volatility',
+    REGIME_UNKNOWN: 'Unknown',
+}
+
 # Optional: Set matplotlib style
 try:
     plt.style.use('seaborn-v0_8')
@@ -30,7 +51,7 @@ except:
     plt.style.use('default')
 
 
-def create_comprehensive_sample_data():
+def create_comprehensive_sample_data(seed=None):
     """Create more comprehensive sample data with various market patterns."""
     logger.info("Creating comprehensive sample data...")
     
@@ -38,13 +59,12 @@ def create_comprehensive_sample_data():
     start_date = datetime.now() - timedelta(days=60)
     end_date = datetime.now()
     
-    dates = pd.date_range(start=start_date, end=end_date, freq='1T')
+    dates = pd.date_range(start=start_date, end=end_date, freq='1min')
     
     # Filter for market hours (9:15 AM to 3:30 PM IST)
-    dates = dates[
-        (dates.hour >= 9) & 
-        ((dates.hour < 15) | ((dates.hour == 15) & (dates.minute <= 30)))
-    ]
+    hour = dates.hour.to_numpy()
+    minute = dates.minute.to_numpy()
+    dates = dates[(hour >= 9) & ((hour < 15) | ((hour == 15) & (minute <= 30)))]
     
     # Create different market regimes
     n_points = len(dates)
@@ -58,62 +78,67 @@ def create_comprehensive_sample_data():
     # Volatile period (last 1/3)
     volatile_period = n_points - trend_period - sideways_period
     
-    data = []
     base_price = 50.0
     base_oi = 1500000
-    
-    for i, date in enumerate(dates):
-        if i < trend_period:
-            # Trending market
-            price_trend = 10 * (i / trend_period)  # Strong upward trend
-            volatility = 0.5
-            oi_pattern = 100000 * (i / trend_period)  # Growing OI
-            
-        elif i < trend_period + sideways_period:
-            # Sideways market
-            j = i - trend_period
-            price_trend = 10 + 2 * np.sin(j / 10)  # Oscillating around level
-            volatility = 0.3
-            oi_pattern = 100000 + 20000 * np.sin(j / 15)  # Fluctuating OI
-            
-        else:
-            # Volatile market
-            j = i - trend_period - sideways_period
-            price_trend = 12 + 5 * np.random.normal(0, 1)  # High volatility
-            volatility = 1.5
-            oi_pattern = 120000 + 50000 * np.random.normal(0, 0.5)  # Erratic OI
-        
-        # Add noise
-        noise = np.random.normal(0, volatility)
-        price = base_price + price_trend + noise
-        
-        # Create realistic OHLC
-        spread = volatility * 0.5
-        open_price = price + np.random.normal(0, spread/4)
-        high_price = max(open_price, price) + abs(np.random.normal(0, spread/2))
-        low_price = min(open_price, price) - abs(np.random.normal(0, spread/2))
-        close_price = price
-        
-        # Volume with some correlation to price movement
-        price_change = abs(close_price - open_price)
-        volume = max(500, 1000 + 5000 * price_change + np.random.normal(0, 1000))
-        
-        # Open Interest with realistic patterns
-        oi_noise = np.random.normal(0, 10000)
-        oi = max(100000, base_oi + oi_pattern + oi_noise)
-        
-        data.append({
-            'datetime': date,
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'volume': int(volume),
-            'oi': int(oi)
-        })
-    
-    df = pd.DataFrame(data)
-    df.set_index('datetime', inplace=True)
+    rng = np.random.default_rng(seed)
+    
+    # All randomness for the series drawn up front, one contiguous row per source
+    (price_noise, open_noise, high_noise, low_noise,
+     volume_noise, oi_noise, regime_noise, regime_oi_noise) = rng.standard_normal((8, n_points))
+    
+    price_trend = np.empty(n_points)
+    volatility = np.empty(n_points)
+    oi_pattern = np.empty(n_points)
+    trend = slice(0, trend_period)
+    sideways = slice(trend_period, trend_period + sideways_period)
+    volatile = slice(trend_period + sideways_period, n_points)
+    
+    # Trending market: strong upward trend with growing OI
+    i = np.arange(trend_period)
+    price_trend[trend] = 10 * (i / trend_period)
+    volatility[trend] = 0.5
+    oi_pattern[trend] = 100000 * (i / trend_period)
+    
+    # Sideways market: oscillating around a level with fluctuating OI
+    j = np.arange(sideways_period)
+    price_trend[sideways] = 10 + 2 * np.sin(j / 10)
+    volatility[sideways] = 0.3
+    oi_pattern[sideways] = 100000 + 20000 * np.sin(j / 15)
+    
+    # Volatile market: high volatility with erratic OI
+    price_trend[volatile] = 12 + 5 * regime_noise[volatile]
+    volatility[volatile] = 1.5
+    oi_pattern[volatile] = 120000 + 50000 * 0.5 * regime_oi_noise[volatile]
+    
+    # Add noise
+    price = base_price + price_trend + volatility * price_noise
+    
+    # Create realistic OHLC
+    spread = volatility * 0.5
+    open_price = price + spread / 4 * open_noise
+    high_price = np.maximum(open_price, price) + np.abs(spread / 2 * high_noise)
+    low_price = np.minimum(open_price, price) - np.abs(spread / 2 * low_noise)
+    close_price = price
+    
+    # Volume with some correlation to price movement
+    price_change = np.abs(close_price - open_price)
+    volume = np.maximum(500, 1000 + 5000 * price_change + 1000 * volume_noise)
+    
+    # Open Interest with realistic patterns
+    oi = np.maximum(100000, base_oi + oi_pattern + 10000 * oi_noise)
+    
+    # Round prices to the tick in place
+    for prices in (open_price, high_price, low_price, close_price):
+        np.round(prices, 2, out=prices)
+    
+    df = pd.DataFrame({
+        'open': open_price,
+        'high': high_price,
+        'low': low_price,
+        'close': close_price,
+        'volume': volume.astype(np.int64),
+        'oi': oi.astype(np.int64)
+    }, index=pd.Index(dates, name='datetime'))
     
     logger.info(f"Created {len(df)} data points with multiple market regimes")
     return df
@@ -123,13 +148,13 @@ def analyze_open_interest_patterns(data):
     """Analyze Open Interest patterns and derivatives."""
     logger.info("Analyzing Open Interest patterns...")
     
-    processor = DataProcessor()
+    processor = _processor
     data = processor.add_oi_analysis(data)
     
     # Calculate additional metrics
     data['price_change'] = data['close'].pct_change()
     data['volume_ma'] = data['volume'].rolling(window=20).mean()
-    data['oi_zscore'] = (data['oi'] - data['oi'].rolling(20).mean()) / data['oi'].rolling(20).std()
+    data['oi_zscore'] = _rolling_zscore(data['oi'].to_numpy(dtype=np.float64), 20)
     
     # Analyze OI-Price relationships
     price_oi_corr = data['price_change'].corr(data['oi_pct_change'])
@@ -158,40 +183,45 @@ def analyze_strategy_signals(data):
     sensitivity = 0.01
     feeling = 3000000
     
-    # Calculate signals
-    data['buy_signal'] = (
-        (data['oi_derivative'] < 0) & 
-        (data['oi_second_derivative'] < -0.1 * sensitivity * feeling)
-    )
-    
-    data['sell_signal'] = (
-        (data['oi_derivative'] > -1 * sensitivity * feeling) |
-        (data['oi_second_derivative'] > -0.1 * sensitivity * feeling)
+    # Calculate signals in one pass over the derivative columns
+    n = len(data)
+    entry_threshold = np.broadcast_to(-0.1 * sensitivity * feeling, n)
+    exit_doi_threshold = np.broadcast_to(-1.0 * sensitivity * feeling, n)
+    data['signal'] = _sclu_signal_codes(
+        data['oi_derivative'].to_numpy(dtype=np.float64),
+        data['oi_second_derivative'].to_numpy(dtype=np.float64),
+        entry_threshold,
+        exit_doi_threshold,
+        entry_threshold
     )
+    data['buy_signal'] = (data['signal'] & SIGNAL_BUY) != 0
+    data['sell_signal'] = (data['signal'] & SIGNAL_SELL) != 0
     
     # Analyze signal frequency
-    buy_signals = data[data['buy_signal']].copy()
-    total_buy_signals = len(buy_signals)
+    buy_pos = np.flatnonzero(data['buy_signal'].to_numpy())
+    total_buy_signals = buy_pos.size
     
     print("\nSTRATEGY SIGNAL ANALYSIS")
     print("=" * 50)
     print(f"Total Buy Signals: {total_buy_signals}")
     print(f"Signal Frequency: {total_buy_signals / len(data) * 100:.2f}% of periods")
     
-    if total_buy_signals > 0:
+    if total_buy_signals > 1:
         # Analyze signal timing
-        signal_intervals = buy_signals.index.to_series().diff().dt.total_seconds() / 60
+        signal_intervals = np.diff(data.index.values[buy_pos]) / np.timedelta64(1, 'm')
         print(f"Average Signal Interval: {signal_intervals.mean():.1f} minutes")
         print(f"Min Signal Interval: {signal_intervals.min():.1f} minutes")
         print(f"Max Signal Interval: {signal_intervals.max():.1f} minutes")
-        
+    
+    if total_buy_signals > 0:
         # Analyze signal quality (next period returns)
-        buy_signals['next_return'] = data['close'].shift(-1) / data['close'] - 1
-        buy_signals = buy_signals.dropna()
+        close = data['close'].to_numpy(dtype=np.float64)
+        valid = buy_pos[buy_pos + 1 < close.size]
+        next_return = close[valid + 1] / close[valid] - 1
         
-        if len(buy_signals) > 0:
-            avg_next_return = buy_signals['next_return'].mean()
-            win_rate = (buy_signals['next_return'] > 0).mean()
+        if next_return.size > 0:
+            avg_next_return = next_return.mean()
+            win_rate = (next_return > 0).mean()
             
             print(f"Average Next-Period Return: {avg_next_return * 100:.3f}%")
             print(f"Signal Win Rate: {win_rate * 100:.1f}%")
@@ -203,19 +233,31 @@ def create_visualizations(data):
     """Create comprehensive visualizations."""
     logger.info("Creating visualizations...")
     
+    # Matplotlib is rasterization-bound above a few thousand points per line,
+    # so plot an evenly strided subset and convert each column only once
+    stride = max(1, len(data) // 5000)
+    idx = data.index.to_numpy()[::stride]
+    close = data['close'].to_numpy()[::stride]
+    volume = data['volume'].to_numpy()[::stride]
+    oi = data['oi'].to_numpy()[::stride]
+    oi_derivative = data['oi_derivative'].to_numpy()[::stride]
+    oi_second_derivative = data['oi_second_derivative'].to_numpy()[::stride]
+    oi_pct_change = data['oi_pct_change'].to_numpy()[::stride]
+    price_change = data['price_change'].to_numpy()[::stride]
+    
     fig, axes = plt.subplots(4, 1, figsize=(15, 12))
     fig.suptitle('SCLU Strategy Data Analysis', fontsize=16, fontweight='bold')
     
     # Price and volume
     ax1 = axes[0]
-    ax1.plot(data.index, data['close'], label='Close Price', color='blue', linewidth=1)
+    ax1.plot(idx, close, label='Close Price', color='blue', linewidth=1)
     ax1.set_ylabel('Price', color='blue')
     ax1.tick_params(axis='y', labelcolor='blue')
     ax1.grid(True, alpha=0.3)
     
     # Volume on secondary y-axis
     ax1_vol = ax1.twinx()
-    ax1_vol.bar(data.index, data['volume'], alpha=0.3, color='gray', width=0.8)
+    ax1_vol.fill_between(idx, 0, volume, step='mid', alpha=0.3, color='gray')
     ax1_vol.set_ylabel('Volume', color='gray')
     ax1_vol.tick_params(axis='y', labelcolor='gray')
     
@@ -224,8 +266,8 @@ def create_visualizations(data):
     
     # Open Interest
     ax2 = axes[1]
-    ax2.plot(data.index, data['oi'], label='Open Interest', color='green', linewidth=1)
-    ax2.fill_between(data.index, data['oi'], alpha=0.3, color='green')
+    ax2.plot(idx, oi, label='Open Interest', color='green', linewidth=1)
+    ax2.fill_between(idx, oi, alpha=0.3, color='green')
     ax2.set_ylabel('Open Interest')
     ax2.set_title('Open Interest Over Time')
     ax2.grid(True, alpha=0.3)
@@ -233,7 +275,7 @@ def create_visualizations(data):
     
     # OI Derivatives
     ax3 = axes[2]
-    ax3.plot(data.index, data['oi_derivative'], label='OI Derivative', color='orange', linewidth=1)
+    ax3.plot(idx, oi_derivative, label='OI Derivative', color='orange', linewidth=1)
     ax3.axhline(y=0, color='black', linestyle='--', alpha=0.5)
     ax3.set_ylabel('OI Derivative')
     ax3.set_title('Open Interest First Derivative (Rate of Change)')
@@ -242,14 +284,14 @@ def create_visualizations(data):
     
     # OI Second Derivative with signals
     ax4 = axes[3]
-    ax4.plot(data.index, data['oi_second_derivative'], label='OI Second Derivative', 
+    ax4.plot(idx, oi_second_derivative, label='OI Second Derivative', 
              color='red', linewidth=1)
     ax4.axhline(y=0, color='black', linestyle='--', alpha=0.5)
     
     # Mark buy signals
     if 'buy_signal' in data.columns:
-        buy_points = data[data['buy_signal']]
-        ax4.scatter(buy_points.index, buy_points['oi_second_derivative'], 
+        buy_mask = data['buy_signal'].to_numpy()
+        ax4.scatter(data.index.to_numpy()[buy_mask], data['oi_second_derivative'].to_numpy()[buy_mask], 
                    color='green', marker='^', s=50, label='Buy Signals', zorder=5)
     
     ax4.set_ylabel('OI Second Derivative')
@@ -266,21 +308,21 @@ def create_visualizations(data):
     fig2.suptitle('Correlation Analysis', fontsize=16, fontweight='bold')
     
     # Price vs OI
-    ax1.scatter(data['oi'], data['close'], alpha=0.5, s=1)
+    ax1.scatter(oi, close, alpha=0.5, s=1)
     ax1.set_xlabel('Open Interest')
     ax1.set_ylabel('Close Price')
     ax1.set_title('Price vs Open Interest')
     ax1.grid(True, alpha=0.3)
     
     # Price change vs OI change
-    ax2.scatter(data['oi_pct_change'], data['price_change'], alpha=0.5, s=1)
+    ax2.scatter(oi_pct_change, price_change, alpha=0.5, s=1)
     ax2.set_xlabel('OI % Change')
     ax2.set_ylabel('Price % Change')
     ax2.set_title('Price Change vs OI Change')
     ax2.grid(True, alpha=0.3)
     
     # Volume vs Price
-    ax3.scatter(data['volume'], data['close'], alpha=0.5, s=1)
+    ax3.scatter(volume, close, alpha=0.5, s=1)
     ax3.set_xlabel('Volume')
     ax3.set_ylabel('Close Price')
     ax3.set_title('Price vs Volume')
@@ -305,40 +347,40 @@ def analyze_market_regimes(data):
     # Define market regimes based on volatility and trend
     data['returns'] = data['close'].pct_change()
     data['volatility'] = data['returns'].rolling(20).std()
-    data['trend'] = data['close'].rolling(20).apply(lambda x: (x[-1] - x[0]) / x[0])
+    data['trend'] = data['close'] / data['close'].shift(19) - 1.0  # change over the 20-bar window
     
     # Classify regimes
     vol_threshold = data['volatility'].quantile(0.7)
     trend_threshold = 0.02
     
-    conditions = [
-        (data['volatility'] < vol_threshold) & (data['trend'] > trend_threshold),
-        (data['volatility'] < vol_threshold) & (data['trend'] < -trend_threshold),
-        (data['volatility'] < vol_threshold) & (abs(data['trend']) <= trend_threshold),
-        data['volatility'] >= vol_threshold
-    ]
-    
-    choices = ['Trending Up', 'Trending Down', 'Sideways', 'High Volatility']
-    data['regime'] = np.select(conditions, choices, default='Unknown')
+    codes = _classify_regimes(
+        data['volatility'].to_numpy(dtype=np.float64),
+        data['trend'].to_numpy(dtype=np.float64),
+        vol_threshold,
+        trend_threshold
+    )
+    data['regime_code'] = codes
     
     # Analyze regime distribution
-    regime_counts = data['regime'].value_counts()
+    regime_counts = np.bincount(codes, minlength=len(REGIME_NAMES))
     
     print("\nMARKET REGIME ANALYSIS")
     print("=" * 50)
-    for regime, count in regime_counts.items():
+    for code in np.argsort(-regime_counts, kind='stable'):
+        count = regime_counts[code]
+        if count == 0:
+            continue
         percentage = (count / len(data)) * 100
-        print(f"{regime}: {count} periods ({percentage:.1f}%)")
+        print(f"{REGIME_NAMES[code]}: {count} periods ({percentage:.1f}%)")
     
     # Analyze OI behavior in different regimes
     print("\nOI BEHAVIOR BY REGIME")
     print("-" * 30)
-    for regime in choices:
-        regime_data = data[data['regime'] == regime]
-        if len(regime_data) > 0:
-            avg_oi_change = regime_data['oi_pct_change'].mean()
-            avg_oi_vol = regime_data['oi_pct_change'].std()
-            print(f"{regime}:")
+    oi_stats = data.groupby('regime_code', sort=False)['oi_pct_change'].agg(['mean', 'std'])
+    for code in (REGIME_TRENDING_UP, REGIME_TRENDING_DOWN, REGIME_SIDEWAYS, REGIME_HIGH_VOLATILITY):
+        if code in oi_stats.index:
+            avg_oi_change, avg_oi_vol = oi_stats.loc[code]
+            print(f"{REGIME_NAMES[code]}:")
             print(f"  Avg OI Change: {avg_oi_change:.4f}")
             print(f"  OI Volatility: {avg_oi_vol:.4f}")
 
@@ -365,7 +407,12 @@ def main():
         
         # Save processed data for further analysis
         output_file = Path(__file__).parent / "sample_analysis_data.csv"
-        data.to_csv(output_file)
+        if pl is not None:
+            pl.from_pandas(data.reset_index()).write_csv(
+                str(output_file), datetime_format='%Y-%m-%d %H:%M:%S%.f'
+            )
+        else:
+            data.to_csv(output_file)
         print(f"\nProcessed data saved to: {output_file}")
         
         print("\n" + "=" * 50)
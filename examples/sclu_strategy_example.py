@@ -18,14 +18,51 @@ import numpy as np
 from datetime import datetime, timedelta
 
 from sclu.strategies import SCLUStrategy
+from sclu.utils.logger import setup_logging
 from sclu.data import DataLoader, DataProcessor
+from sclu.kernels import SIGNAL_BUY, SIGNAL_SELL, _sclu_signal_codes
 from sclu.utils import Config, get_logger
 
+try:
+    import polars as pl
+except ImportError:  # polars is optional, pandas is used without it
+    pl = None
+
 # Set up logging
 logger = get_logger(__name__)
 
+# Shared by every function in this module
+_processor = DataProcessor()
+
+
+# add_oi_analysis results keyed by the contents of the columns it reads
+_oi_analysis_cache = {}
+
+
+def _oi_cache_key(df):
+    """Hash the index and the columns add_oi_analysis depends on."""
+    return hash((
+        df.index.to_numpy().tobytes(),
+        df['oi'].to_numpy().tobytes(),
+        df['close'].to_numpy().tobytes()
+    ))
 
-def create_short_covering_scenario():
+
+def add_oi_analysis_cached(df):
+    """
+    Memoized DataProcessor.add_oi_analysis.
+    
+    An already analyzed frame hashes to the same key as its input, so
+    passing it back in is a cache hit instead of a recomputation.
+    """
+    key = _oi_cache_key(df)
+    if key not in _oi_analysis_cache:
+        _oi_analysis_cache[key] = _processor.add_oi_analysis(df, copy=True)
+    # Callers may modify the result, keep the cached frame untouched
+    return _oi_analysis_cache[key].copy()
+
+
+def create_short_covering_scenario(seed=None):
     """
     Create realistic data simulating a short covering event.
     Based on the Nifty 25000 CE September 12th example from the strategy document.
@@ -37,68 +74,59 @@ def create_short_covering_scenario():
     end_time = start_time.replace(hour=15, minute=30)
     
     # Create 3-minute intervals (NSE OI refresh cycle)
-    dates = pd.date_range(start=start_time, end=end_time, freq='3T')
+    dates = pd.date_range(start=start_time, end=end_time, freq='3min')
     
     # Simulate option data for short covering scenario
     base_price = 15.0  # Starting option price
     base_oi = 2500000  # Starting OI (25 lakh)
     
-    data = []
-    
-    for i, date in enumerate(dates):
-        # Create different phases of the trading day
-        total_points = len(dates)
-        
-        if i < total_points * 0.7:  # First 70% - normal trading
-            # Gradual price decline with stable OI
-            price_trend = -2 * (i / (total_points * 0.7))
-            oi_trend = -50000 * (i / (total_points * 0.7))  # Gradual OI decline
-            volatility = 0.5
-            
-        else:  # Last 30% - short covering event
-            # Explosive price movement with sharp OI decline
-            rally_progress = (i - total_points * 0.7) / (total_points * 0.3)
-            
-            # Exponential price increase
-            price_trend = -1.4 + 25 * (rally_progress ** 2)
-            
-            # Sharp OI decline (forced seller exits)
-            oi_decline = -300000 * rally_progress  # Sharp decline
-            oi_trend = -50000 + oi_decline
-            
-            volatility = 2.0  # Higher volatility during rally
-        
-        # Add realistic noise
-        price_noise = np.random.normal(0, volatility)
-        price = max(0.5, base_price + price_trend + price_noise)
-        
-        # Create OHLC around the price
-        spread = volatility * 0.3
-        open_price = max(0.5, price + np.random.normal(0, spread/4))
-        high_price = max(open_price, price) + abs(np.random.normal(0, spread/2))
-        low_price = max(0.5, min(open_price, price) - abs(np.random.normal(0, spread/2)))
-        close_price = price
-        
-        # Volume increases during short covering
-        volume_multiplier = 1.0 if i < total_points * 0.7 else (1 + 3 * rally_progress)
-        volume = int(15000 * volume_multiplier * (1 + np.random.normal(0, 0.3)))
-        
-        # Open Interest with noise
-        oi_noise = np.random.normal(0, 20000)
-        oi = max(100000, base_oi + oi_trend + oi_noise)
-        
-        data.append({
-            'datetime': date,
-            'open': round(open_price, 2),
-            'high': round(high_price, 2),
-            'low': round(low_price, 2),
-            'close': round(close_price, 2),
-            'volume': volume,
-            'oi': int(oi)
-        })
-    
-    df = pd.DataFrame(data)
-    df.set_index('datetime', inplace=True)
+    # Create different phases of the trading day
+    total_points = len(dates)
+    i = np.arange(total_points)
+    rally = i >= total_points * 0.7  # Last 30% - short covering event
+    
+    # All randomness for the series drawn up front, one contiguous row per source
+    rng = np.random.default_rng(seed)
+    price_noise, open_noise, high_noise, low_noise, volume_noise, oi_noise = rng.standard_normal((6, total_points))
+    
+    # First 70% - normal trading: gradual price decline with gradual OI decline
+    normal_progress = i / (total_points * 0.7)
+    # Last 30% - explosive price movement with sharp OI decline (forced seller exits)
+    rally_progress = (i - total_points * 0.7) / (total_points * 0.3)
+    
+    price_trend = np.where(rally, -1.4 + 25 * (rally_progress ** 2), -2 * normal_progress)
+    oi_trend = np.where(rally, -50000 - 300000 * rally_progress, -50000 * normal_progress)
+    volatility = np.where(rally, 2.0, 0.5)  # Higher volatility during rally
+    
+    # Add realistic noise
+    price = np.maximum(0.5, base_price + price_trend + volatility * price_noise)
+    
+    # Create OHLC around the price
+    spread = volatility * 0.3
+    open_price = np.maximum(0.5, price + spread / 4 * open_noise)
+    high_price = np.maximum(open_price, price) + np.abs(spread / 2 * high_noise)
+    low_price = np.maximum(0.5, np.minimum(open_price, price) - np.abs(spread / 2 * low_noise))
+    close_price = price
+    
+    # Volume increases during short covering
+    volume_multiplier = np.where(rally, 1 + 3 * rally_progress, 1.0)
+    volume = (15000 * volume_multiplier * (1 + 0.3 * volume_noise)).astype(np.int64)
+    
+    # Open Interest with noise
+    oi = np.maximum(100000, base_oi + oi_trend + 20000 * oi_noise)
+    
+    # Round prices to the tick in place
+    for prices in (open_price, high_price, low_price, close_price):
+        np.round(prices, 2, out=prices)
+    
+    df = pd.DataFrame({
+        'open': open_price,
+        'high': high_price,
+        'low': low_price,
+        'close': close_price,
+        'volume': volume,
+        'oi': oi.astype(np.int64)
+    }, index=pd.Index(dates, name='datetime'))
     
     logger.info(f"Created short covering scenario with {len(df)} data points")
     logger.info(f"Price range: {df['close'].min():.2f} to {df['close'].max():.2f}")
@@ -115,9 +143,9 @@ def run_sclu_strategy_example():
     data = create_short_covering_scenario()
     
     # Process the data
-    processor = DataProcessor()
+    processor = _processor
     data = processor.clean_data(data)
-    data = processor.add_oi_analysis(data)
+    data = add_oi_analysis_cached(data)
     
     # Create Backtrader data feed
     data_feed = bt.feeds.PandasData(
@@ -145,9 +173,13 @@ def run_sclu_strategy_example():
         exit_doi_threshold_pct=0.001,  # 0.1% of OI MA  
         exit_d2oi_threshold_pct=0.005, # 0.5% of OI MA
         stop_loss_pct=0.15,            # 15% stop loss
-        take_profit_pct=0.30           # 30% take profit
+        take_profit_pct=0.30,          # 30% take profit
+        verbose=True                   # Log each signal and trade
     )
     
+    # Signals and trades are logged at DEBUG level
+    setup_logging(level="DEBUG")
+    
     # Set broker parameters for options trading
     initial_cash = 50000.0  # Smaller amount for option buying
     cerebro.broker.setcash(initial_cash)
@@ -254,57 +286,102 @@ def run_sclu_strategy_example():
     }
 
 
+def _sclu_signals_polars(data):
+    """
+    Compute OI MA thresholds and SCLU signals with a lazy Polars query.
+    
+    Args:
+        data: Frame with oi, oi_derivative and oi_second_derivative columns
+        
+    Returns:
+        pl.DataFrame: oi_ma_50, threshold, signal, buy_signal and sell_signal columns
+    """
+    doi = pl.col('oi_derivative')
+    d2oi = pl.col('oi_second_derivative')
+    buy = ((doi < 0) & (d2oi < pl.col('entry_threshold'))).fill_null(False)
+    sell = ((doi > pl.col('exit_doi_threshold')) | (d2oi > pl.col('exit_d2oi_threshold'))).fill_null(False)
+    
+    return (
+        pl.from_pandas(data[['oi', 'oi_derivative', 'oi_second_derivative']].reset_index(drop=True))
+        .lazy()
+        .with_columns(pl.col('oi').cast(pl.Float64).rolling_mean(window_size=50).alias('oi_ma_50'))
+        .with_columns([
+            (-0.005 * pl.col('oi_ma_50')).alias('entry_threshold'),  # -0.5%
+            (-0.001 * pl.col('oi_ma_50')).alias('exit_doi_threshold'),  # -0.1%
+            (-0.005 * pl.col('oi_ma_50')).alias('exit_d2oi_threshold'),  # -0.5%
+        ])
+        .with_columns([buy.alias('buy_signal'), sell.alias('sell_signal')])
+        .with_columns(
+            (pl.col('buy_signal').cast(pl.UInt8) * SIGNAL_BUY
+             + pl.col('sell_signal').cast(pl.UInt8) * SIGNAL_SELL).alias('signal')
+        )
+        .select(['oi_ma_50', 'entry_threshold', 'exit_doi_threshold', 'exit_d2oi_threshold',
+                 'signal', 'buy_signal', 'sell_signal'])
+        .collect()
+    )
+
+
 def analyze_oi_derivatives(data):
     """Analyze the Open Interest derivatives in detail."""
     print("\n" + "="*70)
     print("OPEN INTEREST DERIVATIVE ANALYSIS")
     print("="*70)
     
-    # Calculate derivatives
-    processor = DataProcessor()
-    data = processor.add_oi_analysis(data)
-    
-    # Calculate 50-period OI MA for thresholds
-    data['oi_ma_50'] = data['oi'].rolling(window=50).mean()
-    
-    # Calculate SCLU thresholds
-    data['entry_threshold'] = -0.005 * data['oi_ma_50']  # -0.5%
-    data['exit_doi_threshold'] = -0.001 * data['oi_ma_50']  # -0.1%
-    data['exit_d2oi_threshold'] = -0.005 * data['oi_ma_50']  # -0.5%
-    
-    # Identify signals
-    data['buy_signal'] = (
-        (data['oi_derivative'] < 0) & 
-        (data['oi_second_derivative'] < data['entry_threshold'])
-    )
-    
-    data['sell_signal'] = (
-        (data['oi_derivative'] > data['exit_doi_threshold']) |
-        (data['oi_second_derivative'] > data['exit_d2oi_threshold'])
-    )
+    # Calculate derivatives (cached when the frame came from run_sclu_strategy_example)
+    data = add_oi_analysis_cached(data)
+    
+    if pl is not None:
+        # Threshold and signal pipeline as one lazy Polars query, collected once
+        signal_columns = _sclu_signals_polars(data)
+        for column in signal_columns.columns:
+            data[column] = signal_columns[column].to_numpy()
+    else:
+        # Calculate 50-period OI MA for thresholds
+        data['oi_ma_50'] = data['oi'].rolling(window=50).mean()
+        
+        # Calculate SCLU thresholds
+        data['entry_threshold'] = -0.005 * data['oi_ma_50']  # -0.5%
+        data['exit_doi_threshold'] = -0.001 * data['oi_ma_50']  # -0.1%
+        data['exit_d2oi_threshold'] = -0.005 * data['oi_ma_50']  # -0.5%
+        
+        # Identify signals in one pass over the derivative and threshold columns
+        data['signal'] = _sclu_signal_codes(
+            data['oi_derivative'].to_numpy(dtype=np.float64),
+            data['oi_second_derivative'].to_numpy(dtype=np.float64),
+            data['entry_threshold'].to_numpy(dtype=np.float64),
+            data['exit_doi_threshold'].to_numpy(dtype=np.float64),
+            data['exit_d2oi_threshold'].to_numpy(dtype=np.float64)
+        )
+        data['buy_signal'] = (data['signal'] & SIGNAL_BUY) != 0
+        data['sell_signal'] = (data['signal'] & SIGNAL_SELL) != 0
     
     # Print analysis
-    print(f"OI Range: {data['oi'].min():,} to {data['oi'].max():,}")
-    print(f"OI Decline: {((data['oi'].iloc[0] - data['oi'].iloc[-1]) / data['oi'].iloc[0]) * 100:.1f}%")
+    # Positional lookups on plain arrays instead of filtered frames
+    oi = data['oi'].to_numpy()
+    close = data['close'].to_numpy()
+    buy_pos = np.flatnonzero(data['buy_signal'].to_numpy())
+    sell_pos = np.flatnonzero(data['sell_signal'].to_numpy())
     
-    buy_signals = data[data['buy_signal']]
-    sell_signals = data[data['sell_signal']]
+    print(f"OI Range: {oi.min():,} to {oi.max():,}")
+    print(f"OI Decline: {((oi[0] - oi[-1]) / oi[0]) * 100:.1f}%")
     
     print(f"\nSignal Analysis:")
-    print(f"Buy Signals: {len(buy_signals)}")
-    print(f"Sell Signals: {len(sell_signals)}")
+    print(f"Buy Signals: {len(buy_pos)}")
+    print(f"Sell Signals: {len(sell_pos)}")
     
-    if len(buy_signals) > 0:
-        print(f"First Buy Signal at: {buy_signals.index[0].strftime('%H:%M:%S')}")
-        print(f"Price at First Signal: ₹{buy_signals['close'].iloc[0]:.2f}")
+    if len(buy_pos) > 0:
+        entry_pos = buy_pos[0]
+        print(f"First Buy Signal at: {data.index[entry_pos].strftime('%H:%M:%S')}")
+        print(f"Price at First Signal: ₹{close[entry_pos]:.2f}")
         
-        if len(sell_signals) > 0:
-            first_sell_after_buy = sell_signals[sell_signals.index > buy_signals.index[0]]
-            if len(first_sell_after_buy) > 0:
-                exit_price = first_sell_after_buy['close'].iloc[0]
-                entry_price = buy_signals['close'].iloc[0]
+        if len(sell_pos) > 0:
+            exits_after_buy = sell_pos[sell_pos > entry_pos]
+            if len(exits_after_buy) > 0:
+                exit_pos = exits_after_buy[0]
+                exit_price = close[exit_pos]
+                entry_price = close[entry_pos]
                 trade_return = ((exit_price - entry_price) / entry_price) * 100
-                print(f"First Exit Signal at: {first_sell_after_buy.index[0].strftime('%H:%M:%S')}")
+                print(f"First Exit Signal at: {data.index[exit_pos].strftime('%H:%M:%S')}")
                 print(f"Price at Exit: ₹{exit_price:.2f}")
                 print(f"Trade Return: {trade_return:.1f}%")
     
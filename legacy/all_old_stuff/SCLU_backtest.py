@@ -7,13 +7,29 @@ import backtrader.feeds as btfeeds
 import backtrader.indicators as btind
 import backtrader.utils.flushfile
 
+import logging
+import numpy as np
+import pandas as pd
 import csv
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    #pyarrow is optional, pandas reader is used without it
+    pacsv = None
 
 import os
 import sys 
 
+#shared compiled kernel for the oi derivatives lives in src/sclu/kernels.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from sclu.kernels import _oi_derivs
+
 cwd = os.chdir('/Users/anishrayaguru/Desktop/SCLU/datadumps2')
-count = 0
+log = logging.getLogger('sclu')
 
 #Declaration of custom indicators for first and second derivative of open interest
 class OI(bt.Indicator):
@@ -27,37 +43,64 @@ class dOI(bt.Indicator):
     lines = ('doi',)
     plotinfo = dict(subplot=True)
     
-    def init(self):
-        self.lines.doi = self.data.openinterest
+    def __init__(self):
+        #derivatives for the whole (preloaded) series are computed once by the compiled kernel
+        self._doi, self._d2oi = _oi_derivs(np.asarray(self.data.openinterest.array, dtype=np.float64))
     def next(self):
-        # if self.data.openinterest[0] != self.data.openinterest[-1]:
-        #     self.lines.doi[0] = (self.data.openinterest[0] - self.data.openinterest[-1])
+        if len(self) < 2:
+            #no previous bar yet
+            self.lines.doi[0] = 0.0
+            return
         #reasoning for the formula is attached in the report
-        self.lines.doi[0] = (self.data.openinterest[0] - self.data.openinterest[-1])/3
+        i = len(self) - 1
+        if i >= len(self._doi):
+            #data was not preloaded, recompute on what we have so far
+            self._doi, self._d2oi = _oi_derivs(np.asarray(self.data.openinterest.array, dtype=np.float64))
+        self.lines.doi[0] = self._doi[i]
 
 class d2OI(bt.Indicator):
     #second derivative of open interest with respect to time as an indicator
     lines = ('d2oi',)
     plotinfo = dict(subplot=True)
-    def init(self):
-        self.lines.d2oi = 0
+    def __init__(self):
+        self._doi, self._d2oi = _oi_derivs(np.asarray(self.data.openinterest.array, dtype=np.float64))
     def next(self):
-        global count
-        if count < 2:
-            self.lines.d2oi[0] = 0
-            count += 1
-        else:
-            #reasoning for the formula is given in the report
-            self.lines.d2oi[0] = (self.data.openinterest[0] + self.data.openinterest[-2] - 
-                                  2*(self.data.openinterest[-1]))/9
+        if len(self) < 3:
+            #needs two previous bars, counted per feed instead of a shared global counter
+            self.lines.d2oi[0] = 0.0
+            return
+        #reasoning for the formula is given in the report
+        i = len(self) - 1
+        if i >= len(self._d2oi):
+            self._doi, self._d2oi = _oi_derivs(np.asarray(self.data.openinterest.array, dtype=np.float64))
+        self.lines.d2oi[0] = self._d2oi[i]
+
+class StreamingSMA(bt.Indicator):
+    #moving average of open interest kept as a running sum- one add and one subtract per bar
+    #instead of re-summing the whole window every bar like bt.indicators.SimpleMovingAverage
+    lines = ('sma',)
+    params = (('period', 30),)
+    def __init__(self):
+        self.addminperiod(self.p.period)
+        self._sum = 0.0
+    def prenext(self):
+        self._sum += self.data.openinterest[0]
+    def next(self):
+        self._sum += self.data.openinterest[0]
+        if len(self) > self.p.period:
+            self._sum -= self.data.openinterest[-self.p.period]
+        self.lines.sma[0] = self._sum/self.p.period
 
 # Create a Strategy- backtrader definition of a strategy
 class SCLU(bt.Strategy):
+    params = (('sens', 10/1000), ('feel', 3*1000000))
 
     def log(self, txt, dt=None):
         ''' Logging function for this strategy'''
-        dt = dt or self.datas[0].datetime.date(0)
-        print('%s, %s' % (dt.isoformat(), txt))
+        #skip building the message at all when info logging is off
+        if log.isEnabledFor(logging.INFO):
+            dt = dt or self.datas[0].datetime.date(0)
+            log.info('%s, %s', dt.isoformat(), txt)
 
     def __init__(self):
         #runs once at the start of the strategy
@@ -67,11 +110,15 @@ class SCLU(bt.Strategy):
         self.oi_indicator = OI(self.datas[0])
         self.doi_indic = dOI(self.datas[0])
         self.d2oi_indic = d2OI(self.datas[0])
-        self.oi50ma = bt.indicators.SimpleMovingAverage(self.datas[0].openinterest, period = 30)
+        self.oi50ma = StreamingSMA(self.datas[0], period = 30)
         self.order = None
         self.buyprice = None
         self.buycomm = None
         self.refoima = 0
+        #entry/exit thresholds only depend on the params, work them out once instead of every bar
+        self._buy_d2 = -0.1*self.p.sens*self.p.feel
+        self._exit_d1 = -1*self.p.sens*self.p.feel
+        self._exit_d2 = -0.1*self.p.sens*self.p.feel
 
 
     def notify_order(self, order):
@@ -115,11 +162,9 @@ class SCLU(bt.Strategy):
         
 
     def next(self):
-        sens = 10/1000
-        feel = 3*1000000
         if not self.position:#checks if we are in a trade- only one position at a time
             # Not yet ... we MIGHT BUY if ...
-            if self.doi_indic[0] < 0 and self.d2oi_indic[0] < -0.1*sens*feel: 
+            if self.doi_indic[0] < 0 and self.d2oi_indic[0] < self._buy_d2: 
                 #^^primary buy conditions- if rate of change and second derivative meet the criteriion
                 # BUY, BUY, BUY!!! (with default parameters)
                 self.log('BUY CREATE, %.2f' % self.dataclose[0])
@@ -131,11 +176,11 @@ class SCLU(bt.Strategy):
         else:
 
             # Already in the market ... we might sell
-            if self.doi_indic[0] > -1*sens*feel and self.d2oi_indic[0] > -0.1*sens*feel:
-                if self.doi_indic[0] > -1*sens*feel:
-                    print("first derivative exit")
+            if self.doi_indic[0] > self._exit_d1 and self.d2oi_indic[0] > self._exit_d2:
+                if self.doi_indic[0] > self._exit_d1:
+                    log.debug("first derivative exit")
                 else:
-                    print("second derivative exit")
+                    log.debug("second derivative exit")
                 #primary exit condition- again on first and second derivative of open interest
                 #print(self.doi_indic[0])
                 # SELL, SELL, SELL!!! (with all possible default parameters)
@@ -146,46 +191,66 @@ class SCLU(bt.Strategy):
 
 
 
-if __name__ == '__main__':
-    # Create a cerebro entity- backtrader specification
-    cerebro = bt.Cerebro()
+columns = ['open', 'high', 'low', 'close', 'volume', 'openinterest']
+dtypes = {'open':np.float32, 'high':np.float32, 'low':np.float32, 'close':np.float32,
+          'volume':np.int32, 'openinterest':np.int32}
 
-    data0 = btfeeds.GenericCSVData(
-    dataname=input("enter OHLCVOi filename- ") or '54000 ce 09-24.csv',
-    #headers = False,
-    #nullvalue=0.0,
-    dtformat=(f'%Y-%m-%d %H:%M:%S+05:30'),
+def load(fname):
+    #whole csv parsed in one go into columns instead of row by row by GenericCSVData
+    #columns in our datasheet- datetime, open, high, low, close, volume, open interest
+    if pacsv is not None:
+        #multithreaded arrow reader, datetime kept as text and parsed below
+        table = pacsv.read_csv(fname)
+        names = table.column_names
+        table = table.cast(pa.schema([pa.field(names[0], pa.string())] +
+                                     [pa.field(c, pa.float64()) for c in names[1:]]))
+        df = table.to_pandas(split_blocks=True, self_destruct=True).set_index(names[0])
+    else:
+        df = pd.read_csv(fname, index_col=0)
     #2024-07-03 09:15:00+05:30- how the date looks in our datasheet
+    df.index = pd.to_datetime(df.index, format='%Y-%m-%d %H:%M:%S+05:30')
+    df.columns = columns
+    #prices fit in float32 and volume/oi in int32, half the bytes for the resample below
+    if df['openinterest'].max() < np.iinfo(np.int32).max and df['volume'].max() < np.iinfo(np.int32).max:
+        df = df.astype(dtypes)
 
+    #one minute data is converted into 3 minute data, beacause open interest is only refreshed,
+    #by NSE every 3 minutes- done once here so backtrader only ever steps through the 3 minute bars
+    return df.resample('3min', label='right', closed='right').agg({'open':'first','high':'max','low':'min',
+                       'close':'last','volume':'sum','openinterest':'last'}).dropna()
 
-    timeframe=bt.TimeFrame.Minutes,
-    #compression = 3,
-
-    datetime=0,
-    #date = -1,
-    time=-1,
-    high=2,
-    low=3,
-    open=1,
-    close=4,
-    volume=5,
-    openinterest=6
-    )
+def run_backtest(fname, plot=False):
+    # Create a cerebro entity- backtrader specification
+    cerebro = bt.Cerebro()
+    data0 = bt.feeds.PandasData(dataname=load(fname), timeframe=bt.TimeFrame.Minutes, compression=3,
+                                openinterest='openinterest')
     # Add the Data Feed to Cerebro
-
-    cerebro.resampledata(data0,timeframe=bt.TimeFrame.Minutes,compression=3) 
-    #one minute data is converted into 3 minute data, beacause open interest is only refreshed,
-    #by NSE every 3 minutes
+    cerebro.adddata(data0)
     
     # Set our desired cash start
     cerebro.broker.setcash(1000)
-
-    # Print out the starting conditions
-    print('Starting Portfolio Value: %.2f' % cerebro.broker.getvalue())
     cerebro.addstrategy(SCLU)
     # Run over everything
     cerebro.run()
-    #cerebro.plot(style = "candlestick")
-    cerebro.plot() #makes our graph representing each trade
-    # Print out the final result
-    print('Final Portfolio Value: %.2f' % cerebro.broker.getvalue())
\ No newline at end of file
+    if plot:
+        #cerebro.plot(style = "candlestick")
+        cerebro.plot() #makes our graph representing each trade
+    return cerebro.broker.getvalue()
+
+
+if __name__ == '__main__':
+    #trade by trade output is info level, set level=logging.INFO to see it
+    logging.basicConfig(level=logging.WARNING)
+
+    fname = input("enter OHLCVOi filename or folder- ") or '54000 ce 09-24.csv'
+    if os.path.isdir(fname):
+        #backtest every csv in the folder, one file per process
+        files = sorted(str(p) for p in Path(fname).glob('*.csv'))
+        with ProcessPoolExecutor() as ex:
+            for f, value in zip(files, ex.map(run_backtest, files)):
+                print('%s- Final Portfolio Value: %.2f' % (f, value))
+    else:
+        # Print out the starting conditions
+        print('Starting Portfolio Value: %.2f' % 1000)
+        # Print out the final result
+        print('Final Portfolio Value: %.2f' % run_backtest(fname, plot=True))
@@ -1,10 +1,24 @@
 import time
 import os
 import pandas as pd
+import numpy as np
 from kiteconnect import KiteConnect
+from kiteconnect.exceptions import NetworkException, DataException
+from requests.exceptions import Timeout, ConnectionError as RequestsConnectionError
+import logging
+import requests
+import requests.adapters
+import threading
 import datetime as dt
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+from sclu.kernels import _oi_derivs
 cwd = os.chdir('/Users/anishrayaguru/Desktop/SCLU')
+log = logging.getLogger('sclu')
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
 
 #os.system('{} {}'.format('python3', './mayankdls/access_token_gen.py'))
 
@@ -12,26 +26,52 @@ access_token = open("access_token.txt", 'r').read()
 key_secret = open("api_key.txt", 'r').read().split()
 kite = KiteConnect(api_key=key_secret[0])
 kite.set_access_token(access_token)
+#one keep-alive session for every kite call so the 3 minute polls don't redo the tls handshake
+session = requests.Session()
+session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=3))
+kite.reqsession = session
+
+#order constants looked up once
+_BUY = kite.TRANSACTION_TYPE_BUY
+_SELL = kite.TRANSACTION_TYPE_SELL
+_NFO = kite.EXCHANGE_NFO
+_MKT = kite.ORDER_TYPE_MARKET
+_MIS = kite.PRODUCT_MIS
+_REG = kite.VARIETY_REGULAR
 
 #list the number of underlyings and their corresponding instrument tokens- url of kite pagaes
 instrument_tokens = [10716162,10684418]
 no_underlyings = len(instrument_tokens)
 
-instrument_dump = kite.instruments("NFO")
-instrument_df = pd.DataFrame(instrument_dump)
-instrument_df.to_csv("instrumentdump.csv",index=False)
-
-def instrumentLookup(instrument_df,token):
+#instrument list only changes once a day, so keep a dated copy and skip the download on restarts
+cache = Path(f"instrumentdump_{dt.date.today():%Y%m%d}.parquet")
+try:
+    if cache.exists():
+        instrument_df = pd.read_parquet(cache)
+    else:
+        instrument_df = pd.DataFrame(kite.instruments("NFO"))
+        instrument_df.to_parquet(cache)
+except ImportError:
+    #no parquet engine installed, fall back to a dated csv
+    cache = cache.with_suffix(".csv")
+    if cache.exists():
+        instrument_df = pd.read_csv(cache)
+    else:
+        instrument_df = pd.DataFrame(kite.instruments("NFO"))
+        instrument_df.to_csv(cache,index=False)
+token_to_symbol = dict(zip(instrument_df.instrument_token, instrument_df.tradingsymbol))
+
+def instrumentLookup(token):
     #finds instrument symbol
     try:
-        return instrument_df[instrument_df.instrument_token==token].tradingsymbol.values[0]
-    except:
+        return token_to_symbol[token]
+    except KeyError:
         print("wrong instrument token given")
 
 instrument_symbols = list()
 count = 0
 for i in instrument_tokens:
-    instrument_symbols.append(instrumentLookup(instrument_df, i))
+    instrument_symbols.append(instrumentLookup(i))
 print("instrument symbols are-")
 print(instrument_symbols)
 intrade = list()
@@ -46,14 +86,40 @@ def fetchOHLC(duration, instrument_token):
     data.set_index("date",inplace=True)
     return data
 
-def oideriv(dfi):
-    dfi['doi'] = None
-    dfi['d2oi'] = None
+#last few bars per instrument token, so each tick only downloads what is new
+_buffers = {}
+buffer_bars = 8
+
+def fetchOHLC_incremental(instrument_token, duration = 5):
+    """keeps a small per-token buffer of bars and only asks kite for bars since the last one"""
+    if instrument_token not in _buffers:
+        data = fetchOHLC(duration, instrument_token)
+    else:
+        old = _buffers[instrument_token]
+        #the last bar is fetched again since it may have still been forming last time
+        new = pd.DataFrame(kite.historical_data(instrument_token, old.index[-1], dt.datetime.now(),
+                                                '3minute', oi = True))
+        if len(new):
+            new.set_index("date",inplace=True)
+            data = pd.concat([old, new])
+            data = data[~data.index.duplicated(keep='last')]
+        else:
+            data = old
+    _buffers[instrument_token] = data.iloc[-buffer_bars:]
+    #oideriv adds columns, so hand out a copy and keep the buffer as plain ohlcv+oi
+    return _buffers[instrument_token].copy()
 
-    for i in range(1,len(dfi)):
-        dfi.iloc[i,6] = round((dfi.iloc[i,5] - dfi.iloc[i-1,5])/3)
-        if i > 1:
-            dfi.iloc[i,7] = round((dfi.iloc[i,5] + dfi.iloc[i-2,5] - (2*dfi.iloc[i-1,5]))/9)
+def oideriv(dfi):
+    #first and second derivative of oi over the whole frame at once (column 5 is oi)
+    oi = dfi.iloc[:,5].to_numpy(dtype=np.float64)
+    doi, d2oi = _oi_derivs(oi)
+    #rows without enough history stay empty like before, rounded in place so the columns
+    #are the kernel's float64 buffers (no object dtype, no extra copies)
+    doi[:1] = np.nan
+    d2oi[:2] = np.nan
+    dfi['doi'] = np.round(doi, out=doi)
+    dfi['d2oi'] = np.round(d2oi, out=d2oi)
+    assert dfi['doi'].dtype == np.float64 and dfi['d2oi'].dtype == np.float64
     return dfi
 
 no_trades = 0
@@ -64,65 +130,120 @@ def placeMarketOrder(instrument_symbol,buy_sell,quantity):
     if no_trades < (2*tradelimit):
         no_trades += 1
         if buy_sell == "buy":
-            t_type=kite.TRANSACTION_TYPE_BUY
+            t_type=_BUY
         elif buy_sell == "sell":
-            t_type=kite.TRANSACTION_TYPE_SELL   
+            t_type=_SELL
         kite.place_order(tradingsymbol=instrument_symbol,
-                        exchange=kite.EXCHANGE_NFO,
+                        exchange=_NFO,
                         transaction_type=t_type,
                         quantity=quantity,
-                        order_type=kite.ORDER_TYPE_MARKET,
-                        product=kite.PRODUCT_MIS,
-                        variety=kite.VARIETY_REGULAR)
+                        order_type=_MKT,
+                        product=_MIS,
+                        variety=_REG)
+
+#failed fetches in a row across all underlyings- too many means the feed is stale and we stop
+consecutive_failures = 0
+max_failures = 5
+halted = False
+failure_lock = threading.Lock()
+
+def killSwitch():
+    #cancel anything still open and mark every underlying as out of trade
+    global halted
+    halted = True
+    for i in range(no_underlyings):
+        intrade[i] = False
+    try:
+        for order in kite.orders():
+            if order["status"] in ("OPEN", "TRIGGER PENDING"):
+                kite.cancel_order(variety=order["variety"], order_id=order["order_id"])
+    except (NetworkException, Timeout, RequestsConnectionError) as e:
+        log.error({'ts': dt.datetime.now().isoformat(), 'symbol': None, 'err': repr(e)})
 
 def main(pos, sens, feel, instrument_token, lot_size,instrument_name, lots = 1):
     global intrade
     global instrument_symbols
+    global consecutive_failures
+    #thresholds only depend on sens and feel
+    buy_d2_thr = (-1*sens*feel)//(10*100)
+    exit_d1_thr = (-1*sens*feel)//(100)
+    exit_d2_thr = buy_d2_thr
+    d1_exit_label = -10*sens*feel
+    d2_exit_label = -sens*feel
+    try:
+        df = fetchOHLC_incremental(instrument_token)
+    except (NetworkException, DataException, Timeout, RequestsConnectionError) as e:
+        #timeouts, rate limits (429) and bad payloads- back off instead of hammering the api next tick
+        with failure_lock:
+            consecutive_failures += 1
+            failures = consecutive_failures
+        log.warning({'ts': dt.datetime.now().isoformat(), 'symbol': instrument_name, 'err': repr(e)})
+        if failures > max_failures:
+            killSwitch()
+            return False
+        time.sleep(min(30, 2**failures))
+        return False
+    with failure_lock:
+        consecutive_failures = 0
     try:
-        df = fetchOHLC(5, instrument_token)
         df = oideriv(df)
         #print(df.iloc[-1:,5:])
         #feel = Decimal(feel)
         if intrade[pos-1] == False:
-            if df.iloc[-1,6] < 0 and df.iloc[-1,7] < ((-1*sens*feel)//(10*100)):
+            if df.iloc[-1,6] < 0 and df.iloc[-1,7] < buy_d2_thr:
                 #placeMarketOrder(instrument_symbols[pos-1], "buy", lots*lot_size)
-                print(instrument_name," unwind around-", df.iloc[-1,3])
+                log.info('%s unwind around- %s', instrument_name, df.iloc[-1,3])
                 intrade[pos-1] = True
         else:
-            if df.iloc[-1,6] > ((-1*sens*feel)//(100)) or df.iloc[-1,7] > ((-1*sens*feel)//(10*100)):
+            if df.iloc[-1,6] > exit_d1_thr or df.iloc[-1,7] > exit_d2_thr:
                 #placeMarketOrder(instrument_symbols[pos-1], "sell", lots*lot_size)
-                if df.iloc[-1,6] > -10*sens*feel:
-                    print("first derivative exit")
-                elif df.iloc[-1,7] > -sens*feel:
-                    print("second derivative exit")
-                print(instrument_name," unwind stopped at around-", df.iloc[-1,3])
+                if df.iloc[-1,6] > d1_exit_label:
+                    log.debug("first derivative exit")
+                elif df.iloc[-1,7] > d2_exit_label:
+                    log.debug("second derivative exit")
+                log.info('%s unwind stopped at around- %s', instrument_name, df.iloc[-1,3])
                 intrade[pos-1] = False
-    except:
-            print("smth went wrong")
+        return True
+    except (IndexError, KeyError) as e:
+        #empty or short frame, nothing to decide on this bar
+        log.warning({'ts': dt.datetime.now().isoformat(), 'symbol': instrument_name, 'err': repr(e)})
+        return False
+
+#one entry per underlying- (pos, sens, feel, instrument_token, lot_size, instrument_name, lots)
+underlyings = [
+    (1,7, 9*1000000, 10716162, 25, "24000 ce finnifty", 2),
+    (2,7, 5*1000000, 10684418, 25, "23800 pe finnifty", 2),
+]
+#kite calls block on http, so fetch all underlyings at the same time instead of one after another
+pool = ThreadPoolExecutor(max_workers=no_underlyings)
 
 # Continuous execution
+#wall clock is only used once to line up with the 3 minute bars, after that everything runs on
+#time.monotonic() so ntp adjustments can't make us skip or double a bar
 base_time = time.mktime(time.strptime("09:15:00", "%H:%M:%S"))
 x = 180 -((time.time() - base_time)%180) + 13
 time.sleep(x)
 #time.sleep(27*60)
-starttime=time.time()
-timeout = time.time() + 60*60*10  # 60 seconds times 60 meaning the script will run for 1 hr *10
+deadline = time.monotonic()
+timeout = deadline + 60*60*10  # 60 seconds times 60 meaning the script will run for 1 hr *10
 
-while time.time() <= timeout:
+while time.monotonic() <= timeout:
     try:
-        readable_time = dt.datetime.fromtimestamp(time.time()).strftime('%Y-%m-%d %H:%M:%S')
-        print(readable_time)
+        log.debug('tick')
         #print("passthrough at ",time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time())))
-        main(1,7, 9*1000000, 10716162, 25, "24000 ce finnifty", 2)
-        main(2,7, 5*1000000, 10684418, 25, "23800 pe finnifty", 2)
-        
-
-        
-
-        #main() - for the second underlying
-        time.sleep(180 - ((time.time() - starttime) % 180.0)) # 180 second interval between each new execution
+        futures = {pool.submit(main, *args): args[5] for args in underlyings}
+        for f in as_completed(futures):
+            if not f.result():
+                log.warning('%s check failed this bar', futures[f])
+        if halted:
+            print("too many failed fetches in a row, stopping")
+            pool.shutdown(wait=False)
+            sys.exit(2)
+        deadline += 180.0 # 180 second interval between each new execution
+        time.sleep(max(0.0, deadline - time.monotonic()))
     except KeyboardInterrupt:
         print('\n\nKeyboard exception received. Exiting.')
         print("bye bye")    
+        pool.shutdown(wait=False)
         exit()
 
@@ -26,6 +26,32 @@ def linear_least_squares_regression(data):
     
     return {"next_oi": next_y, "slope": m}
 
+def rolling_next_prediction(data, window):
+    """
+    Closed-form least squares fit over every sliding window at once.
+
+    Since x = 0..window-1 is the same for every window, sum(x) and sum(x^2) are
+    constants and only sum(y) and sum(x*y) change from window to window.
+
+    Parameters:
+    data (list or numpy array): Array of data points.
+    window (int): Number of points in each regression window.
+
+    Returns:
+    tuple: (next_y, slope) arrays, one entry per window; window k covers data[k:k+window]
+    and next_y is its prediction for data[k+window].
+    """
+    y = np.asarray(data, dtype=np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(y, window)
+    x = np.arange(window)
+    sum_x = x.sum()
+    sum_x2 = (x * x).sum()
+    sum_y = windows.sum(axis=1)
+    sum_xy = windows @ x
+    slope = (window * sum_xy - sum_x * sum_y) / (window * sum_x2 - sum_x ** 2)
+    intercept = (sum_y - slope * sum_x) / window
+    return slope * window + intercept, slope
+
 # Example usage
 """ data = [1, 2, 3, 4, 5]
 result = linear_least_squares_regression(data)
@@ -57,19 +83,17 @@ column_name = 'oi'  # Replace with your actual column name
 
 
 # Perform linear least squares regression on a column
-data = df[column_name].tolist()
-index = 0
+data = df[column_name].to_numpy(dtype=np.float64)
 reg_check_length = 3
 reg_deviation = 0.05
-deviation_indices = []
-for i in data:
-    if index > reg_check_length:
-        sampledata = data[index - reg_check_length:index]
-        prediction = linear_least_squares_regression(sampledata)
-        if abs((prediction['next_oi'] - i)/i) > reg_deviation and prediction["next_oi"] < i:
-            print("The datapoint has deviated downward")
-            deviation_indices.append(index)
-    index += 1
+#window k predicts data[k + reg_check_length]; the first window checked is k = 1
+next_oi, _ = rolling_next_prediction(data[:-1], reg_check_length)
+next_oi = next_oi[1:]
+actual = data[reg_check_length + 1:]
+deviated = (np.abs((next_oi - actual)/actual) > reg_deviation) & (next_oi < actual)
+deviation_indices = (np.flatnonzero(deviated) + reg_check_length + 1).tolist()
+for _ in deviation_indices:
+    print("The datapoint has deviated downward")
 
 def visualize_column(df, column_name):
     """
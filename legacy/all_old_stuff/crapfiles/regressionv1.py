@@ -1,19 +1,21 @@
 import pandas as pd
+import numpy as np
 import os
 import matplotlib.pyplot as plt
 import datetime
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
 #cwd = os.chdir('/Users/anishrayaguru/Desktop/SCLU')
 #df = pd.read_csv('/workexcelsheets/27300penifty_regress.csv')
-df = pd.read_csv('/Users/anishrayaguru/Desktop/SCLU/workexcelsheets/27300penifty_regress.csv')
+#only the two columns the fit uses, at half width
+df = pd.read_csv('/Users/anishrayaguru/Desktop/SCLU/workexcelsheets/27300penifty_regress.csv',
+                 usecols=['index','oi'], dtype={'index':np.int32,'oi':np.float32}, engine='c')
+x_all = df['index'].to_numpy().astype(np.float64)
 
 #print(df['oi'])
 #print(df['oi'][0])
 #print(df.head(5))
-oi = df['oi'][66:77]
+oi = df['oi'].to_numpy()[66:77].astype(np.float64)
 print(oi)
-index = df['index'][66:77]
+index = x_all[66:77]
 
 
 #x = list()
@@ -21,14 +23,17 @@ print(len(oi))
 #for i in range(len(oi)):
 #    x.append(i)
 
-model = LinearRegression()
-model.fit(index, oi)
+#closed form least squares, 11 points doesnt need sklearn
+xm = index.mean()
+ym = oi.mean()
+slope = ((index - xm) * (oi - ym)).sum() / ((index - xm) ** 2).sum()
+intercept = ym - slope * xm
 
-oi_pred = model.predict(df[index][66:77])
+oi_pred = intercept + slope * index
 
-forecast = model.predict(df.index[75:80])
+forecast = intercept + slope * x_all[75:80]
 
 plt.scatter(df['index'],df['oi'], color = 'blue')
-plt.plot(df[index][75:80], forecast, color = "red")
+plt.plot(x_all[75:80], forecast, color = "red")
 #plt.plot(df['oi'])
 plt.show()
\ No newline at end of file
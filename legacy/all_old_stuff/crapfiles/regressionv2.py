@@ -1,75 +1,258 @@
+import argparse
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional, the loop just runs uncompiled
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:  # pyarrow is optional, fall back to the C parser
+    CSV_ENGINE = 'c'
+
+# Smallest denominator used for percentage errors
+PCT_ERROR_EPS = 1e-9
 
 def linear_fit_segment(x, y):
     """
     Fit a linear model to (x, y) and return predicted y values and slope.
     """
-    A = np.vstack([x, np.ones(len(x))]).T
-    m, c = np.linalg.lstsq(A, y, rcond=None)[0]
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Closed form least squares, a 2 parameter fit doesnt need lstsq
+    m, c = _fit_from_sums(x.size, x.sum(), y.sum(), x.dot(x), x.dot(y))
     y_pred = m * x + c
     return y_pred, m
 
-def detect_breakpoints(data, max_deviation=0.05, min_segment_len=5):
+@njit(cache=True)
+def _fit_from_sums(cnt, sx, sy, sxx, sxy):
     """
-    Detect breakpoints in 'data' using a piecewise linear approach.
+    Slope and intercept of the least squares line through cnt points, from their sums.
+    """
+    if cnt < 2:
+        return 0.0, sy / cnt
+    slope = (cnt * sxy - sx * sy) / (cnt * sxx - sx * sx)
+    return slope, (sy - slope * sx) / cnt
 
-    Parameters:
-    - data: 1D numpy array or list
-    - max_deviation: float threshold for allowable deviation
-    - min_segment_len: minimum length of a segment before allowing a breakpoint
+@njit(cache=True, fastmath=True)
+def _detect_breakpoints_core(data, max_deviation, min_segment_len):
+    """
+    Compiled greedy segmentation loop behind detect_breakpoints.
 
-    Returns:
-    - segments: list of (start_index, end_index) for each segment
+    Returns an (n_segments, 2) int64 array of (start_index, end_index) rows
+    and the slope and intercept of each segment's fit, with intercepts in
+    the same index coordinates as the data.
     """
-    data = np.array(data)
-    n = len(data)
-    segments = []
+    n = data.shape[0]
+    segments = np.empty((max(n, 1), 2), np.int64)
+    slopes = np.empty(max(n, 1))
+    intercepts = np.empty(max(n, 1))
+    n_seg = 0
+    if n == 0:
+        return segments[:0], slopes[:0], intercepts[:0]
     
     seg_start = 0
-    i = 1
-    while i < n:
-        # We'll keep trying to extend the current segment from seg_start to i
-        x_range = np.arange(seg_start, i+1)
-        y_range = data[seg_start:i+1]
-        
-        # Fit a linear model to [seg_start .. i]
-        y_pred, slope = linear_fit_segment(x_range, y_range)
-        
-        # Calculate deviation as MAPE (mean absolute percentage error), or max absolute % error
-        abs_pct_errors = np.abs(y_range - y_pred) / y_range
-        max_error = abs_pct_errors.max()
+    # Running sums over the current segment, x measured from seg_start
+    # so the sums stay small and the fit stays well conditioned
+    cnt = 1
+    sx = 0.0
+    sy = data[0]
+    sxx = 0.0
+    sxy = 0.0
+    for i in range(1, n):
+        # Extend the current segment from seg_start to i in O(1)
+        xi = i - seg_start
+        yi = data[i]
+        cnt += 1
+        sx += xi
+        sy += yi
+        sxx += xi * xi
+        sxy += xi * yi
         
         # If the segment is too short, keep going
-        if i - seg_start + 1 < min_segment_len:
-            i += 1
+        if cnt < min_segment_len:
             continue
         
+        # Closed form least squares fit of [seg_start .. i]
+        slope, intercept = _fit_from_sums(cnt, sx, sy, sxx, sxy)
+        
+        # Max absolute % error of the fit, in one pass; OI can be 0 so
+        # the denominator is floored at PCT_ERROR_EPS
+        max_error = 0.0
+        for j in range(cnt):
+            y = data[seg_start + j]
+            err = abs(y - (slope * j + intercept)) / max(y, PCT_ERROR_EPS)
+            if err > max_error:
+                max_error = err
+        
         # If error is too big, we found a breakpoint
         if max_error > max_deviation:
-            # The segment ended just before i
-            segments.append((seg_start, i-1))
+            # The segment ended just before i, keep the fit without point i
+            segments[n_seg, 0] = seg_start
+            segments[n_seg, 1] = i - 1
+            slope, intercept = _fit_from_sums(cnt - 1, sx - xi, sy - yi, sxx - xi * xi, sxy - xi * yi)
+            slopes[n_seg] = slope
+            intercepts[n_seg] = intercept - slope * seg_start
+            n_seg += 1
             seg_start = i  # new segment starts at i
-        i += 1
+            cnt = 1
+            sx = 0.0
+            sy = yi
+            sxx = 0.0
+            sxy = 0.0
     
     # Last segment goes till the end
-    if seg_start < n:
-        segments.append((seg_start, n-1))
+    segments[n_seg, 0] = seg_start
+    segments[n_seg, 1] = n - 1
+    slope, intercept = _fit_from_sums(cnt, sx, sy, sxx, sxy)
+    slopes[n_seg] = slope
+    intercepts[n_seg] = intercept - slope * seg_start
+    n_seg += 1
+    return segments[:n_seg], slopes[:n_seg], intercepts[:n_seg]
+
+def detect_breakpoints(data, max_deviation=0.05, min_segment_len=5):
+    """
+    Detect breakpoints in 'data' using a piecewise linear approach.
+
+    Parameters:
+    - data: 1D numpy array or list
+    - max_deviation: float threshold for allowable deviation
+    - min_segment_len: minimum length of a segment before allowing a breakpoint
+
+    Returns:
+    - segments: list of (start_index, end_index) for each segment
+    - slopes: numpy array with the slope of each segment's linear fit
+    - intercepts: numpy array with the intercept of each segment's linear fit
+    """
+    data = np.ascontiguousarray(data, dtype=np.float64)
+    segments, slopes, intercepts = _detect_breakpoints_core(data, float(max_deviation), int(min_segment_len))
+    # The core fills preallocated arrays; tuples are only built here for callers
+    return [tuple(row) for row in segments.tolist()], slopes, intercepts
+
+class SegmentCost:
+    """
+    Prefix sums of x, y, xy, x^2 and y^2 over a series, so the squared
+    error of a linear fit to any slice costs five subtractions.
+    """
+
+    def __init__(self, data):
+        y = np.asarray(data, dtype=np.float64)
+        # Centre y so the sums of squares dont swamp the residuals; the
+        # residuals of a linear fit dont change with a constant shift
+        y = y - y.mean() if len(y) else y
+        x = np.arange(len(y), dtype=np.float64)
+        
+        zero = np.zeros(1)
+        self.Px = np.concatenate((zero, np.cumsum(x)))
+        self.Py = np.concatenate((zero, np.cumsum(y)))
+        self.Pxx = np.concatenate((zero, np.cumsum(x * x)))
+        self.Pxy = np.concatenate((zero, np.cumsum(x * y)))
+        self.Pyy = np.concatenate((zero, np.cumsum(y * y)))
+
+    def ssr(self, s, t):
+        """
+        Residual sum of squares of the least squares line through points s..t-1.
+        """
+        return _segment_ssr(self.Px, self.Py, self.Pxx, self.Pxy, self.Pyy, s, t)
+
+@njit(cache=True)
+def _segment_ssr(Px, Py, Pxx, Pxy, Pyy, s, t):
+    """
+    Residual sum of squares of a linear fit to points s..t-1, from prefix sums.
+    """
+    cnt = t - s
+    sx = Px[t] - Px[s]
+    sy = Py[t] - Py[s]
+    denom = cnt * (Pxx[t] - Pxx[s]) - sx * sx
+    if denom <= 0.0:
+        # 0 or 1 points, the line goes through them
+        return 0.0
+    num = cnt * (Pxy[t] - Pxy[s]) - sx * sy
+    return (Pyy[t] - Pyy[s]) - sy * sy / cnt - num * num / (cnt * denom)
+
+@njit(cache=True)
+def _optimal_breakpoints_core(Px, Py, Pxx, Pxy, Pyy, n_segments, min_segment_len):
+    """
+    Bellman recursion behind optimal_breakpoints.
+
+    Returns an (n_segments, 2) int64 array of (start_index, end_index) rows.
+    """
+    n = Px.shape[0] - 1
+    # cost[k, t] = best error for the first t points cut into k+1 segments
+    cost = np.full((n_segments, n + 1), np.inf)
+    split = np.zeros((n_segments, n + 1), np.int64)
+    for t in range(min_segment_len, n + 1):
+        cost[0, t] = _segment_ssr(Px, Py, Pxx, Pxy, Pyy, 0, t)
+        for k in range(1, n_segments):
+            best = np.inf
+            best_s = 0
+            for s in range(t - min_segment_len + 1):
+                total = cost[k - 1, s]
+                if total == np.inf:
+                    continue
+                total += _segment_ssr(Px, Py, Pxx, Pxy, Pyy, s, t)
+                if total < best:
+                    best = total
+                    best_s = s
+            cost[k, t] = best
+            split[k, t] = best_s
     
+    # Walk the split points back from the end
+    segments = np.empty((n_segments, 2), np.int64)
+    t = n
+    for k in range(n_segments - 1, -1, -1):
+        start = split[k, t] if k > 0 else 0
+        segments[k, 0] = start
+        segments[k, 1] = t - 1
+        t = start
     return segments
 
-def plot_piecewise_segments(data, segments):
+def optimal_breakpoints(data, n_segments, min_segment_len=2):
     """
-    Plot the data and overlay piecewise linear fits for each segment.
+    Split 'data' into n_segments linear pieces with the least total squared error.
+
+    Bellman style dynamic programming over prefix sums, so the cost of
+    fitting any candidate segment is O(1) and the whole search is
+    O(n_segments * T^2) instead of refitting every window.
+
+    Parameters:
+    - data: 1D numpy array or list
+    - n_segments: number of segments to split into
+    - min_segment_len: minimum number of points in each segment
+
+    Returns:
+    - segments: list of (start_index, end_index) for each segment
     """
+    n = len(data)
+    if n_segments * min_segment_len > n:
+        raise ValueError("Not enough points for the requested number of segments")
+    
+    cost = SegmentCost(data)
+    segments = _optimal_breakpoints_core(
+        cost.Px, cost.Py, cost.Pxx, cost.Pxy, cost.Pyy, int(n_segments), int(min_segment_len)
+    )
+    return [tuple(row) for row in segments.tolist()]
+
+def plot_piecewise_segments(data, segments, slopes, intercepts):
+    """
+    Plot the data and overlay the piecewise linear fit of each segment.
+    """
+    # Only plotting runs pay for the matplotlib import
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(10, 6))
     plt.plot(data, label='Original Data', alpha=0.5)
     
-    for (start, end) in segments:
+    for k, (start, end) in enumerate(segments):
         x_range = np.arange(start, end+1)
-        y_range = data[start:end+1]
-        y_pred, _ = linear_fit_segment(x_range, y_range)
+        y_pred = slopes[k] * x_range + intercepts[k]
         plt.plot(x_range, y_pred, linewidth=2, label=f'Segment {start}-{end}')
     
     plt.title('Piecewise Linear Segmentation')
@@ -80,12 +263,47 @@ def plot_piecewise_segments(data, segments):
     plt.show()
 
 
-df = pd.read_csv('/Users/anishrayaguru/Desktop/SCLU/workexcelsheets/27300penifty_regress.csv')
-oi_data = df["oi"].values
+def main():
+    parser = argparse.ArgumentParser(description="Piecewise linear segmentation of open interest")
+    parser.add_argument("csv_file", help="CSV file with an 'oi' column")
+    parser.add_argument("--max-deviation", type=float, default=0.03,
+                        help="Largest allowed absolute percentage error of a segment fit")
+    parser.add_argument("--min-segment-len", type=int, default=1,
+                        help="Points a segment needs before it can be broken")
+    parser.add_argument("--optimal", action="store_true",
+                        help="Also find the least-error split with as many segments "
+                             "(O(K*T^2) time, slow on long series)")
+    parser.add_argument("--no-plot", action="store_true", help="Skip the plot")
+    args = parser.parse_args()
+    
+    # Only the oi column is needed
+    df = pd.read_csv(args.csv_file, usecols=['oi'], engine=CSV_ENGINE)
+    # One contiguous float64 buffer for the segmentation loops; float32 is not
+    # exact for OI above 2**24 and the running sums need the extra precision
+    oi_data = np.ascontiguousarray(df["oi"].to_numpy(dtype=np.float64, copy=False))
+    
+    # Detect breakpoints with the allowed max deviation and minimum segment length
+    segments, slopes, intercepts = detect_breakpoints(
+        oi_data, max_deviation=args.max_deviation, min_segment_len=args.min_segment_len
+    )
+    print("Detected segments:", segments)
+    
+    # Best fit with the same number of segments, for comparison with the greedy pass
+    if args.optimal:
+        try:
+            optimal = optimal_breakpoints(
+                oi_data, len(segments), min_segment_len=args.min_segment_len
+            )
+        except ValueError as e:
+            # The greedy pass can end on a segment shorter than min_segment_len
+            print("Skipping optimal segmentation:", e)
+        else:
+            print("Optimal segments:", optimal)
+    
+    # Plot them
+    if not args.no_plot:
+        plot_piecewise_segments(oi_data, segments, slopes, intercepts)
 
-# Detect breakpoints with up to 5% max deviation, and require segments of at least 5 points
-segments = detect_breakpoints(oi_data, max_deviation=0.03, min_segment_len=1)
-print("Detected segments:", segments)
 
-# Plot them
-plot_piecewise_segments(oi_data, segments)
+if __name__ == "__main__":
+    main()
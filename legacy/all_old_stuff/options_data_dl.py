@@ -1,18 +1,10 @@
 #%%
 
 from __future__ import (absolute_import, division, print_function, unicode_literals)
-import yfinance as yf
-import backtrader as bt
 import pandas as pd
 #import datetime
 from datetime import date, timedelta, datetime
-import requests
-import backtrader.feeds as btfeeds
-import backtrader.indicators as btind
-import backtrader.utils.flushfile
 from kiteconnect import KiteConnect
-import csv
-import math
 import os
 
 
@@ -55,11 +47,9 @@ for i in instrumenttokens:
     naam = "./datadumps2/" + str(names[count])+ " " + str(i)+ ".csv"
     kitedata5m = kite.historical_data(instrument_token = stock_code, from_date = fromdate, to_date = todate, 
                                       interval = "3minute", oi = True)
-    with open(naam, mode="w", newline='') as csvfile0:
-        print(str(count + 1) + "successful")
-        writer = csv.DictWriter(csvfile0, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(kitedata5m)
+    #columnar write through pandas instead of a dict per row with DictWriter
+    pd.DataFrame(kitedata5m, columns=fields).to_csv(naam, index=False)
+    print(str(count + 1) + "successful")
 
 #/Users/anishrayaguru/Desktop/SCLU/datadumps2
 #/Users/anishrayaguru/Desktop/SCLU/datadumpsp2
\ No newline at end of file
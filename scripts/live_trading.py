@@ -9,17 +9,25 @@ import argparse
 import sys
 import time
 import signal
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, time as dt_time, timedelta
 from pathlib import Path
 
+import numpy as np
+
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from sclu.api import KiteClient
-from sclu.utils import Config, get_logger, TradingLogger
+from sclu.utils import Config, get_logger, get_trading_logger
 
 logger = get_logger(__name__)
-trading_logger = TradingLogger()
+trading_logger = get_trading_logger()
+
+# NSE trading session (IST)
+MARKET_OPEN = dt_time(9, 15)
+MARKET_CLOSE = dt_time(15, 30)
 
 
 class LiveTrader:
@@ -35,9 +43,26 @@ class LiveTrader:
         self.config = config
         self.client = None
         self.running = False
+        # Set on shutdown so waits end at once instead of sleeping on
+        self._stop_event = threading.Event()
         self.positions = {}
         self.trade_count = 0
         
+        # Settings read on every tick, looked up once
+        self._sens = config.get('trading', 'sensitivity')
+        self._feel = config.get('trading', 'feeling')
+        self._max_trades = config.get('trading', 'max_daily_trades')
+        self._refresh = config.get('data', 'data_refresh_interval')
+        self._symbol_cache = {}
+        
+        # Market data for all instruments is fetched concurrently; the calls
+        # are network bound so threads are enough
+        instruments = config.get('data', 'default_instruments') or []
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(instruments)),
+            thread_name_prefix='sclu-market-data'
+        )
+        
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -46,6 +71,7 @@ class LiveTrader:
         """Handle shutdown signals."""
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
         self.running = False
+        self._stop_event.set()
     
     def initialize(self) -> bool:
         """
@@ -71,16 +97,17 @@ class LiveTrader:
             logger.error(f"Failed to initialize trading client: {e}")
             return False
     
-    def analyze_market_data(self, instrument_token: int, instrument_name: str) -> dict:
+    def fetch_market_data(self, instrument_token: int, instrument_name: str) -> dict:
         """
-        Analyze current market data for trading signals.
+        Fetch the latest price and OI derivatives for an instrument.
         
         Args:
             instrument_token: Token for the instrument
             instrument_name: Human-readable name
             
         Returns:
-            dict: Analysis results with signal information
+            dict: Latest price, doi and d2oi, or a HOLD signal with the reason
+                  if no data could be obtained
         """
         try:
             # Fetch recent data
@@ -92,38 +119,11 @@ class LiveTrader:
                 return {'signal': 'HOLD', 'reason': 'Insufficient data'}
             
             # Get latest values
-            latest = df.iloc[-1]
-            current_price = latest['close']
-            doi = latest['doi'] if 'doi' in df.columns else 0
-            d2oi = latest['d2oi'] if 'd2oi' in df.columns else 0
-            
-            # Strategy parameters
-            sens = self.config.get('trading', 'sensitivity')
-            feel = self.config.get('trading', 'feeling')
-            
-            # Generate signals based on SCLU strategy
-            signal = 'HOLD'
-            reason = 'No clear signal'
-            
-            # Check for buy signal
-            if doi < 0 and d2oi < (-0.1 * sens * feel):
-                signal = 'BUY'
-                reason = f'OI derivatives indicate selling pressure (doi: {doi:.2f}, d2oi: {d2oi:.2f})'
-            
-            # Check for sell signal (if in position)
-            elif doi > (-1 * sens * feel) or d2oi > (-0.1 * sens * feel):
-                signal = 'SELL'
-                if doi > (-1 * sens * feel):
-                    reason = f'First derivative exit (doi: {doi:.2f})'
-                else:
-                    reason = f'Second derivative exit (d2oi: {d2oi:.2f})'
-            
+            # Read the last row straight from the column arrays, no row Series
             return {
-                'signal': signal,
-                'reason': reason,
-                'price': current_price,
-                'doi': doi,
-                'd2oi': d2oi,
+                'price': df['close'].to_numpy()[-1],
+                'doi': df['doi'].to_numpy()[-1] if 'doi' in df.columns else 0,
+                'd2oi': df['d2oi'].to_numpy()[-1] if 'd2oi' in df.columns else 0,
                 'timestamp': datetime.now()
             }
         
@@ -131,6 +131,62 @@ class LiveTrader:
             logger.error(f"Error analyzing market data for {instrument_name}: {e}")
             return {'signal': 'HOLD', 'reason': f'Analysis error: {e}'}
     
+    def generate_signals(self, analyses: list) -> None:
+        """
+        Add SCLU signals to fetched market data, all instruments at once.
+        
+        Entries that already carry a signal (fetch failures) are left alone.
+        
+        Args:
+            analyses: Results of fetch_market_data, updated in place with
+                      'signal' and 'reason'
+        """
+        pending = [analysis for analysis in analyses if 'signal' not in analysis]
+        if not pending:
+            return
+        
+        doi = np.array([analysis['doi'] for analysis in pending], dtype=np.float64)
+        d2oi = np.array([analysis['d2oi'] for analysis in pending], dtype=np.float64)
+        
+        # Strategy thresholds
+        entry_d2oi = -0.1 * self._sens * self._feel
+        exit_doi = -1 * self._sens * self._feel
+        
+        # Buy takes precedence over the exit rules
+        buy = (doi < 0) & (d2oi < entry_d2oi)
+        sell_doi = doi > exit_doi
+        sell_d2oi = d2oi > entry_d2oi
+        signals = np.where(buy, 'BUY', np.where(sell_doi | sell_d2oi, 'SELL', 'HOLD'))
+        
+        for analysis, sig, first_exit in zip(pending, signals.tolist(), sell_doi.tolist()):
+            if sig == 'BUY':
+                reason = (f"OI derivatives indicate selling pressure "
+                          f"(doi: {analysis['doi']:.2f}, d2oi: {analysis['d2oi']:.2f})")
+            elif sig == 'SELL':
+                if first_exit:
+                    reason = f"First derivative exit (doi: {analysis['doi']:.2f})"
+                else:
+                    reason = f"Second derivative exit (d2oi: {analysis['d2oi']:.2f})"
+            else:
+                reason = 'No clear signal'
+            analysis['signal'] = sig
+            analysis['reason'] = reason
+    
+    def analyze_market_data(self, instrument_token: int, instrument_name: str) -> dict:
+        """
+        Analyze current market data for trading signals.
+        
+        Args:
+            instrument_token: Token for the instrument
+            instrument_name: Human-readable name
+            
+        Returns:
+            dict: Analysis results with signal information
+        """
+        analysis = self.fetch_market_data(instrument_token, instrument_name)
+        self.generate_signals([analysis])
+        return analysis
+    
     def execute_trade(self, instrument_token: int, signal: str, analysis: dict) -> bool:
         """
         Execute a trade based on the signal.
@@ -148,10 +204,13 @@ class LiveTrader:
         
         try:
             # Get instrument symbol
-            symbol = self.client.lookup_instrument(instrument_token)
-            if not symbol:
-                logger.error(f"Could not find symbol for token {instrument_token}")
-                return False
+            symbol = self._symbol_cache.get(instrument_token)
+            if symbol is None:
+                symbol = self.client.lookup_instrument(instrument_token)
+                if not symbol:
+                    logger.error(f"Could not find symbol for token {instrument_token}")
+                    return False
+                self._symbol_cache[instrument_token] = symbol
             
             # Check position status
             is_in_position = instrument_token in self.positions
@@ -161,7 +220,7 @@ class LiveTrader:
                 # Enter new position
                 quantity = 25  # Default lot size - should be configurable
                 
-                if self.trade_count >= self.config.get('trading', 'max_daily_trades'):
+                if self.trade_count >= self._max_trades:
                     logger.warning("Maximum daily trades reached")
                     return False
                 
@@ -219,6 +278,7 @@ class LiveTrader:
         """Main trading loop."""
         logger.info("Starting live trading loop")
         self.running = True
+        self._stop_event.clear()
         
         # Get instruments from config
         instruments = self.config.get('data', 'default_instruments')
@@ -230,8 +290,8 @@ class LiveTrader:
         # Wait for market open (9:15 AM IST)
         self._wait_for_market_open()
         
-        start_time = time.time()
-        refresh_interval = self.config.get('data', 'data_refresh_interval')
+        next_tick = time.monotonic()
+        refresh_interval = self._refresh
         
         while self.running:
             try:
@@ -242,16 +302,22 @@ class LiveTrader:
                     logger.info("Market is closed, stopping trading")
                     break
                 
-                # Process each instrument
+                # Fetch all instruments concurrently
+                futures = {}
                 for instrument_token in instruments:
+                    instrument_name = instrument_names.get(instrument_token, f"Token-{instrument_token}")
+                    future = self._executor.submit(self.fetch_market_data, instrument_token, instrument_name)
+                    futures[future] = (instrument_token, instrument_name)
+                
+                results = [(*futures[future], future.result()) for future in as_completed(futures)]
+                
+                # Signals for every instrument in one pass; trades stay on this thread
+                self.generate_signals([analysis for _, _, analysis in results])
+                
+                for instrument_token, instrument_name, analysis in results:
                     if not self.running:
                         break
                     
-                    instrument_name = instrument_names.get(instrument_token, f"Token-{instrument_token}")
-                    
-                    # Analyze market data
-                    analysis = self.analyze_market_data(instrument_token, instrument_name)
-                    
                     # Log market data
                     trading_logger.log_market_data(
                         instrument_name,
@@ -264,28 +330,39 @@ class LiveTrader:
                     if analysis['signal'] != 'HOLD':
                         self.execute_trade(instrument_token, analysis['signal'], analysis)
                 
-                # Sleep until next refresh
-                elapsed = time.time() - start_time
-                sleep_time = refresh_interval - (elapsed % refresh_interval)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                # Sleep until the next refresh deadline; monotonic time keeps the
+                # phase fixed and ignores wall clock adjustments
+                next_tick += refresh_interval
+                now = time.monotonic()
+                if next_tick <= now:
+                    # Processing overran, skip the ticks that were missed
+                    next_tick += ((now - next_tick) // refresh_interval + 1) * refresh_interval
+                self._stop_event.wait(next_tick - now)
                 
             except KeyboardInterrupt:
                 logger.info("Keyboard interrupt received")
                 break
             except Exception as e:
                 logger.error(f"Error in trading loop: {e}")
-                time.sleep(60)  # Wait before retrying
+                self._stop_event.wait(60)  # Wait before retrying
         
         logger.info("Trading loop ended")
     
     def _wait_for_market_open(self) -> None:
         """Wait for market to open."""
-        while True:
-            if self._is_market_open():
-                break
-            logger.info("Waiting for market to open...")
-            time.sleep(60)
+        # Wait straight through to the next session open instead of polling;
+        # a shutdown signal ends the wait early
+        while self.running and not self._is_market_open():
+            now = datetime.now()
+            open_dt = datetime.combine(now.date(), MARKET_OPEN)
+            if now >= open_dt:
+                open_dt += timedelta(days=1)
+            while open_dt.weekday() >= 5:  # Saturday = 5, Sunday = 6
+                open_dt += timedelta(days=1)
+            
+            wait_seconds = (open_dt - now).total_seconds()
+            logger.info(f"Waiting {wait_seconds / 60:.0f} minutes for market to open at {open_dt}")
+            self._stop_event.wait(wait_seconds)
     
     def _is_market_open(self) -> bool:
         """Check if market is currently open."""
@@ -296,11 +373,7 @@ class LiveTrader:
             return False
         
         # Check time (9:15 AM to 3:30 PM IST)
-        current_time = now.time()
-        market_open = datetime.strptime("09:15:00", "%H:%M:%S").time()
-        market_close = datetime.strptime("15:30:00", "%H:%M:%S").time()
-        
-        return market_open <= current_time <= market_close
+        return MARKET_OPEN <= now.time() <= MARKET_CLOSE
     
     def cleanup(self) -> None:
         """Cleanup before shutdown."""
@@ -311,6 +384,8 @@ class LiveTrader:
             logger.info(f"Found {len(self.positions)} open positions")
             # Implement position closure logic here if needed
         
+        self._executor.shutdown(wait=False)
+        
         logger.info("Cleanup completed")
 
 
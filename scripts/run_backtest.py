@@ -12,10 +12,8 @@ from pathlib import Path
 # Add src to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-import backtrader as bt
-from sclu.strategies import SCLUStrategy
-from sclu.data import DataLoader
 from sclu.utils import Config, get_logger
+from sclu.utils.logger import setup_logging
 
 logger = get_logger(__name__)
 
@@ -38,6 +36,11 @@ def run_backtest(
     Returns:
         dict: Backtest results
     """
+    # backtrader is slow to import, only pay for it when a backtest runs
+    import backtrader as bt
+    from sclu.data import DataLoader
+    from sclu.strategies import SCLUStrategy
+    
     logger.info(f"Starting backtest with data file: {data_file}")
     
     # Create cerebro instance
@@ -45,10 +48,10 @@ def run_backtest(
     
     # Load data
     loader = DataLoader()
-    data_feed = loader.create_backtrader_feed(data_file)
-    
-    # Resample to 3-minute bars (NSE OI refresh cycle)
-    cerebro.resampledata(data_feed, timeframe=bt.TimeFrame.Minutes, compression=3)
+    # Resampled to 3-minute bars (NSE OI refresh cycle) while loading, so
+    # backtrader only iterates the compressed bars
+    data_feed = loader.create_backtrader_feed(data_file, timeframe_minutes=3, resample=True)
+    cerebro.adddata(data_feed)
     
     # Add strategy
     if strategy_params:
@@ -151,6 +154,7 @@ def main():
     parser.add_argument("--sensitivity", type=float, help="Strategy sensitivity parameter")
     parser.add_argument("--feeling", type=int, help="Strategy feeling parameter")
     parser.add_argument("--config", help="Configuration file path")
+    parser.add_argument("--verbose", action="store_true", help="Log every signal, order and trade")
     
     args = parser.parse_args()
     
@@ -163,6 +167,10 @@ def main():
         strategy_params['sensitivity'] = args.sensitivity
     if args.feeling:
         strategy_params['feeling'] = args.feeling
+    if args.verbose:
+        strategy_params['verbose'] = True
+        # The strategy logs signals, orders and trades at DEBUG level
+        setup_logging(level="DEBUG")
     
     try:
         # Run backtest
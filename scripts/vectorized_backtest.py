@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+SCLU Vectorized Backtesting Script
+
+Run the original SCLU open-interest rules as array operations instead of
+a per-bar backtrader event loop. Every sensitivity/feeling combination is
+evaluated in a single pass, which makes parameter sweeps cheap.
+
+Uses vectorbt for the portfolio simulation when it is installed and falls
+back to the compiled long-only simulator in ``sclu.kernels`` otherwise.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Sequence, Tuple
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from sclu.data import DataProcessor
+from sclu.kernels import _oi_derivs, _simulate_long_only
+from sclu.utils import get_logger
+
+try:
+    import vectorbt as vbt
+except ImportError:  # vectorbt is optional
+    vbt = None
+
+logger = get_logger(__name__)
+
+OHLCV_OI_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'oi']
+
+
+def load_data(
+    data_file: str,
+    datetime_format: str = '%Y-%m-%d %H:%M:%S+05:30',
+    compression: int = 3
+) -> pd.DataFrame:
+    """
+    Load an OHLCV+OI CSV file and resample it to the OI refresh interval.
+
+    Args:
+        data_file: Path to CSV with datetime, open, high, low, close, volume, oi columns
+        datetime_format: Format string for parsing the datetime column
+        compression: Bar size in minutes to resample to (1 keeps the raw bars)
+
+    Returns:
+        pd.DataFrame: Data indexed by datetime with OHLCV and oi columns
+    """
+    df = pd.read_csv(data_file, index_col=0)
+    df.index = pd.to_datetime(df.index, format=datetime_format)
+    df.columns = OHLCV_OI_COLUMNS
+
+    if compression > 1:
+        # NSE refreshes open interest every 3 minutes
+        df = DataProcessor.resample_data(df, f'{compression}min')
+
+    return df
+
+
+def generate_signals(
+    doi: np.ndarray,
+    d2oi: np.ndarray,
+    sensitivity: Sequence[float],
+    feeling: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build SCLU entry/exit signals for a grid of parameters.
+
+    Each (sensitivity, feeling) pair becomes one column of the output.
+
+    Args:
+        doi: First derivative of open interest
+        d2oi: Second derivative of open interest
+        sensitivity: Sensitivity values, one per column
+        feeling: Feeling values, one per column
+
+    Returns:
+        Tuple of (entries, exits) boolean arrays of shape (n_bars, n_params)
+    """
+    scale = np.asarray(sensitivity, dtype=np.float64) * np.asarray(feeling, dtype=np.float64)
+    doi = doi[:, None]
+    d2oi = d2oi[:, None]
+
+    entries = (doi < 0) & (d2oi < -0.1 * scale)
+    exits = (doi > -scale) & (d2oi > -0.1 * scale)
+    return entries, exits
+
+
+def run_vectorized_backtest(
+    df: pd.DataFrame,
+    sensitivities: Sequence[float],
+    feelings: Sequence[float],
+    initial_cash: float = 1000.0,
+    fees: float = 0.001
+) -> pd.DataFrame:
+    """
+    Backtest every sensitivity/feeling combination in one pass.
+
+    Args:
+        df: Data with 'close' and 'oi' columns
+        sensitivities: Sensitivity values to test
+        feelings: Feeling values to test
+        initial_cash: Starting cash for each combination
+        fees: Proportional commission per trade
+
+    Returns:
+        pd.DataFrame: One row per combination with final value, return and
+        closed trade count
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    doi, d2oi = _oi_derivs(df['oi'].to_numpy(dtype=np.float64))
+
+    grid_sens, grid_feel = np.meshgrid(sensitivities, feelings, indexing='ij')
+    grid_sens = grid_sens.ravel()
+    grid_feel = grid_feel.ravel()
+
+    entries, exits = generate_signals(doi, d2oi, grid_sens, grid_feel)
+    logger.info(f"Running {entries.shape[1]} parameter combinations over {len(close)} bars")
+
+    if vbt is not None:
+        columns = pd.MultiIndex.from_arrays([grid_sens, grid_feel], names=['sensitivity', 'feeling'])
+        pf = vbt.Portfolio.from_signals(
+            df['close'],
+            pd.DataFrame(entries, index=df.index, columns=columns),
+            pd.DataFrame(exits, index=df.index, columns=columns),
+            init_cash=initial_cash,
+            fees=fees
+        )
+        final_value = pf.final_value().to_numpy()
+        # Closed trades only, like the fallback simulator; a position still
+        # open on the last bar is not counted
+        trade_count = pf.trades.closed.count().to_numpy()
+    else:
+        final_value, trade_count = _simulate_long_only(close, entries, exits, initial_cash, fees)
+
+    return pd.DataFrame({
+        'sensitivity': grid_sens,
+        'feeling': grid_feel,
+        'final_value': final_value,
+        'total_return_pct': (final_value - initial_cash) / initial_cash * 100,
+        'total_trades': trade_count,
+    })
+
+
+def main():
+    """Main entry point for vectorized backtest script."""
+    parser = argparse.ArgumentParser(description="Run vectorized SCLU backtest / parameter sweep")
+    parser.add_argument("data_file", help="Path to historical data CSV file")
+    parser.add_argument("--cash", type=float, default=1000.0, help="Initial cash amount")
+    parser.add_argument("--fees", type=float, default=0.001, help="Commission per trade")
+    parser.add_argument("--compression", type=int, default=3, help="Bar size in minutes")
+    parser.add_argument("--sensitivity", type=float, nargs='+', default=[0.01],
+                        help="Sensitivity value(s) to test")
+    parser.add_argument("--feeling", type=float, nargs='+', default=[3000000],
+                        help="Feeling value(s) to test")
+
+    args = parser.parse_args()
+
+    try:
+        df = load_data(args.data_file, compression=args.compression)
+        results = run_vectorized_backtest(
+            df,
+            sensitivities=args.sensitivity,
+            feelings=args.feeling,
+            initial_cash=args.cash,
+            fees=args.fees
+        )
+        print(results.to_string(index=False))
+
+    except Exception as e:
+        logger.error(f"Vectorized backtest failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
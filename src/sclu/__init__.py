@@ -9,12 +9,31 @@ __version__ = "1.0.0"
 __author__ = "Anish Rayaguru"
 __email__ = "your.email@example.com"
 
-from .strategies import SCLUStrategy
-from .indicators import OpenInterestIndicator, OpenInterestDerivative, OpenInterestSecondDerivative
+import importlib
+
+# The strategy and indicators pull in backtrader, so they are imported on
+# first access; `import sclu.api` or `sclu.utils` stays cheap
+_LAZY_IMPORTS = {
+    'SCLUStrategy': '.strategies',
+    'OpenInterestIndicator': '.indicators',
+    'OpenInterestDerivative': '.indicators',
+    'OpenInterestSecondDerivative': '.indicators',
+    'OpenInterestAnalytics': '.indicators',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'SCLUStrategy',
     'OpenInterestIndicator', 
     'OpenInterestDerivative',
-    'OpenInterestSecondDerivative'
+    'OpenInterestSecondDerivative',
+    'OpenInterestAnalytics'
 ]
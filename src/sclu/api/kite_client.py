@@ -6,16 +6,63 @@ for live trading functionality.
 """
 
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from kiteconnect import KiteConnect
+from urllib3.util.retry import Retry
 
+from ..kernels import _oi_derivs
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# HTTPAdapter settings for the Kite session. KiteConnect already keeps one
+# requests.Session alive; this sizes its pool for concurrent instrument
+# fetches and retries idempotent requests (never order placement) on
+# transient failures.
+HTTP_POOL = {
+    'pool_connections': 4,
+    'pool_maxsize': 16,
+    'max_retries': Retry(total=3, backoff_factor=0.2),
+}
+
+# Seconds that positions/orders/holdings responses are reused for; keeps
+# tight polling loops under Kite's per-second rate limits
+API_CACHE_TTL = 0.5
+
+# Kite allows 3 historical data requests per second
+HISTORICAL_RATE_LIMIT = 3
+
+
+class _RateLimiter:
+    """Token bucket allowing ``rate`` calls per ``per`` seconds across threads."""
+    
+    def __init__(self, rate: int, per: float = 1.0) -> None:
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a call is allowed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.per / self.rate
+            time.sleep(wait)
+
 
 class KiteClient:
     """
@@ -30,30 +77,52 @@ class KiteClient:
         kite (KiteConnect): Kite Connect client instance
     """
     
-    def __init__(self, api_key: str, access_token: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        access_token: str,
+        cache_dir: Optional[Union[str, Path]] = None
+    ) -> None:
         """
         Initialize the Kite client.
         
         Args:
             api_key: Kite Connect API key
             access_token: Valid access token
+            cache_dir: Directory for the daily instrument list cache; the list
+                       is always fetched from the API when not set
         """
         self.api_key = api_key
         self.access_token = access_token
-        self.kite = KiteConnect(api_key=api_key)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.kite = KiteConnect(api_key=api_key, pool=HTTP_POOL)
+        self.kite.reqsession.headers['Connection'] = 'keep-alive'
         self.kite.set_access_token(access_token)
         self._instrument_df: Optional[pd.DataFrame] = None
+        self._token_to_symbol: Dict[int, str] = {}
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._historical_limiter = _RateLimiter(HISTORICAL_RATE_LIMIT)
+        self._historical_executor = ThreadPoolExecutor(
+            max_workers=HISTORICAL_RATE_LIMIT,
+            thread_name_prefix='kite-historical'
+        )
         
         logger.info("Kite client initialized successfully")
     
     @classmethod
-    def from_config_files(cls, api_key_file: str, access_token_file: str) -> 'KiteClient':
+    def from_config_files(
+        cls,
+        api_key_file: str,
+        access_token_file: str,
+        cache_dir: Optional[Union[str, Path]] = None
+    ) -> 'KiteClient':
         """
         Create KiteClient instance from configuration files.
         
         Args:
             api_key_file: Path to file containing API key
             access_token_file: Path to file containing access token
+            cache_dir: Directory for the daily instrument list cache
             
         Returns:
             KiteClient: Configured client instance
@@ -72,7 +141,7 @@ class KiteClient:
             if not api_key or not access_token:
                 raise ValueError("API key or access token is empty")
             
-            return cls(api_key, access_token)
+            return cls(api_key, access_token, cache_dir=cache_dir)
         
         except FileNotFoundError as e:
             logger.error(f"Configuration file not found: {e}")
@@ -93,11 +162,22 @@ class KiteClient:
                          tradingsymbol, name, etc.
         """
         try:
+            if self._instrument_df is None:
+                self._instrument_df = self._load_cached_instruments(exchange)
+            
             if self._instrument_df is None:
                 logger.info(f"Fetching instruments for exchange: {exchange}")
                 instruments = self.kite.instruments(exchange)
                 self._instrument_df = pd.DataFrame(instruments)
                 logger.info(f"Loaded {len(self._instrument_df)} instruments")
+                self._save_cached_instruments(exchange, self._instrument_df)
+            
+            if not self._token_to_symbol:
+                # O(1) token -> symbol lookups instead of scanning the frame
+                self._token_to_symbol = dict(zip(
+                    self._instrument_df['instrument_token'].tolist(),
+                    self._instrument_df['tradingsymbol'].tolist()
+                ))
             
             return self._instrument_df
         
@@ -105,6 +185,64 @@ class KiteClient:
             logger.error(f"Error fetching instruments: {e}")
             raise
     
+    def _instrument_cache_path(self, exchange: str) -> Optional[Path]:
+        """Path of today's instrument cache file, or None when caching is off."""
+        if self.cache_dir is None:
+            return None
+        # The date in the name invalidates the cache every trading day
+        return self.cache_dir / f"instruments_{exchange}_{date.today():%Y%m%d}.parquet"
+    
+    def _load_cached_instruments(self, exchange: str) -> Optional[pd.DataFrame]:
+        """
+        Load today's instrument list from disk if it was cached earlier.
+        
+        Args:
+            exchange: Exchange name
+            
+        Returns:
+            Optional[pd.DataFrame]: Cached instruments, or None on a cache miss
+        """
+        path = self._instrument_cache_path(exchange)
+        if path is None:
+            return None
+        
+        try:
+            if path.exists():
+                df = pd.read_parquet(path)
+            elif path.with_suffix('.csv').exists():
+                df = pd.read_csv(path.with_suffix('.csv'))
+            else:
+                return None
+        except Exception as e:
+            logger.warning(f"Could not read instrument cache: {e}")
+            return None
+        
+        logger.info(f"Loaded {len(df)} instruments from cache")
+        return df
+    
+    def _save_cached_instruments(self, exchange: str, df: pd.DataFrame) -> None:
+        """
+        Write the instrument list to today's cache file.
+        
+        Falls back to CSV when no parquet engine is installed.
+        
+        Args:
+            exchange: Exchange name
+            df: Instrument data to cache
+        """
+        path = self._instrument_cache_path(exchange)
+        if path is None:
+            return
+        
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                df.to_parquet(path)
+            except ImportError:
+                df.to_csv(path.with_suffix('.csv'), index=False)
+        except Exception as e:
+            logger.warning(f"Could not write instrument cache: {e}")
+    
     def lookup_instrument(self, token: int) -> Optional[str]:
         """
         Look up trading symbol for an instrument token.
@@ -116,14 +254,12 @@ class KiteClient:
             Optional[str]: Trading symbol if found, None otherwise
         """
         try:
-            df = self.get_instruments()
-            result = df[df.instrument_token == token].tradingsymbol.values
+            self.get_instruments()
+            symbol = self._token_to_symbol.get(token)
             
-            if len(result) > 0:
-                return result[0]
-            else:
+            if symbol is None:
                 logger.warning(f"Instrument token {token} not found")
-                return None
+            return symbol
         
         except Exception as e:
             logger.error(f"Error looking up instrument {token}: {e}")
@@ -157,6 +293,7 @@ class KiteClient:
                 f"from {start_time} to {end_time}"
             )
             
+            self._historical_limiter.acquire()
             data = self.kite.historical_data(
                 instrument_token,
                 start_time,
@@ -175,35 +312,70 @@ class KiteClient:
             logger.error(f"Error fetching historical data: {e}")
             raise
     
-    def calculate_oi_derivatives(self, df: pd.DataFrame) -> pd.DataFrame:
+    def fetch_historical_data_many(
+        self,
+        instrument_tokens: List[int],
+        duration_minutes: int,
+        interval: str = "3minute",
+        include_oi: bool = True
+    ) -> Dict[int, pd.DataFrame]:
+        """
+        Fetch historical data for several instruments concurrently.
+        
+        Requests overlap on a small thread pool and share the client's rate
+        limiter, so the batch stays under Kite's limit of
+        HISTORICAL_RATE_LIMIT historical requests per second.
+        
+        Args:
+            instrument_tokens: Tokens of the instruments to fetch
+            duration_minutes: How many minutes of history to fetch
+            interval: Data interval (default: "3minute")
+            include_oi: Whether to include open interest data
+            
+        Returns:
+            Dict[int, pd.DataFrame]: Historical data keyed by instrument token;
+                                     instruments that failed are left out
+        """
+        futures = {
+            token: self._historical_executor.submit(
+                self.fetch_historical_data, token, duration_minutes, interval, include_oi
+            )
+            for token in instrument_tokens
+        }
+        
+        results = {}
+        for token, future in futures.items():
+            try:
+                results[token] = future.result()
+            except Exception:
+                # Already logged by fetch_historical_data
+                continue
+        return results
+    
+    def calculate_oi_derivatives(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Calculate Open Interest derivatives for the given DataFrame.
         
         Args:
             df: DataFrame with OHLC and OI data
+            inplace: Add the columns to ``df`` itself instead of a copy
             
         Returns:
             pd.DataFrame: DataFrame with added 'doi' and 'd2oi' columns
         """
-        df = df.copy()
-        df['doi'] = None
-        df['d2oi'] = None
-        
-        # Calculate first derivative (rate of change)
-        for i in range(1, len(df)):
-            df.iloc[i, df.columns.get_loc('doi')] = round(
-                (df.iloc[i, df.columns.get_loc('oi')] - 
-                 df.iloc[i-1, df.columns.get_loc('oi')]) / 3
-            )
+        if not inplace:
+            df = df.copy()
         
-        # Calculate second derivative (acceleration)
-        for i in range(2, len(df)):
-            df.iloc[i, df.columns.get_loc('d2oi')] = round(
-                (df.iloc[i, df.columns.get_loc('oi')] + 
-                 df.iloc[i-2, df.columns.get_loc('oi')] - 
-                 2 * df.iloc[i-1, df.columns.get_loc('oi')]) / 9
-            )
+        # First derivative (rate of change) and second derivative
+        # (acceleration) over 3-minute bars, rounded to whole contracts
+        doi, d2oi = _oi_derivs(df['oi'].to_numpy(dtype=np.float64))
+        doi[:1] = np.nan
+        d2oi[:2] = np.nan
+        np.round(doi, out=doi)
+        np.round(d2oi, out=d2oi)
         
+        df['doi'] = doi
+        df['d2oi'] = d2oi
         return df
     
     def place_market_order(
@@ -244,12 +416,42 @@ class KiteClient:
             )
             
             logger.info(f"Order placed successfully. Order ID: {order_id}")
+            
+            # Positions and orders changed, don't serve them from the cache
+            self._cache.pop('positions', None)
+            self._cache.pop('orders', None)
             return order_id
         
         except Exception as e:
             logger.error(f"Error placing order: {e}")
             return None
     
+    def _cached(self, key: str, fetch: Callable[[], Any], ttl: float = API_CACHE_TTL) -> Any:
+        """
+        Return a recent response for ``key`` or fetch a fresh one.
+        
+        Args:
+            key: Cache key
+            fetch: Function making the API call
+            ttl: Seconds a response stays valid
+            
+        Returns:
+            Any: Cached or freshly fetched response
+        """
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
+        
+        value = fetch()
+        self._cache[key] = (now, value)
+        return value
+    
+    def _fetch_positions(self) -> List[Dict[str, Any]]:
+        """Fetch net and day positions as one list."""
+        positions = self.kite.positions()
+        return positions.get('net', []) + positions.get('day', [])
+    
     def get_positions(self) -> List[Dict[str, Any]]:
         """
         Get current positions.
@@ -258,8 +460,7 @@ class KiteClient:
             List[Dict]: List of position dictionaries
         """
         try:
-            positions = self.kite.positions()
-            return positions.get('net', []) + positions.get('day', [])
+            return self._cached('positions', self._fetch_positions)
         
         except Exception as e:
             logger.error(f"Error fetching positions: {e}")
@@ -273,7 +474,7 @@ class KiteClient:
             List[Dict]: List of order dictionaries
         """
         try:
-            return self.kite.orders()
+            return self._cached('orders', self.kite.orders)
         
         except Exception as e:
             logger.error(f"Error fetching orders: {e}")
@@ -287,7 +488,7 @@ class KiteClient:
             List[Dict]: List of holding dictionaries
         """
         try:
-            return self.kite.holdings()
+            return self._cached('holdings', self.kite.holdings)
         
         except Exception as e:
             logger.error(f"Error fetching holdings: {e}")
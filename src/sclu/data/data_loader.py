@@ -5,18 +5,78 @@ This module provides functionality to load historical market data
 from various sources including CSV files and live API feeds.
 """
 
+import hashlib
 import os
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 from pathlib import Path
 
 import backtrader.feeds as btfeeds
 
+try:
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional, pandas parses the CSV without it
+    pacsv = None
+
+from .data_processor import DataProcessor
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Frames kept in memory by load_csv_data, least recently used first
+CSV_MEMO_SIZE = 32
+_CSV_MEMO: 'OrderedDict[tuple, pd.DataFrame]' = OrderedDict()
+
+# Copy-on-write is always on from pandas 3, so a shallow copy of a cached
+# frame cannot write through to it; older versions need a deep copy
+_SHALLOW_MEMO_COPY = int(pd.__version__.split('.')[0]) >= 3
+
+
+def _peek_csv(filepath: Path, chunk_size: int = 1 << 20) -> Tuple[str, str, str, int]:
+    """
+    Read the header, first and last data rows and the row count of a CSV.
+    
+    Lines are counted over raw byte chunks and the last row is found by
+    seeking to the end of the file, so nothing is parsed. Blank lines are
+    only skipped at the end of the file.
+    
+    Args:
+        filepath: CSV file path
+        chunk_size: Bytes read per chunk while counting lines
+        
+    Returns:
+        Tuple[str, str, str, int]: Header, first row, last row (empty
+        strings when the file has no data rows) and the number of data rows
+    """
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        first = f.readline()
+        
+        newlines = first.count(b'\n')
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            newlines += chunk.count(b'\n')
+        
+        # The last row is the last non-blank line in the final block
+        end = f.seek(0, os.SEEK_END)
+        f.seek(max(data_start, end - 65536))
+        tail = f.read()
+        body = tail.rstrip()
+        last = body.rsplit(b'\n', 1)[-1] if body else b''
+        
+        # Trailing newlines and blank lines do not end another row
+        record_count = newlines - tail[len(body):].count(b'\n') + 1 if body else 0
+    
+    return (
+        header.decode().strip(),
+        first.decode().strip(),
+        last.decode().strip(),
+        record_count
+    )
+
 
 class DataLoader:
     """
@@ -26,28 +86,58 @@ class DataLoader:
     it for use with backtrader or direct analysis.
     """
     
-    def __init__(self, data_directory: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        data_directory: Optional[str] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        use_cache: bool = True
+    ) -> None:
         """
         Initialize the DataLoader.
         
         Args:
             data_directory: Directory containing historical data files
+            cache_dir: Directory for parquet caches of parsed CSV files;
+                nothing is written to disk when None
+            use_cache: Cache parsed CSV files in memory, and as parquet when
+                ``cache_dir`` is set, and reuse them while the CSV is unchanged
         """
         self.data_directory = Path(data_directory) if data_directory else None
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.use_cache = use_cache
         logger.info(f"DataLoader initialized with directory: {self.data_directory}")
     
     def load_csv_data(
         self,
         filename: str,
         datetime_format: str = '%Y-%m-%d %H:%M:%S+05:30',
+        dtype: str = 'float32',
         **kwargs
     ) -> pd.DataFrame:
         """
         Load OHLCV+OI data from a CSV file.
         
+        When the loader has a ``cache_dir``, the parsed frame is cached
+        there as a parquet file keyed by the CSV's path, modification time
+        and size, so later loads of an unchanged file skip the CSV parse.
+        Caching needs pyarrow and is skipped when extra read_csv arguments
+        are given.
+        
+        The last ``CSV_MEMO_SIZE`` loaded frames are also kept in memory
+        and repeated loads return a copy of them, so callers may modify
+        the result freely. With pandas 3 copy-on-write the copy is shallow
+        and only copies data that is written to. ``DataLoader.clear_cache()``
+        empties it.
+        
+        By default prices are stored as float32 and whole-number volume and
+        open interest as int32, which halves the memory of the frame and of
+        everything resampled or copied from it. Pass ``dtype='float64'`` to
+        keep full precision.
+        
         Args:
             filename: Name of the CSV file (with or without path)
             datetime_format: Format string for parsing datetime
+            dtype: Price column dtype, 'float32' or 'float64'
             **kwargs: Additional arguments passed to pd.read_csv
             
         Returns:
@@ -57,6 +147,9 @@ class DataLoader:
             FileNotFoundError: If the specified file doesn't exist
             ValueError: If the data format is invalid
         """
+        if dtype not in ('float32', 'float64'):
+            raise ValueError(f"dtype must be 'float32' or 'float64', got {dtype!r}")
+        
         # Determine full file path
         if self.data_directory and not os.path.isabs(filename):
             filepath = self.data_directory / filename
@@ -66,18 +159,83 @@ class DataLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"Data file not found: {filepath}")
         
+        memo_key = None
+        if self.use_cache:
+            stat = filepath.stat()
+            memo_key = (
+                str(filepath.resolve()), stat.st_mtime_ns, stat.st_size,
+                datetime_format, dtype, tuple(sorted(kwargs.items()))
+            )
+            try:
+                hash(memo_key)
+            except TypeError:  # unhashable read_csv arguments
+                memo_key = None
+        
+        if memo_key is not None and memo_key in _CSV_MEMO:
+            _CSV_MEMO.move_to_end(memo_key)
+            logger.debug(f"Using in-memory copy of {filepath}")
+            return _CSV_MEMO[memo_key].copy(deep=not _SHALLOW_MEMO_COPY)
+        
+        df = self._read_csv_file(filepath, datetime_format, dtype, **kwargs)
+        
+        if memo_key is not None:
+            _CSV_MEMO[memo_key] = df
+            if len(_CSV_MEMO) > CSV_MEMO_SIZE:
+                _CSV_MEMO.popitem(last=False)
+            df = df.copy(deep=not _SHALLOW_MEMO_COPY)
+        return df
+    
+    def _read_csv_file(
+        self,
+        filepath: Path,
+        datetime_format: str,
+        dtype: str,
+        **kwargs
+    ) -> pd.DataFrame:
+        """
+        Read and format a CSV file, through the parquet cache when possible.
+        
+        Args:
+            filepath: Existing CSV file path
+            datetime_format: Format string for parsing datetime
+            dtype: Price column dtype, 'float32' or 'float64'
+            **kwargs: Additional arguments passed to pd.read_csv
+            
+        Returns:
+            pd.DataFrame: Loaded and formatted data
+        """
         logger.info(f"Loading data from: {filepath}")
         
+        cache_path = self._csv_cache_path(filepath) if not kwargs else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                df = pd.read_parquet(cache_path)
+                logger.info(f"Loaded {len(df)} data points from cache {cache_path}")
+                return self._downcast(df, dtype)
+            except Exception as e:
+                logger.warning(f"Could not read data cache {cache_path}: {e}")
+        
         try:
-            # Default CSV reading parameters for SCLU data format
-            default_params = {
-                'parse_dates': [0],
-                'date_parser': lambda x: pd.to_datetime(x, format=datetime_format),
-                'index_col': 0
-            }
-            default_params.update(kwargs)
+            if pacsv is not None and not kwargs:
+                # Multi-threaded parse of the numbers and the datetime column
+                table = pacsv.read_csv(
+                    filepath,
+                    convert_options=pacsv.ConvertOptions(timestamp_parsers=[datetime_format])
+                )
+                df = table.to_pandas()
+                df = df.set_index(df.columns[0])
+            else:
+                # Default CSV reading parameters for SCLU data format
+                default_params = {
+                    'index_col': 0
+                }
+                default_params.update(kwargs)
+                
+                df = pd.read_csv(filepath, **default_params)
             
-            df = pd.read_csv(filepath, **default_params)
+            # Parse the datetime column in one vectorized call if it is still text
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index, format=datetime_format)
             
             # Validate required columns
             required_columns = ['open', 'high', 'low', 'close', 'volume']
@@ -104,30 +262,110 @@ class DataLoader:
                 df['oi'] = df['openinterest']
             
             logger.info(f"Loaded {len(df)} data points from {filepath}")
-            return df
         
         except Exception as e:
             logger.error(f"Error loading data from {filepath}: {e}")
             raise
+        
+        if cache_path is not None:
+            self._save_csv_cache(cache_path, df)
+        return self._downcast(df, dtype)
+    
+    @staticmethod
+    def _downcast(df: pd.DataFrame, dtype: str) -> pd.DataFrame:
+        """
+        Narrow the OHLCV+OI columns of a freshly loaded frame.
+        
+        Args:
+            df: Loaded data
+            dtype: Price column dtype; 'float64' leaves the frame unchanged
+            
+        Returns:
+            pd.DataFrame: The same frame with narrowed columns
+        """
+        if dtype == 'float64':
+            return df
+        
+        for col in ('open', 'high', 'low', 'close'):
+            if col in df.columns:
+                df[col] = df[col].astype(dtype)
+        
+        for col in ('volume', 'oi'):
+            if col in df.columns:
+                # Stays float if the column has fractions or gaps
+                values = pd.to_numeric(df[col], downcast='integer')
+                if values.dtype.kind == 'i' and values.dtype.itemsize < 4:
+                    # Keep room for differences and sums of the column
+                    values = values.astype(np.int32)
+                df[col] = values
+        
+        return df
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop every frame held in the in-memory CSV cache."""
+        _CSV_MEMO.clear()
+    
+    def _csv_cache_path(self, filepath: Path) -> Optional[Path]:
+        """Path of the parquet cache for a CSV file, or None when caching is off."""
+        if not self.use_cache or self.cache_dir is None or pacsv is None:
+            return None
+        stat = filepath.stat()
+        # The path digest keeps same-named CSVs from different directories apart
+        digest = hashlib.sha1(str(filepath.resolve()).encode()).hexdigest()[:12]
+        # Modification time and size in the name invalidate the cache when the CSV changes
+        return self.cache_dir / f"{filepath.stem}-{digest}_{stat.st_mtime_ns}_{stat.st_size}.parquet"
+    
+    def _save_csv_cache(self, cache_path: Path, df: pd.DataFrame) -> None:
+        """
+        Write a parsed frame to its parquet cache and drop stale versions.
+        
+        Args:
+            cache_path: Cache file path from _csv_cache_path
+            df: Parsed data to cache
+        """
+        stem = cache_path.stem.rsplit('_', 2)[0]
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(cache_path, compression='zstd')
+        except Exception as e:
+            logger.warning(f"Could not write data cache {cache_path}: {e}")
+            return
+        
+        # Older caches of the same CSV can never be hit again
+        for stale in cache_path.parent.glob(f"{stem}_*_*.parquet"):
+            if stale != cache_path and stale.stem.rsplit('_', 2)[0] == stem:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
     
     def create_backtrader_feed(
         self,
         filename: str,
         datetime_format: str = '%Y-%m-%d %H:%M:%S+05:30',
         timeframe_minutes: int = 3,
+        resample: bool = False,
         **kwargs
-    ) -> btfeeds.GenericCSVData:
+    ) -> Union[btfeeds.GenericCSVData, btfeeds.PandasData]:
         """
         Create a backtrader data feed from a CSV file.
         
+        With ``resample=True`` the file is loaded and resampled to
+        ``timeframe_minutes`` bars in pandas, and the compressed bars are
+        returned as a PandasData feed. Add it with ``cerebro.adddata``
+        rather than ``cerebro.resampledata``; backtrader then only iterates
+        the resampled bars.
+        
         Args:
             filename: CSV file name/path
             datetime_format: DateTime format string
             timeframe_minutes: Timeframe in minutes for resampling
-            **kwargs: Additional parameters for GenericCSVData
+            resample: Resample to timeframe_minutes bars before building the feed
+            **kwargs: Additional parameters for GenericCSVData or PandasData
             
         Returns:
-            btfeeds.GenericCSVData: Configured backtrader data feed
+            Union[btfeeds.GenericCSVData, btfeeds.PandasData]: Configured backtrader data feed
         """
         # Determine full file path
         if self.data_directory and not os.path.isabs(filename):
@@ -137,6 +375,29 @@ class DataLoader:
         
         logger.info(f"Creating backtrader feed for: {filepath}")
         
+        if resample:
+            df = self.load_csv_data(filepath, datetime_format=datetime_format)
+            # Right-closed, right-labelled bars, as cerebro.resampledata builds them
+            df = DataProcessor.resample_data(
+                df, f'{timeframe_minutes}min', closed='right', label='right'
+            )
+            
+            pandas_params = {
+                'dataname': df,
+                'datetime': None,
+                'open': 'open',
+                'high': 'high',
+                'low': 'low',
+                'close': 'close',
+                'volume': 'volume',
+                'openinterest': 'oi',
+                'timeframe': btfeeds.TimeFrame.Minutes,
+                'compression': timeframe_minutes
+            }
+            pandas_params.update(kwargs)
+            
+            return btfeeds.PandasData(**pandas_params)
+        
         # Default parameters for SCLU CSV format
         default_params = {
             'dataname': filepath,
@@ -179,12 +440,25 @@ class DataLoader:
             logger.error(f"Error listing files: {e}")
             return []
     
-    def get_file_info(self, filename: str) -> Dict[str, Any]:
+    def get_file_info(
+        self,
+        filename: str,
+        datetime_format: str = '%Y-%m-%d %H:%M:%S+05:30',
+        full_scan: bool = False
+    ) -> Dict[str, Any]:
         """
         Get information about a data file.
         
+        By default only the header, the first and last data rows and the
+        line count are read, so the cost does not depend on parsing the
+        file; the date range assumes rows are in chronological order. Pass
+        ``full_scan=True`` to load the file and report the parsed columns
+        and the true minimum and maximum timestamps.
+        
         Args:
             filename: Name of the file to analyze
+            datetime_format: Format string for parsing datetime
+            full_scan: Load the whole file instead of peeking at its edges
             
         Returns:
             Dict[str, Any]: File information including size, date range, etc.
@@ -208,15 +482,28 @@ class DataLoader:
             
             # Try to get data info
             try:
-                df = self.load_csv_data(str(filepath))
-                info.update({
-                    'record_count': len(df),
-                    'date_range': {
-                        'start': df.index.min(),
-                        'end': df.index.max()
-                    },
-                    'columns': list(df.columns)
-                })
+                if full_scan:
+                    df = self.load_csv_data(str(filepath), datetime_format=datetime_format)
+                    info.update({
+                        'record_count': len(df),
+                        'date_range': {
+                            'start': df.index.min(),
+                            'end': df.index.max()
+                        },
+                        'columns': list(df.columns)
+                    })
+                else:
+                    header, first, last, record_count = _peek_csv(filepath)
+                    info.update({
+                        'record_count': record_count,
+                        'date_range': {
+                            'start': pd.to_datetime(first.split(',', 1)[0], format=datetime_format)
+                            if first else None,
+                            'end': pd.to_datetime(last.split(',', 1)[0], format=datetime_format)
+                            if last else None
+                        },
+                        'columns': header.split(',')[1:]
+                    })
             except Exception as e:
                 logger.warning(f"Could not analyze data content: {e}")
                 info['data_error'] = str(e)
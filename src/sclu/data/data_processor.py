@@ -10,10 +10,33 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 
+from ..kernels import _bollinger, _ewm_mean, _rolling_mean, _rolling_means, _rsi
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Indian market sessions (IST) as minutes since midnight:
+# pre-market 9:00-9:15, normal 9:15-15:30, post-market 15:40-16:00
+SESSION_BOUNDARIES = np.array([0, 540, 555, 930, 940, 960])
+SESSION_LABELS = np.array(['closed', 'pre_market', 'normal', 'closed', 'post_market', 'closed'])
+
+
+def _lag(values: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Shift a 1-D float array forward by ``periods``, filling the start with NaN.
+    
+    Args:
+        values: Input array
+        periods: Number of positions to shift by
+        
+    Returns:
+        np.ndarray: Lagged copy of ``values``
+    """
+    lagged = np.empty_like(values)
+    lagged[:periods] = np.nan
+    lagged[periods:] = values[:-periods]
+    return lagged
+
 
 class DataProcessor:
     """
@@ -24,18 +47,20 @@ class DataProcessor:
     """
     
     @staticmethod
-    def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(df: pd.DataFrame, *, copy: bool = False) -> pd.DataFrame:
         """
         Clean and validate market data.
         
         Args:
             df: Raw market data DataFrame
+            copy: Clean a copy of ``df`` instead of ``df`` itself
             
         Returns:
             pd.DataFrame: Cleaned data
         """
         logger.info("Cleaning market data")
-        df = df.copy()
+        if copy:
+            df = df.copy()
         
         # Remove rows with missing OHLC data
         ohlc_cols = ['open', 'high', 'low', 'close']
@@ -45,13 +70,15 @@ class DataProcessor:
         if len(df) < initial_count:
             logger.warning(f"Removed {initial_count - len(df)} rows with missing OHLC data")
         
-        # Validate OHLC relationships
+        # Validate OHLC relationships: high must be the bar maximum and low
+        # the bar minimum (rows with NaN were dropped above)
+        open_ = df['open'].to_numpy()
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        close = df['close'].to_numpy()
         invalid_ohlc = (
-            (df['high'] < df['low']) |
-            (df['high'] < df['open']) |
-            (df['high'] < df['close']) |
-            (df['low'] > df['open']) |
-            (df['low'] > df['close'])
+            (high < np.maximum(np.maximum(open_, close), low)) |
+            (low > np.minimum(open_, close))
         )
         
         if invalid_ohlc.any():
@@ -78,62 +105,74 @@ class DataProcessor:
         return df
     
     @staticmethod
-    def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    def add_technical_indicators(df: pd.DataFrame, *, copy: bool = False) -> pd.DataFrame:
         """
         Add common technical indicators to the data.
         
         Args:
             df: OHLCV data
+            copy: Add the indicators to a copy of ``df`` instead of to
+                ``df`` itself
             
         Returns:
             pd.DataFrame: Data with added technical indicators
         """
         logger.info("Adding technical indicators")
-        df = df.copy()
+        if copy:
+            df = df.copy()
+        
+        close = df['close'].to_numpy(dtype=np.float64)
         
         # Simple Moving Averages
-        for period in [5, 10, 20, 50]:
-            df[f'sma_{period}'] = df['close'].rolling(window=period).mean()
+        sma_periods = np.array([5, 10, 20, 50])
+        smas = _rolling_means(close, sma_periods)
+        for period, sma in zip(sma_periods.tolist(), smas):
+            df[f'sma_{period}'] = sma
         
         # Exponential Moving Averages
-        for period in [12, 26]:
-            df[f'ema_{period}'] = df['close'].ewm(span=period).mean()
+        ema_12 = _ewm_mean(close, 12)
+        ema_26 = _ewm_mean(close, 26)
+        df['ema_12'] = ema_12
+        df['ema_26'] = ema_26
         
         # MACD
-        df['macd'] = df['ema_12'] - df['ema_26']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
+        macd = ema_12 - ema_26
+        macd_signal = _ewm_mean(macd, 9)
+        df['macd'] = macd
+        df['macd_signal'] = macd_signal
+        df['macd_histogram'] = macd - macd_signal
         
         # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = _rsi(close, 14)
         
         # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-        df['bb_width'] = df['bb_upper'] - df['bb_lower']
-        df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
+        bb_middle, bb_upper, bb_lower, bb_width, bb_position = _bollinger(close, 20, 2.0)
+        df['bb_middle'] = bb_middle
+        df['bb_upper'] = bb_upper
+        df['bb_lower'] = bb_lower
+        df['bb_width'] = bb_width
+        df['bb_position'] = bb_position
         
         # Volume indicators
         if 'volume' in df.columns:
-            df['volume_sma'] = df['volume'].rolling(window=20).mean()
-            df['volume_ratio'] = df['volume'] / df['volume_sma']
+            volume = df['volume'].to_numpy(dtype=np.float64)
+            volume_sma = _rolling_mean(volume, 20)
+            df['volume_sma'] = volume_sma
+            with np.errstate(divide='ignore', invalid='ignore'):
+                df['volume_ratio'] = volume / volume_sma
         
         logger.info("Technical indicators added successfully")
         return df
     
     @staticmethod
-    def add_oi_analysis(df: pd.DataFrame) -> pd.DataFrame:
+    def add_oi_analysis(df: pd.DataFrame, *, copy: bool = False) -> pd.DataFrame:
         """
         Add Open Interest analysis indicators.
         
         Args:
             df: Data with Open Interest column
+            copy: Add the indicators to a copy of ``df`` instead of to
+                ``df`` itself
             
         Returns:
             pd.DataFrame: Data with OI analysis indicators
@@ -143,32 +182,41 @@ class DataProcessor:
             return df
         
         logger.info("Adding Open Interest analysis")
-        df = df.copy()
+        if copy:
+            df = df.copy()
+        
+        oi = df['oi'].to_numpy(dtype=np.float64)
         
         # Basic OI indicators
-        df['oi_sma_10'] = df['oi'].rolling(window=10).mean()
-        df['oi_sma_30'] = df['oi'].rolling(window=30).mean()
-        df['oi_ratio'] = df['oi'] / df['oi_sma_30']
+        oi_sma_10, oi_sma_30 = _rolling_means(oi, np.array([10, 30]))
+        df['oi_sma_10'] = oi_sma_10
+        df['oi_sma_30'] = oi_sma_30
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['oi_ratio'] = oi / oi_sma_30
+        
+        # Lagged OI arrays, built once and shared by every indicator below
+        oi_m1 = _lag(oi, 1)
+        oi_m2 = _lag(oi, 2)
         
         # OI derivatives (matching SCLU strategy)
-        df['oi_change'] = df['oi'].diff()
-        df['oi_pct_change'] = df['oi'].pct_change()
+        oi_change = oi - oi_m1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            oi_pct_change = oi / oi_m1 - 1
+        df['oi_change'] = oi_change
+        df['oi_pct_change'] = oi_pct_change
         
         # First derivative (rate of change)
-        df['oi_derivative'] = df['oi_change'] / 3  # 3-minute normalization
+        df['oi_derivative'] = oi_change / 3  # 3-minute normalization
         
         # Second derivative (acceleration)
-        df['oi_second_derivative'] = (
-            df['oi'] + df['oi'].shift(2) - 2 * df['oi'].shift(1)
-        ) / 9  # 3^2 normalization
+        df['oi_second_derivative'] = (oi + oi_m2 - 2 * oi_m1) / 9  # 3^2 normalization
         
         # OI momentum
-        df['oi_momentum'] = df['oi'] - df['oi'].shift(4)
+        df['oi_momentum'] = oi - _lag(oi, 4)
         
         # Price-OI divergence
         price_change = df['close'].pct_change()
-        oi_change = df['oi'].pct_change()
-        df['price_oi_divergence'] = price_change - oi_change
+        df['price_oi_divergence'] = price_change.to_numpy() - oi_pct_change
         
         logger.info("Open Interest analysis completed")
         return df
@@ -177,21 +225,35 @@ class DataProcessor:
     def resample_data(
         df: pd.DataFrame,
         timeframe: str,
-        agg_methods: Optional[Dict[str, str]] = None
+        agg_methods: Optional[Dict[str, str]] = None,
+        closed: Optional[str] = None,
+        label: Optional[str] = None,
+        columns: Optional[List[str]] = None
     ) -> pd.DataFrame:
         """
         Resample data to a different timeframe.
         
+        Columns without an aggregation method are averaged. Bars are only
+        dropped when one of the OHLCV+OI (or ``agg_methods``) columns is
+        missing, so indicator warm-up NaNs do not remove rows.
+        
         Args:
             df: Input data
             timeframe: Target timeframe (e.g., '5T', '15T', '1H')
             agg_methods: Custom aggregation methods for columns
+            closed: Which side of each bin is closed ('left' or 'right')
+            label: Which bin edge labels each bar ('left' or 'right')
+            columns: Only resample these columns; indicators are usually
+                better recomputed on the resampled bars
             
         Returns:
             pd.DataFrame: Resampled data
         """
         logger.info(f"Resampling data to {timeframe} timeframe")
         
+        if columns is not None:
+            df = df[columns]
+        
         # Default aggregation methods
         default_agg = {
             'open': 'first',
@@ -213,48 +275,64 @@ class DataProcessor:
             if col not in agg_dict:
                 agg_dict[col] = 'mean'
         
-        resampled = df.resample(timeframe).agg(agg_dict)
-        resampled = resampled.dropna()
+        resampled = df.resample(timeframe, closed=closed, label=label).agg(agg_dict)
+        resampled = resampled.dropna(subset=[col for col in default_agg if col in resampled.columns])
         
         logger.info(f"Resampling completed. Data points: {len(resampled)}")
         return resampled
     
     @staticmethod
-    def detect_market_sessions(df: pd.DataFrame) -> pd.DataFrame:
+    def detect_market_sessions(
+        df: pd.DataFrame,
+        *,
+        copy: bool = False,
+        keep_time_cols: bool = False
+    ) -> pd.DataFrame:
         """
         Detect and mark market sessions in the data.
         
         Args:
             df: Market data with datetime index
+            copy: Add the session columns to a copy of ``df`` instead of
+                to ``df`` itself
+            keep_time_cols: Also add the intermediate 'hour', 'minute' and
+                'time_minutes' columns
             
         Returns:
             pd.DataFrame: Data with session markers
         """
         logger.info("Detecting market sessions")
-        df = df.copy()
-        
-        # Extract time components
-        df['hour'] = df.index.hour
-        df['minute'] = df.index.minute
-        df['time_minutes'] = df['hour'] * 60 + df['minute']
-        
-        # Define Indian market sessions (IST)
-        # Pre-market: 9:00-9:15
-        # Normal session: 9:15-15:30
-        # Post-market: 15:40-16:00
-        
-        df['session'] = 'closed'
-        df.loc[(df['time_minutes'] >= 540) & (df['time_minutes'] < 555), 'session'] = 'pre_market'
-        df.loc[(df['time_minutes'] >= 555) & (df['time_minutes'] < 930), 'session'] = 'normal'
-        df.loc[(df['time_minutes'] >= 940) & (df['time_minutes'] < 960), 'session'] = 'post_market'
+        if copy:
+            df = df.copy()
+        
+        # Extract time components as small local arrays
+        hour = df.index.hour.to_numpy().astype(np.int16)
+        minute = df.index.minute.to_numpy().astype(np.int16)
+        time_minutes = hour * 60 + minute
+        if keep_time_cols:
+            df['hour'] = hour
+            df['minute'] = minute
+            df['time_minutes'] = time_minutes
+        
+        # Look up each bar's session in the sorted boundary table
+        session_idx = np.searchsorted(SESSION_BOUNDARIES, time_minutes, side='right') - 1
+        df['session'] = SESSION_LABELS[session_idx]
         
         # Mark first and last bars of each session
-        df['session_start'] = df['session'] != df['session'].shift(1)
-        df['session_end'] = df['session'] != df['session'].shift(-1)
-        
-        # Calculate time since session start
-        session_groups = df.groupby((df['session'] != df['session'].shift(1)).cumsum())
-        df['minutes_in_session'] = session_groups.cumcount()
+        n = len(df)
+        session_start = np.ones(n, dtype=bool)
+        session_end = np.ones(n, dtype=bool)
+        if n > 1:
+            changed = SESSION_LABELS[session_idx[1:]] != SESSION_LABELS[session_idx[:-1]]
+            session_start[1:] = changed
+            session_end[:-1] = changed
+        df['session_start'] = session_start
+        df['session_end'] = session_end
+        
+        # Calculate time since session start (bars since the run began)
+        run_starts = np.flatnonzero(session_start)
+        run_id = np.cumsum(session_start) - 1
+        df['minutes_in_session'] = np.arange(n) - run_starts[run_id]
         
         logger.info("Market session detection completed")
         return df
@@ -275,33 +353,33 @@ class DataProcessor:
             logger.error(f"Returns column '{returns_col}' not found")
             return {}
         
-        returns = df[returns_col].dropna()
+        returns = df[returns_col].dropna().to_numpy(dtype=np.float64)
+        n = returns.size
         
-        if len(returns) == 0:
+        if n == 0:
             logger.warning("No valid returns data found")
             return {}
         
         # Basic metrics
-        total_return = (1 + returns).prod() - 1
-        annualized_return = (1 + total_return) ** (252 / len(returns)) - 1
-        volatility = returns.std() * np.sqrt(252)
+        cumulative = np.cumprod(1 + returns)
+        total_return = cumulative[-1] - 1
+        annualized_return = (1 + total_return) ** (252 / n) - 1
+        volatility = returns.std(ddof=1) * np.sqrt(252) if n > 1 else np.nan
         
         # Risk metrics
         sharpe_ratio = annualized_return / volatility if volatility > 0 else 0
         
         # Drawdown analysis
-        cumulative = (1 + returns).cumprod()
-        running_max = cumulative.expanding().max()
-        drawdown = (cumulative - running_max) / running_max
-        max_drawdown = drawdown.min()
+        running_max = np.maximum.accumulate(cumulative)
+        max_drawdown = ((cumulative - running_max) / running_max).min()
         
         # Win/Loss analysis
         positive_returns = returns[returns > 0]
         negative_returns = returns[returns < 0]
         
-        win_rate = len(positive_returns) / len(returns) if len(returns) > 0 else 0
-        avg_win = positive_returns.mean() if len(positive_returns) > 0 else 0
-        avg_loss = negative_returns.mean() if len(negative_returns) > 0 else 0
+        win_rate = positive_returns.size / n
+        avg_win = positive_returns.mean() if positive_returns.size > 0 else 0
+        avg_loss = negative_returns.mean() if negative_returns.size > 0 else 0
         profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
         
         metrics = {
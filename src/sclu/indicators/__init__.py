@@ -3,11 +3,13 @@
 from .open_interest import (
     OpenInterestIndicator,
     OpenInterestDerivative, 
-    OpenInterestSecondDerivative
+    OpenInterestSecondDerivative,
+    OpenInterestAnalytics
 )
 
 __all__ = [
     'OpenInterestIndicator',
     'OpenInterestDerivative',
-    'OpenInterestSecondDerivative'
+    'OpenInterestSecondDerivative',
+    'OpenInterestAnalytics'
 ]
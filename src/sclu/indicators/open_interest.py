@@ -6,11 +6,18 @@ in options trading. The indicators include:
 - Open Interest Indicator
 - First Derivative of Open Interest (rate of change)
 - Second Derivative of Open Interest (acceleration/deceleration)
+- Open Interest Analytics (all three lines in a single indicator)
 """
 
 import backtrader as bt
+import numpy as np
 from typing import Any
 
+from ..kernels import _oi_derivs_range
+
+# Placeholder for the derivative an indicator does not compute
+_NO_OUTPUT = np.empty(0)
+
 
 class OpenInterestIndicator(bt.Indicator):
     """
@@ -23,9 +30,11 @@ class OpenInterestIndicator(bt.Indicator):
     lines = ('oi',)
     plotinfo = dict(subplot=True)
     
-    def next(self) -> None:
-        """Calculate the indicator value for the current period."""
-        self.lines.oi[0] = self.data.openinterest[0]
+    def __init__(self) -> None:
+        """Initialize the indicator."""
+        super().__init__()
+        # Bind the line to the feed's open interest; no per-bar work needed
+        self.lines.oi = self.data.openinterest
 
 
 class OpenInterestDerivative(bt.Indicator):
@@ -50,7 +59,9 @@ class OpenInterestDerivative(bt.Indicator):
     def __init__(self) -> None:
         """Initialize the indicator."""
         super().__init__()
-        self.lines.doi = self.data.openinterest
+        self.addminperiod(2)  # next() only runs once the previous bar exists
+        # Multiply by the reciprocal instead of dividing on every bar
+        self._inv_tp = 1.0 / self.params.time_period
     
     def next(self) -> None:
         """
@@ -63,12 +74,23 @@ class OpenInterestDerivative(bt.Indicator):
         The formula divides by time_period to normalize the rate of change
         based on the NSE's 3-minute refresh cycle for open interest data.
         """
-        if len(self.data.openinterest) > 1:
-            self.lines.doi[0] = (
-                self.data.openinterest[0] - self.data.openinterest[-1]
-            ) / self.params.time_period
-        else:
-            self.lines.doi[0] = 0
+        oi = self.data.openinterest
+        self.lines.doi[0] = (oi[0] - oi[-1]) * self._inv_tp
+    
+    def once(self, start: int, end: int) -> None:
+        """
+        Calculate the first derivative for bars ``start`` to ``end`` at once.
+        
+        Used by backtrader in runonce mode instead of calling ``next`` for
+        every bar; the compiled loop gives the same values.
+        """
+        _oi_derivs_range(
+            np.frombuffer(self.data.openinterest.array),
+            self._inv_tp, 0.0,
+            start, end,
+            np.frombuffer(self.lines.doi.array),
+            _NO_OUTPUT
+        )
 
 
 class OpenInterestSecondDerivative(bt.Indicator):
@@ -95,7 +117,9 @@ class OpenInterestSecondDerivative(bt.Indicator):
     def __init__(self) -> None:
         """Initialize the indicator."""
         super().__init__()
-        self.addminperiod(2)  # Need at least 2 periods for second derivative
+        self.addminperiod(3)  # next() only runs once two previous bars exist
+        # Multiply by the reciprocal instead of dividing on every bar
+        self._inv_tp2 = 1.0 / (self.params.time_period * self.params.time_period)
     
     def next(self) -> None:
         """
@@ -108,16 +132,81 @@ class OpenInterestSecondDerivative(bt.Indicator):
         The formula uses the discrete second derivative approximation
         and normalizes by time_period squared (9 for 3-minute periods).
         """
-        data_length = len(self.data.openinterest)
+        # Second derivative formula: f(n) + f(n-2) - 2*f(n-1)
+        oi = self.data.openinterest
+        self.lines.d2oi[0] = (oi[0] + oi[-2] - 2 * oi[-1]) * self._inv_tp2
+    
+    def once(self, start: int, end: int) -> None:
+        """
+        Calculate the second derivative for bars ``start`` to ``end`` at once.
+        
+        Used by backtrader in runonce mode instead of calling ``next`` for
+        every bar; the compiled loop gives the same values.
+        """
+        _oi_derivs_range(
+            np.frombuffer(self.data.openinterest.array),
+            0.0, self._inv_tp2,
+            start, end,
+            _NO_OUTPUT,
+            np.frombuffer(self.lines.d2oi.array)
+        )
+
+
+class OpenInterestAnalytics(bt.Indicator):
+    """
+    Open interest with its first and second derivatives in one indicator.
+    
+    Produces the same values as OpenInterestIndicator, OpenInterestDerivative
+    and OpenInterestSecondDerivative combined, but backtrader dispatches a
+    single indicator per bar and both derivatives share one pass over the
+    open interest line.
+    
+    Parameters:
+        time_period (int): Time period for derivative calculation (default: 3)
+    """
+    
+    lines = ('oi', 'doi', 'd2oi')
+    plotinfo = dict(subplot=True)
+    params = (('time_period', 3),)
+    
+    def __init__(self) -> None:
+        """Initialize the indicator."""
+        super().__init__()
+        self.lines.oi = self.data.openinterest
+        # Multiply by the reciprocals instead of dividing on every bar
+        self._inv_tp = 1.0 / self.params.time_period
+        self._inv_tp2 = 1.0 / (self.params.time_period * self.params.time_period)
+    
+    def next(self) -> None:
+        """Calculate both open interest derivatives for the current bar."""
+        oi = self.data.openinterest
+        data_length = len(oi)
         
         if data_length < 2:
+            self.lines.doi[0] = 0
             self.lines.d2oi[0] = 0
         else:
-            # Second derivative formula: f(n) + f(n-2) - 2*f(n-1)
-            current_oi = self.data.openinterest[0]
-            prev_oi = self.data.openinterest[-1]
-            prev2_oi = self.data.openinterest[-2] if data_length > 2 else prev_oi
+            current_oi = oi[0]
+            prev_oi = oi[-1]
+            prev2_oi = oi[-2] if data_length > 2 else prev_oi
             
-            self.lines.d2oi[0] = (
-                current_oi + prev2_oi - 2 * prev_oi
-            ) / (self.params.time_period ** 2)
+            self.lines.doi[0] = (current_oi - prev_oi) * self._inv_tp
+            self.lines.d2oi[0] = (current_oi + prev2_oi - 2 * prev_oi) * self._inv_tp2
+    
+    def once(self, start: int, end: int) -> None:
+        """
+        Calculate both derivatives for bars ``start`` to ``end`` at once.
+        
+        Used by backtrader in runonce mode instead of calling ``next`` for
+        every bar; the compiled loop gives the same values.
+        """
+        # Zero-copy views of the line buffers, made once per run here and not
+        # in __init__: a live view would stop array.array from growing while
+        # the feed loads
+        _oi_derivs_range(
+            np.frombuffer(self.data.openinterest.array),
+            self._inv_tp, self._inv_tp2,
+            start, end,
+            np.frombuffer(self.lines.doi.array),
+            np.frombuffer(self.lines.d2oi.array)
+        )
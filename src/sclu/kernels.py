@@ -0,0 +1,464 @@
+"""
+Compiled numerical kernels for SCLU.
+
+This module holds the hot inner loops shared by the backtest indicators
+and the live trading path. Kernels are compiled with numba when it is
+installed; otherwise they run as plain Python/NumPy functions with the
+same signatures and results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange, types
+except ImportError:  # numba is an optional dependency
+    def njit(*args, **kwargs):
+        """No-op stand-in for ``numba.njit`` when numba is unavailable."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+    types = None
+
+# Bit flags returned by _sclu_signal_codes
+SIGNAL_BUY = 1
+SIGNAL_SELL = 2
+
+# Codes returned by _classify_regimes
+REGIME_TRENDING_UP = 0
+REGIME_TRENDING_DOWN = 1
+REGIME_SIDEWAYS = 2
+REGIME_HIGH_VOLATILITY = 3
+REGIME_UNKNOWN = 4
+
+# Explicit signatures for the OI kernels so numba compiles them (or loads
+# them from the on-disk cache) when this module is imported instead of on
+# the first call from a backtest or the live loop
+if types is not None:
+    # Read-only input also accepts the arrays pandas hands out under copy-on-write
+    _OI_INPUT = types.Array(types.float64, 1, 'A', readonly=True)
+    _OI_DERIVS_SIG = types.UniTuple(types.float64[:], 2)(_OI_INPUT)
+    _OI_DERIVS_RANGE_SIG = types.void(
+        _OI_INPUT, types.float64, types.float64, types.int64, types.int64,
+        types.float64[:], types.float64[:]
+    )
+else:
+    _OI_DERIVS_SIG = _OI_DERIVS_RANGE_SIG = None
+
+
+@njit(_OI_DERIVS_SIG, cache=True, fastmath=True)
+def _oi_derivs(oi):
+    """
+    Compute the first and second derivative of an open interest series.
+
+    Uses the same stencils as the SCLU indicators, with the 3-minute bar
+    interval folded in: ``(oi[i] - oi[i-1]) / 3`` and
+    ``(oi[i] + oi[i-2] - 2*oi[i-1]) / 9``. Leading values that do not
+    have enough history are set to 0.
+
+    Args:
+        oi: 1-D float64 array of open interest values
+
+    Returns:
+        Tuple of (doi, d2oi) float64 arrays with the same length as ``oi``
+    """
+    n = oi.shape[0]
+    doi = np.empty(n)
+    d2oi = np.empty(n)
+    if n > 0:
+        doi[0] = 0.0
+        d2oi[0] = 0.0
+    if n > 1:
+        d2oi[1] = 0.0
+    for i in range(1, n):
+        doi[i] = (oi[i] - oi[i - 1]) / 3
+    for i in range(2, n):
+        d2oi[i] = (oi[i] + oi[i - 2] - 2 * oi[i - 1]) / 9
+    return doi, d2oi
+
+
+@njit(_OI_DERIVS_RANGE_SIG, cache=True)
+def _oi_derivs_range(oi, doi_scale, d2oi_scale, start, end, doi, d2oi):
+    """
+    Fill the OI derivative lines of the backtrader indicators in one loop.
+
+    Computes ``(oi[i] - oi[i-1]) * doi_scale`` and
+    ``(oi[i] + oi[i-2] - 2*oi[i-1]) * d2oi_scale`` for bars ``start`` to
+    ``end``, with the same start-up values as ``OpenInterestAnalytics.next``:
+    the first derivative of bar 0 is 0 and the second derivative of bar 1
+    repeats ``oi[0]`` for the missing ``oi[-2]``. Pass an empty array for
+    a derivative that is not needed.
+
+    Args:
+        oi: 1-D float64 array of open interest values
+        doi_scale: Reciprocal of the bar interval, ``1 / time_period``
+        d2oi_scale: Reciprocal of the squared interval, ``1 / time_period**2``
+        start: First bar to compute
+        end: One past the last bar to compute
+        doi: Output array for the first derivative, or an empty array
+        d2oi: Output array for the second derivative, or an empty array
+    """
+    want_doi = doi.shape[0] > 0
+    want_d2oi = d2oi.shape[0] > 0
+    for i in range(start, end):
+        if i == 0:
+            if want_doi:
+                doi[0] = 0.0
+            if want_d2oi:
+                d2oi[0] = 0.0
+            continue
+        prev = oi[i - 1]
+        if want_doi:
+            doi[i] = (oi[i] - prev) * doi_scale
+        if want_d2oi:
+            prev2 = oi[i - 2] if i > 1 else prev
+            d2oi[i] = (oi[i] + prev2 - 2 * prev) * d2oi_scale
+
+
+@njit(cache=True)
+def _simulate_long_only(close, entries, exits, init_cash, fees):
+    """
+    Simulate an all-in, long-only portfolio driven by entry/exit signals.
+
+    Each column of ``entries``/``exits`` is an independent parameter set.
+    When flat, an entry buys with all available cash at the bar close;
+    when in a position, an exit sells everything at the bar close. Fees
+    are charged as a fraction of traded value on both sides.
+
+    Args:
+        close: 1-D float64 array of close prices
+        entries: 2-D boolean array of shape (n_bars, n_params)
+        exits: 2-D boolean array of shape (n_bars, n_params)
+        init_cash: Starting cash for every column
+        fees: Proportional commission per trade
+
+    Returns:
+        Tuple of (final_value, trade_count) arrays of length n_params
+    """
+    n, k = entries.shape
+    final_value = np.empty(k)
+    trade_count = np.zeros(k, dtype=np.int64)
+    for j in range(k):
+        cash = init_cash
+        shares = 0.0
+        for i in range(n):
+            if shares == 0.0:
+                if entries[i, j]:
+                    shares = cash / (close[i] * (1.0 + fees))
+                    cash = 0.0
+            elif exits[i, j]:
+                cash = shares * close[i] * (1.0 - fees)
+                shares = 0.0
+                trade_count[j] += 1
+        final_value[j] = cash + shares * close[n - 1] if n > 0 else cash
+    return final_value, trade_count
+
+
+@njit(cache=True)
+def _rolling_zscore(values, window):
+    """
+    Rolling z-score of a series in a single pass.
+
+    Keeps a running sum and sum of squares over the window instead of
+    computing a rolling mean and a rolling standard deviation separately.
+    Uses the sample standard deviation (ddof=1) to match pandas. NaN values
+    are left out of the running sums, so only the windows that contain a
+    NaN are NaN.
+
+    Args:
+        values: 1-D float64 array
+        window: Window length
+
+    Returns:
+        float64 array of z-scores; the first ``window - 1`` entries and any
+        window containing a NaN are NaN
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            s += x
+            s2 += x * x
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                s -= old
+                s2 -= old * old
+        if i >= window - 1 and nan_count == 0:
+            mean = s / window
+            var = (s2 - s * mean) / (window - 1)
+            if var > 0.0:
+                out[i] = (x - mean) / np.sqrt(var)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _sclu_signal_codes(doi, d2oi, entry_d2oi, exit_doi, exit_d2oi):
+    """
+    Evaluate the SCLU buy/sell rules in one pass over the derivative arrays.
+
+    Buy when ``doi < 0`` and ``d2oi < entry_d2oi``; sell when
+    ``doi > exit_doi`` or ``d2oi > exit_d2oi``. The two rules are
+    independent, so a bar can carry both flags. Thresholds are arrays of
+    the same length as ``doi``; pass ``np.broadcast_to(value, n)`` for a
+    constant threshold.
+
+    Args:
+        doi: First derivative of open interest
+        d2oi: Second derivative of open interest
+        entry_d2oi: Entry threshold for the second derivative
+        exit_doi: Exit threshold for the first derivative
+        exit_d2oi: Exit threshold for the second derivative
+
+    Returns:
+        uint8 array of SIGNAL_BUY / SIGNAL_SELL bit flags (0 for no signal)
+    """
+    n = doi.shape[0]
+    out = np.zeros(n, np.uint8)
+    for i in prange(n):
+        code = 0
+        if doi[i] < 0 and d2oi[i] < entry_d2oi[i]:
+            code |= SIGNAL_BUY
+        if doi[i] > exit_doi[i] or d2oi[i] > exit_d2oi[i]:
+            code |= SIGNAL_SELL
+        out[i] = code
+    return out
+
+
+@njit(cache=True)
+def _classify_regimes(volatility, trend, vol_threshold, trend_threshold):
+    """
+    Assign a market regime code to every bar.
+
+    Codes are ``REGIME_TRENDING_UP``, ``REGIME_TRENDING_DOWN``,
+    ``REGIME_SIDEWAYS`` and ``REGIME_HIGH_VOLATILITY`` for bars whose
+    volatility and trend are defined, and ``REGIME_UNKNOWN`` otherwise.
+
+    Args:
+        volatility: 1-D float64 array of rolling volatility
+        trend: 1-D float64 array of fractional price change over the window
+        vol_threshold: Volatility at or above which a bar is high-volatility
+        trend_threshold: Absolute trend above which a bar is trending
+
+    Returns:
+        int8 array of regime codes
+    """
+    n = volatility.shape[0]
+    out = np.empty(n, np.int8)
+    for i in range(n):
+        v = volatility[i]
+        t = trend[i]
+        if v < vol_threshold:
+            if t > trend_threshold:
+                out[i] = REGIME_TRENDING_UP
+            elif t < -trend_threshold:
+                out[i] = REGIME_TRENDING_DOWN
+            elif abs(t) <= trend_threshold:
+                out[i] = REGIME_SIDEWAYS
+            else:
+                out[i] = REGIME_UNKNOWN
+        elif v >= vol_threshold:
+            out[i] = REGIME_HIGH_VOLATILITY
+        else:
+            out[i] = REGIME_UNKNOWN
+    return out
+
+
+@njit(cache=True)
+def _rolling_mean(values, window):
+    """
+    Rolling mean with a running sum.
+
+    Matches ``Series.rolling(window).mean()``: the first ``window - 1``
+    entries, and any window containing a NaN, are NaN.
+
+    Args:
+        values: 1-D float64 array
+        window: Window length
+
+    Returns:
+        float64 array of rolling means
+    """
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    s = 0.0
+    nan_count = 0
+    for i in range(n):
+        x = values[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            s += x
+        if i >= window:
+            old = values[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                s -= old
+        if i >= window - 1 and nan_count == 0:
+            out[i] = s / window
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _rolling_means(values, windows):
+    """
+    Rolling means of one series for several window lengths.
+
+    Args:
+        values: 1-D float64 array
+        windows: 1-D int64 array of window lengths
+
+    Returns:
+        float64 array of shape (len(windows), len(values))
+    """
+    out = np.empty((windows.shape[0], values.shape[0]))
+    for k in prange(windows.shape[0]):
+        out[k] = _rolling_mean(values, windows[k])
+    return out
+
+
+@njit(cache=True)
+def _bollinger(close, window, num_std):
+    """
+    Bollinger bands, width and band position in a single pass.
+
+    Keeps a running sum and sum of squares over the window, so each bar
+    costs O(1) regardless of the window length. Uses the sample standard
+    deviation (ddof=1) to match pandas. NaN closes are left out of the
+    running sums, so like ``Series.rolling(window)`` only the windows that
+    contain a NaN are NaN.
+
+    Args:
+        close: 1-D float64 array of close prices
+        window: Window length
+        num_std: Band distance from the middle in standard deviations
+
+    Returns:
+        Tuple of (middle, upper, lower, width, position) float64 arrays;
+        the first ``window - 1`` entries and any window containing a NaN
+        are NaN, as is the position of bars whose bands have zero width
+    """
+    n = close.shape[0]
+    middle = np.full(n, np.nan)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    width = np.full(n, np.nan)
+    position = np.full(n, np.nan)
+    s = 0.0
+    s2 = 0.0
+    nan_count = 0
+    for i in range(n):
+        x = close[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            s += x
+            s2 += x * x
+        if i >= window:
+            old = close[i - window]
+            if np.isnan(old):
+                nan_count -= 1
+            else:
+                s -= old
+                s2 -= old * old
+        if i >= window - 1 and nan_count == 0:
+            m = s / window
+            var = (s2 - s * m) / (window - 1)
+            band = num_std * np.sqrt(var) if var > 0.0 else 0.0
+            middle[i] = m
+            upper[i] = m + band
+            lower[i] = m - band
+            width[i] = 2.0 * band
+            if band > 0.0:
+                position[i] = (x - (m - band)) / (2.0 * band)
+    return middle, upper, lower, width, position
+
+
+@njit(cache=True)
+def _ewm_mean(values, span):
+    """
+    Exponentially weighted mean, matching ``Series.ewm(span=span).mean()``.
+
+    Uses the adjusted weighting pandas defaults to, so early values are
+    not biased towards zero.
+
+    Args:
+        values: 1-D float64 array
+        span: EWM span; the decay factor is ``2 / (span + 1)``
+
+    Returns:
+        float64 array of weighted means
+    """
+    n = values.shape[0]
+    out = np.empty(n)
+    decay = 1.0 - 2.0 / (span + 1.0)
+    num = 0.0
+    den = 0.0
+    for i in range(n):
+        num *= decay
+        den *= decay
+        x = values[i]
+        if not np.isnan(x):
+            num += x
+            den += 1.0
+        out[i] = num / den if den > 0.0 else np.nan
+    return out
+
+
+@njit(cache=True)
+def _rsi(close, period):
+    """
+    Relative strength index with Wilder's smoothing, in a single pass.
+
+    The first average gain and loss are the simple means of the first
+    ``period`` price changes; after that each average is updated as
+    ``(avg * (period - 1) + value) / period``. A NaN price change makes
+    that bar NaN and restarts the seed from the next valid change.
+
+    Args:
+        close: 1-D float64 array of close prices
+        period: Smoothing period
+
+    Returns:
+        float64 array of RSI values in [0, 100]; the first ``period``
+        entries, and the bars from a NaN change until the seed is
+        complete again, are NaN
+    """
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    count = 0  # Valid price changes since the start or the last NaN
+    for i in range(1, n):
+        d = close[i] - close[i - 1]
+        if np.isnan(d):
+            avg_gain = 0.0
+            avg_loss = 0.0
+            count = 0
+            continue
+        gain = d if d > 0 else 0.0
+        loss = -d if d < 0 else 0.0
+        count += 1
+        if count <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if count < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss > 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0.0:
+            out[i] = 100.0
+    return out
@@ -6,15 +6,16 @@ specifically designed for naked option buying during short covering and long
 unwinding rallies, based on Open Interest derivative analysis.
 """
 
+import logging
 import backtrader as bt
+import numpy as np
 from typing import Optional, Any
 from datetime import datetime
 
-from ..indicators.open_interest import (
-    OpenInterestIndicator,
-    OpenInterestDerivative, 
-    OpenInterestSecondDerivative
-)
+from ..indicators.open_interest import OpenInterestAnalytics
+from ..utils import get_logger
+
+logger = get_logger(__name__)
 
 
 class SCLUStrategy(bt.Strategy):
@@ -45,6 +46,9 @@ class SCLUStrategy(bt.Strategy):
         max_positions (int): Maximum concurrent positions (default: 1)
         min_dte (int): Minimum days to expiry (default: 1)
         max_dte (int): Maximum days to expiry (default: 4)
+        verbose (bool): Log every signal, order and trade at DEBUG level; the
+            run summary and rejected orders are always logged at INFO
+            (default: False)
     """
     
     params = (
@@ -57,6 +61,7 @@ class SCLUStrategy(bt.Strategy):
         ('max_dte', 4),
         ('stop_loss_pct', 0.15),  # 15% stop loss
         ('take_profit_pct', 0.30),  # 30% take profit for short covering rallies
+        ('verbose', False),  # Log signals, orders and trades as they happen
     )
     
     def __init__(self) -> None:
@@ -66,10 +71,11 @@ class SCLUStrategy(bt.Strategy):
         # Data references
         self.dataclose = self.datas[0].close
         
-        # Custom Open Interest indicators
-        self.oi_indicator = OpenInterestIndicator(self.datas[0])
-        self.doi_indicator = OpenInterestDerivative(self.datas[0])
-        self.d2oi_indicator = OpenInterestSecondDerivative(self.datas[0])
+        # Custom Open Interest indicators, computed together in one indicator
+        self.oi_analytics = OpenInterestAnalytics(self.datas[0])
+        self.oi_indicator = self.oi_analytics.lines.oi
+        self.doi_indicator = self.oi_analytics.lines.doi
+        self.d2oi_indicator = self.oi_analytics.lines.d2oi
         
         # 50-period moving average of Open Interest (as per strategy document)
         self.oi_ma = bt.indicators.SimpleMovingAverage(
@@ -77,6 +83,18 @@ class SCLUStrategy(bt.Strategy):
             period=self.params.oi_ma_period
         )
         
+        # Threshold multipliers of the OI MA, negated once instead of per bar
+        self._entry_scale = -self.params.entry_threshold_pct
+        self._exit_doi_scale = -self.params.exit_doi_threshold_pct
+        self._exit_d2oi_scale = -self.params.exit_d2oi_threshold_pct
+        
+        # Stop loss / take profit multipliers of the entry price
+        self._stop_loss_mul = 1 - self.params.stop_loss_pct
+        self._take_profit_mul = 1 + self.params.take_profit_pct
+        
+        # Per-event messages are only formatted when they will be shown
+        self._verbose = self.params.verbose
+        
         # State variables
         self.order: Optional[bt.Order] = None
         self.buyprice: Optional[float] = None
@@ -90,14 +108,30 @@ class SCLUStrategy(bt.Strategy):
     
     def log(self, txt: str, dt: Optional[datetime] = None) -> None:
         """
-        Logging function for strategy events.
+        Log a strategy event at INFO level through the module logger.
         
         Args:
             txt: Text message to log
             dt: Optional datetime, uses current bar datetime if None
         """
         dt = dt or self.datas[0].datetime.date(0)
-        print(f'{dt.isoformat()}, {txt}')
+        logger.info('%s, %s', dt.isoformat(), txt)
+    
+    def _log_event(self, msg: str, *args: Any) -> None:
+        """
+        Log a per-bar event at DEBUG level through the module logger.
+        
+        The message is %-formatted by the logging module only if the record
+        is emitted, and the bar date is only looked up in that case too.
+        The bar date is part of the message because the record's own
+        timestamp is the wall-clock time of the run, not the bar's time.
+        
+        Args:
+            msg: %-style format string
+            *args: Values for the format string
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('%s, ' + msg, self.datas[0].datetime.date(0), *args)
     
     def notify_order(self, order: bt.Order) -> None:
         """
@@ -111,18 +145,17 @@ class SCLUStrategy(bt.Strategy):
         
         if order.status in [order.Completed]:
             if order.isbuy():
-                self.log(
-                    f'BUY EXECUTED - Price: {order.executed.price:.2f}, '
-                    f'Cost: {order.executed.value:.2f}, '
-                    f'Commission: {order.executed.comm:.2f}'
-                )
+                if self._verbose:
+                    self._log_event(
+                        'BUY EXECUTED - Price: %.2f, Cost: %.2f, Commission: %.2f',
+                        order.executed.price, order.executed.value, order.executed.comm
+                    )
                 self.buyprice = order.executed.price
                 self.buycomm = order.executed.comm
-            else:  # Sell order
-                self.log(
-                    f'SELL EXECUTED - Price: {order.executed.price:.2f}, '
-                    f'Cost: {order.executed.value:.2f}, '
-                    f'Commission: {order.executed.comm:.2f}'
+            elif self._verbose:  # Sell order
+                self._log_event(
+                    'SELL EXECUTED - Price: %.2f, Cost: %.2f, Commission: %.2f',
+                    order.executed.price, order.executed.value, order.executed.comm
                 )
             
             self.bar_executed = len(self)
@@ -146,15 +179,13 @@ class SCLUStrategy(bt.Strategy):
         if trade.pnl > 0:
             self.winning_trades += 1
         
-        win_rate = (self.winning_trades / self.trade_count) * 100
-        
-        self.log(
-            f'TRADE CLOSED - PnL: {trade.pnl:.2f}, '
-            f'Net PnL: {trade.pnlcomm:.2f}, '
-            f'Win Rate: {win_rate:.1f}%'
-        )
+        if self._verbose:
+            self._log_event(
+                'TRADE CLOSED - PnL: %.2f, Net PnL: %.2f, Win Rate: %.1f%%',
+                trade.pnl, trade.pnlcomm, self.winning_trades / self.trade_count * 100
+            )
     
-    def _is_short_covering_signal(self) -> bool:
+    def _is_short_covering_signal(self, doi: float, d2oi: float, oi_ma: float) -> bool:
         """
         Check if conditions indicate a short covering opportunity.
         
@@ -162,85 +193,41 @@ class SCLUStrategy(bt.Strategy):
         - Buy when first derivative is negative AND 
         - Second derivative < -0.5% of 50-period OI moving average
         
+        Args:
+            doi: Current first derivative of OI
+            d2oi: Current second derivative of OI
+            oi_ma: Current OI moving average
+        
         Returns:
             bool: True if short covering signal detected
         """
         # First derivative must be negative (OI decreasing)
-        doi_negative = self.doi_indicator[0] < 0
+        doi_negative = doi < 0
         
         # Second derivative threshold: -0.5% of 50-period OI MA
-        d2oi_threshold = -self.params.entry_threshold_pct * self.oi_ma[0]
-        d2oi_condition = self.d2oi_indicator[0] < d2oi_threshold
+        d2oi_condition = d2oi < self._entry_scale * oi_ma
         
         return doi_negative and d2oi_condition
     
-    def _should_exit_position(self) -> tuple[bool, str]:
-        """
-        Check if conditions are met for exiting the position.
-        
-        As per strategy document:
-        - Exit when first derivative > -0.1% of 50-period OI MA OR
-        - Second derivative > -0.5% of 50-period OI MA
-        
-        Returns:
-            tuple[bool, str]: (should_exit, exit_reason)
-        """
-        # First derivative exit condition: > -0.1% of OI MA
-        doi_exit_threshold = -self.params.exit_doi_threshold_pct * self.oi_ma[0]
-        doi_exit = self.doi_indicator[0] > doi_exit_threshold
-        
-        # Second derivative exit condition: > -0.5% of OI MA  
-        d2oi_exit_threshold = -self.params.exit_d2oi_threshold_pct * self.oi_ma[0]
-        d2oi_exit = self.d2oi_indicator[0] > d2oi_exit_threshold
-        
-        if doi_exit:
-            return True, "First derivative exit: OI decline slowing"
-        elif d2oi_exit:
-            return True, "Second derivative exit: OI acceleration reversing"
-        
-        return False, ""
-    
-    def _check_stop_loss_take_profit(self) -> tuple[bool, str]:
-        """
-        Check if stop loss or take profit should be triggered.
-        
-        Returns:
-            tuple[bool, str]: (should_exit, reason)
-        """
-        if not self.position or not self.buyprice:
-            return False, ""
-        
-        current_price = self.dataclose[0]
-        
-        # Calculate stop loss and take profit levels
-        stop_loss_price = self.buyprice * (1 - self.params.stop_loss_pct)
-        take_profit_price = self.buyprice * (1 + self.params.take_profit_pct)
-        
-        if current_price <= stop_loss_price:
-            return True, f'STOP LOSS triggered at {current_price:.2f}'
-        
-        if current_price >= take_profit_price:
-            return True, f'TAKE PROFIT triggered at {current_price:.2f}'
-        
-        return False, ""
-    
-    def _log_signal_details(self, signal_type: str) -> None:
+    def _log_signal_details(
+        self,
+        signal_type: str,
+        doi: float,
+        d2oi: float,
+        oi_ma: float,
+        close: float
+    ) -> None:
         """Log detailed signal information for analysis."""
-        doi = self.doi_indicator[0]
-        d2oi = self.d2oi_indicator[0]
-        oi_ma = self.oi_ma[0]
-        
-        # Calculate thresholds
-        entry_threshold = -self.params.entry_threshold_pct * oi_ma
-        doi_exit_threshold = -self.params.exit_doi_threshold_pct * oi_ma
-        d2oi_exit_threshold = -self.params.exit_d2oi_threshold_pct * oi_ma
-        
-        self.log(
-            f'{signal_type} SIGNAL DETAILS:\n'
-            f'  OI MA (50): {oi_ma:,.0f}\n'
-            f'  DOI: {doi:.2f} (Exit threshold: {doi_exit_threshold:.2f})\n'
-            f'  D2OI: {d2oi:.2f} (Entry: {entry_threshold:.2f}, Exit: {d2oi_exit_threshold:.2f})\n'
-            f'  Price: {self.dataclose[0]:.2f}'
+        self._log_event(
+            '%s SIGNAL DETAILS:\n'
+            '  OI MA (50): %.0f\n'
+            '  DOI: %.2f (Exit threshold: %.2f)\n'
+            '  D2OI: %.2f (Entry: %.2f, Exit: %.2f)\n'
+            '  Price: %.2f',
+            signal_type, oi_ma,
+            doi, self._exit_doi_scale * oi_ma,
+            d2oi, self._entry_scale * oi_ma, self._exit_d2oi_scale * oi_ma,
+            close
         )
     
     def next(self) -> None:
@@ -254,32 +241,48 @@ class SCLUStrategy(bt.Strategy):
         if self.order:
             return
         
+        # Read every line once for this bar
+        doi = self.doi_indicator[0]
+        d2oi = self.d2oi_indicator[0]
+        oi_ma = self.oi_ma[0]
+        close = self.dataclose[0]
+        
         current_position_size = self.position.size
         
         if not current_position_size:  # Not in position
             # Look for short covering opportunities
-            if self._is_short_covering_signal():
-                self._log_signal_details('BUY')
-                self.log(
-                    f'SHORT COVERING DETECTED - Entering long position at {self.dataclose[0]:.2f}'
-                )
+            if self._is_short_covering_signal(doi, d2oi, oi_ma):
+                if self._verbose:
+                    self._log_signal_details('BUY', doi, d2oi, oi_ma, close)
+                    self._log_event(
+                        'SHORT COVERING DETECTED - Entering long position at %.2f', close
+                    )
                 self.order = self.buy()
                 self.short_covering_trades += 1
         
         else:  # In position
-            # Check stop loss and take profit first
-            sl_tp_exit, sl_tp_reason = self._check_stop_loss_take_profit()
-            if sl_tp_exit:
-                self.log(sl_tp_reason)
-                self.order = self.sell()
+            # Stop loss and take profit first, then the strategy exits; the
+            # reason is only formatted when an exit fires and logging is on
+            buyprice = self.buyprice
+            if buyprice and close <= buyprice * self._stop_loss_mul:
+                if self._verbose:
+                    self._log_event('STOP LOSS triggered at %.2f', close)
+            elif buyprice and close >= buyprice * self._take_profit_mul:
+                if self._verbose:
+                    self._log_event('TAKE PROFIT triggered at %.2f', close)
+            elif doi > self._exit_doi_scale * oi_ma:
+                # First derivative exit: > -0.1% of OI MA
+                if self._verbose:
+                    self._log_signal_details('SELL', doi, d2oi, oi_ma, close)
+                    self._log_event('EXIT SIGNAL - First derivative exit: OI decline slowing')
+            elif d2oi > self._exit_d2oi_scale * oi_ma:
+                # Second derivative exit: > -0.5% of OI MA
+                if self._verbose:
+                    self._log_signal_details('SELL', doi, d2oi, oi_ma, close)
+                    self._log_event('EXIT SIGNAL - Second derivative exit: OI acceleration reversing')
+            else:
                 return
-            
-            # Check strategy-based exit conditions
-            should_exit, exit_reason = self._should_exit_position()
-            if should_exit:
-                self._log_signal_details('SELL')
-                self.log(f'EXIT SIGNAL - {exit_reason}')
-                self.order = self.sell()
+            self.order = self.sell()
     
     def stop(self) -> None:
         """Called when the strategy finishes running."""
@@ -296,83 +299,90 @@ class SCLUStrategy(bt.Strategy):
             self.log('STRATEGY COMPLETED - No trades executed')
 
 
-class SCLUStrikeSelector:
+def select_strikes(spot_price: float, available_strikes: list,
+                   movement_type: str = "short_covering",
+                   max_strikes: int = 3) -> list:
     """
-    Helper class for selecting optimal strikes for SCLU strategy.
-    
+    Select optimal strikes for the SCLU strategy.
+
     Based on strategy document:
     - Focus on ATM and OTM options (ATM +1/+2/+3 strikes)
     - Calls for short covering, Puts for long unwinding
     - Greatest effect on outermost strikes due to delta drifting
+
+    Args:
+        spot_price: Current spot price of underlying
+        available_strikes: Available strike prices, sorted ascending
+        movement_type: "short_covering" or "long_unwinding"
+        max_strikes: Maximum number of strikes to select
+
+    Returns:
+        list: Selected strike prices
     """
+    strikes = np.asarray(available_strikes)
+    if strikes.size == 0:
+        raise ValueError("available_strikes must not be empty")
+
+    # Find ATM strike; a spot exactly between two strikes picks the lower one
+    atm_index = int(np.searchsorted(strikes, spot_price))
+    if atm_index == len(strikes) or (
+        atm_index > 0 and spot_price - strikes[atm_index - 1] <= strikes[atm_index] - spot_price
+    ):
+        atm_index -= 1
+
+    if movement_type == "short_covering":
+        # For short covering, focus on calls (strikes above spot)
+        # ATM and OTM calls (ATM +1/+2/+3)
+        return strikes[atm_index:atm_index + max_strikes].tolist()
+
+    if movement_type == "long_unwinding":
+        # For long unwinding, focus on puts (strikes below spot)
+        # ATM and OTM puts (ATM -1/-2/-3)
+        return strikes[max(0, atm_index - max_strikes + 1):atm_index + 1][::-1].tolist()
+
+    return []
+
+
+def calculate_days_to_expiry(expiry_date: datetime, current_date: datetime) -> int:
+    """
+    Calculate days to expiry.
+
+    Args:
+        expiry_date: Option expiry date
+        current_date: Current date
+
+    Returns:
+        int: Days to expiry
+    """
+    return (expiry_date - current_date).days
+
+
+def is_suitable_for_strategy(dte: int, min_dte: int = 1, max_dte: int = 4) -> bool:
+    """
+    Check if the option is suitable for SCLU strategy based on DTE.
+
+    As per strategy document: 1-2 DTE preferred, not 0 DTE.
+
+    Args:
+        dte: Days to expiry
+        min_dte: Minimum acceptable DTE
+        max_dte: Maximum acceptable DTE
+
+    Returns:
+        bool: True if suitable for strategy
+    """
+    return min_dte <= dte <= max_dte
+
+
+class SCLUStrikeSelector:
+    """
+    Helper namespace for selecting optimal strikes for SCLU strategy.
     
-    @staticmethod
-    def select_strikes(spot_price: float, available_strikes: list, 
-                      movement_type: str = "short_covering", 
-                      max_strikes: int = 3) -> list:
-        """
-        Select optimal strikes for the strategy.
-        
-        Args:
-            spot_price: Current spot price of underlying
-            available_strikes: List of available strike prices
-            movement_type: "short_covering" or "long_unwinding"
-            max_strikes: Maximum number of strikes to select
-            
-        Returns:
-            list: Selected strike prices
-        """
-        # Find ATM strike
-        atm_strike = min(available_strikes, key=lambda x: abs(x - spot_price))
-        atm_index = available_strikes.index(atm_strike)
-        
-        selected_strikes = []
-        
-        if movement_type == "short_covering":
-            # For short covering, focus on calls (strikes above spot)
-            # ATM and OTM calls (ATM +1/+2/+3)
-            for i in range(max_strikes):
-                strike_index = atm_index + i
-                if strike_index < len(available_strikes):
-                    selected_strikes.append(available_strikes[strike_index])
-        
-        elif movement_type == "long_unwinding":
-            # For long unwinding, focus on puts (strikes below spot)
-            # ATM and OTM puts (ATM -1/-2/-3)
-            for i in range(max_strikes):
-                strike_index = atm_index - i
-                if strike_index >= 0:
-                    selected_strikes.append(available_strikes[strike_index])
-        
-        return selected_strikes
-    
-    @staticmethod
-    def calculate_days_to_expiry(expiry_date: datetime, current_date: datetime) -> int:
-        """
-        Calculate days to expiry.
-        
-        Args:
-            expiry_date: Option expiry date
-            current_date: Current date
-            
-        Returns:
-            int: Days to expiry
-        """
-        return (expiry_date - current_date).days
+    Kept for backward compatibility; the module-level functions
+    select_strikes, calculate_days_to_expiry and is_suitable_for_strategy
+    are the preferred entry points.
+    """
     
-    @staticmethod
-    def is_suitable_for_strategy(dte: int, min_dte: int = 1, max_dte: int = 4) -> bool:
-        """
-        Check if the option is suitable for SCLU strategy based on DTE.
-        
-        As per strategy document: 1-2 DTE preferred, not 0 DTE.
-        
-        Args:
-            dte: Days to expiry
-            min_dte: Minimum acceptable DTE
-            max_dte: Maximum acceptable DTE
-            
-        Returns:
-            bool: True if suitable for strategy
-        """
-        return min_dte <= dte <= max_dte
\ No newline at end of file
+    select_strikes = staticmethod(select_strikes)
+    calculate_days_to_expiry = staticmethod(calculate_days_to_expiry)
+    is_suitable_for_strategy = staticmethod(is_suitable_for_strategy)
@@ -1,6 +1,6 @@
 """Utility functions and helpers."""
 
 from .config import Config
-from .logger import get_logger
+from .logger import get_logger, get_trading_logger, TradingLogger, TickRingLogger
 
-__all__ = ['Config', 'get_logger']
+__all__ = ['Config', 'get_logger', 'get_trading_logger', 'TradingLogger', 'TickRingLogger']
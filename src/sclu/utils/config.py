@@ -6,18 +6,29 @@ from files and environment variables.
 """
 
 import os
+import sys
 import json
-import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard json module is used without it
+    orjson = None
 
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# PyYAML is only imported when a YAML file is read or written
+_YAML_SUFFIXES = ('.yaml', '.yml')
+
+# Slotted config objects where supported (dataclass slots need Python 3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TradingConfig:
     """Configuration settings for trading operations."""
     
@@ -40,7 +51,7 @@ class TradingConfig:
     data_refresh_interval: int = 180  # seconds
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class APIConfig:
     """Configuration for API connections."""
     
@@ -58,7 +69,7 @@ class APIConfig:
     retry_delay: float = 1.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DataConfig:
     """Configuration for data handling."""
     
@@ -79,7 +90,7 @@ class DataConfig:
     default_instruments: list = field(default_factory=lambda: [10716162, 10684418])
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LoggingConfig:
     """Configuration for logging."""
     
@@ -91,7 +102,7 @@ class LoggingConfig:
     console_output: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SCLUConfig:
     """Main configuration class for SCLU system."""
     
@@ -105,6 +116,36 @@ class SCLUConfig:
     debug: bool = True
 
 
+def _parse_bool(value: str) -> bool:
+    """Interpret an environment variable string as a boolean."""
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+
+# Environment variable -> (setter, converter), built once at import
+_ENV_TABLE = {
+    # API configuration
+    'SCLU_API_KEY': (lambda c, v: setattr(c.api, 'api_key', v), str),
+    'SCLU_ACCESS_TOKEN': (lambda c, v: setattr(c.api, 'access_token', v), str),
+    'SCLU_REQUEST_TOKEN': (lambda c, v: setattr(c.api, 'request_token', v), str),
+    
+    # Trading configuration
+    'SCLU_SENSITIVITY': (lambda c, v: setattr(c.trading, 'sensitivity', v), float),
+    'SCLU_FEELING': (lambda c, v: setattr(c.trading, 'feeling', v), int),
+    'SCLU_MAX_DAILY_TRADES': (lambda c, v: setattr(c.trading, 'max_daily_trades', v), int),
+    'SCLU_STOP_LOSS_PCT': (lambda c, v: setattr(c.trading, 'stop_loss_pct', v), float),
+    'SCLU_TAKE_PROFIT_PCT': (lambda c, v: setattr(c.trading, 'take_profit_pct', v), float),
+    
+    # Data configuration
+    'SCLU_DATA_DIRECTORY': (lambda c, v: setattr(c.data, 'data_directory', v), str),
+    'SCLU_DATETIME_FORMAT': (lambda c, v: setattr(c.data, 'datetime_format', v), str),
+    
+    # General
+    'SCLU_ENVIRONMENT': (lambda c, v: setattr(c, 'environment', v), str),
+    'SCLU_DEBUG': (lambda c, v: setattr(c, 'debug', v), _parse_bool),
+    'SCLU_LOG_LEVEL': (lambda c, v: setattr(c.logging, 'level', v), str),
+}
+
+
 class Config:
     """
     Configuration manager for SCLU trading system.
@@ -142,8 +183,11 @@ class Config:
         """Load configuration from JSON or YAML file."""
         try:
             with open(file_path, 'r') as f:
-                if file_path.endswith('.yaml') or file_path.endswith('.yml'):
+                if file_path.endswith(_YAML_SUFFIXES):
+                    import yaml
                     data = yaml.safe_load(f)
+                elif orjson is not None:
+                    data = orjson.loads(f.read())
                 else:
                     data = json.load(f)
             
@@ -156,60 +200,16 @@ class Config:
     
     def _load_from_env(self) -> None:
         """Load configuration from environment variables."""
-        env_mappings = {
-            # API configuration
-            'SCLU_API_KEY': ('api', 'api_key'),
-            'SCLU_ACCESS_TOKEN': ('api', 'access_token'),
-            'SCLU_REQUEST_TOKEN': ('api', 'request_token'),
-            
-            # Trading configuration
-            'SCLU_SENSITIVITY': ('trading', 'sensitivity'),
-            'SCLU_FEELING': ('trading', 'feeling'),
-            'SCLU_MAX_DAILY_TRADES': ('trading', 'max_daily_trades'),
-            'SCLU_STOP_LOSS_PCT': ('trading', 'stop_loss_pct'),
-            'SCLU_TAKE_PROFIT_PCT': ('trading', 'take_profit_pct'),
-            
-            # Data configuration
-            'SCLU_DATA_DIRECTORY': ('data', 'data_directory'),
-            'SCLU_DATETIME_FORMAT': ('data', 'datetime_format'),
-            
-            # General
-            'SCLU_ENVIRONMENT': ('environment',),
-            'SCLU_DEBUG': ('debug',),
-            'SCLU_LOG_LEVEL': ('logging', 'level'),
-        }
-        
-        for env_var, config_path in env_mappings.items():
-            value = os.getenv(env_var)
-            if value is not None:
-                self._set_nested_config(config_path, value)
-    
-    def _set_nested_config(self, path: tuple, value: str) -> None:
-        """Set a nested configuration value."""
-        try:
-            current = self._config
-            
-            # Navigate to the correct nested object
-            for key in path[:-1]:
-                current = getattr(current, key)
-            
-            # Set the final value with type conversion
-            final_key = path[-1]
-            current_value = getattr(current, final_key)
-            
-            # Convert string value to appropriate type
-            if isinstance(current_value, bool):
-                value = value.lower() in ('true', '1', 'yes', 'on')
-            elif isinstance(current_value, int):
-                value = int(value)
-            elif isinstance(current_value, float):
-                value = float(value)
-            
-            setattr(current, final_key, value)
-            logger.debug(f"Set config {'.'.join(path)} = {value}")
-        
-        except Exception as e:
-            logger.warning(f"Could not set config {'.'.join(path)}: {e}")
+        env = os.environ
+        for env_var, (setter, convert) in _ENV_TABLE.items():
+            value = env.get(env_var)
+            if value is None:
+                continue
+            try:
+                setter(self._config, convert(value))
+                logger.debug("Set config from %s = %s", env_var, value)
+            except Exception as e:
+                logger.warning(f"Could not set config from {env_var}: {e}")
     
     def _update_config_from_dict(self, data: Dict[str, Any]) -> None:
         """Update configuration from a dictionary."""
@@ -252,18 +252,14 @@ class Config:
             file_path: Path to save configuration file
         """
         try:
-            config_dict = {
-                'trading': self._config.trading.__dict__,
-                'api': self._config.api.__dict__,
-                'data': self._config.data.__dict__,
-                'logging': self._config.logging.__dict__,
-                'environment': self._config.environment,
-                'debug': self._config.debug
-            }
+            config_dict = asdict(self._config)
             
             with open(file_path, 'w') as f:
-                if file_path.endswith('.yaml') or file_path.endswith('.yml'):
+                if file_path.endswith(_YAML_SUFFIXES):
+                    import yaml
                     yaml.dump(config_dict, f, default_flow_style=False)
+                elif orjson is not None:
+                    f.write(orjson.dumps(config_dict, option=orjson.OPT_INDENT_2).decode())
                 else:
                     json.dump(config_dict, f, indent=2)
             
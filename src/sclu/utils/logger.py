@@ -2,14 +2,175 @@
 Logging utilities for SCLU trading system.
 
 This module provides centralized logging configuration and utilities.
+Use get_trading_logger() to share one TradingLogger, and its running
+trade count, per logger name across the process.
 """
 
 import os
+import time
+import queue
+import atexit
+import collections
+import functools
+import itertools
 import logging
 import logging.handlers
+import weakref
 from pathlib import Path
 from typing import Optional
 
+# Background thread writing queued records to the log file, if one is set up
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# Arguments of the last setup_logging call, to skip reconfiguring to the same setup
+_configured_key: Optional[tuple] = None
+
+# Live TradingLogger instances, whose cached level flags setup_logging refreshes
+_trading_loggers: "weakref.WeakSet[TradingLogger]" = weakref.WeakSet()
+
+# Live TickRingLogger instances, whose buffered ticks stop_logging flushes
+_tick_loggers: "weakref.WeakSet[TickRingLogger]" = weakref.WeakSet()
+
+# Message templates for TradingLogger; fixed strings also give log
+# aggregators a stable key to group records by
+_FMT_SIGNAL = "SIGNAL | %s | %s | Price: %.2f | Reason: %s"
+_FMT_ORDER = "ORDER | %s | %s | Qty: %s | Price: %.2f | ID: %s"
+_FMT_EXEC = "EXECUTION | %s | Qty: %s | Price: %.2f | Commission: %.2f"
+_FMT_TRADE_CLOSED = "TRADE CLOSED | %s | %s: %.2f | Duration: %s | Reason: %s | Trade #%d"
+_FMT_PORTFOLIO = "PORTFOLIO | Total: %.2f | Cash: %.2f | Positions: %s"
+_FMT_ERROR = "ERROR | %s | %s"
+_FMT_ERROR_SYMBOL = "ERROR | %s | %s | %s"
+_FMT_MKT = "MARKET DATA | %s | Price: %.2f | Volume: %s"
+_FMT_MKT_OI = "MARKET DATA | %s | Price: %.2f | Volume: %s | OI: %s"
+
+# Trade status keyed by ``pnl > 0``; a dict also accepts NumPy booleans
+_TRADE_STATUS = {True: "PROFIT", False: "LOSS"}
+
+# Records buffered before they are written to the log file in one go
+DEFAULT_LOG_BATCH = 512
+
+# Longest time, in seconds, a buffered record waits for more to arrive
+LOG_BATCH_INTERVAL = 1.0
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the seconds part of ``%(asctime)s`` once per second.
+    
+    Records logged within the same second reuse the formatted date and time
+    and only fill in the milliseconds; the output matches logging.Formatter.
+    """
+    
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize the formatter with an empty timestamp cache."""
+        super().__init__(*args, **kwargs)
+        # (second, formatted) swapped as one tuple so threads never see a mix
+        self._second_cache = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format the record time, reusing the cached text for the current second."""
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached_second, text = self._second_cache
+        if cached_second != second:
+            text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._second_cache = (second, text)
+        return self.default_msec_format % (text, record.msecs)
+
+
+class _DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+    
+    When the queue is full the oldest pending record is discarded to make
+    room, so a log storm costs memory up to the queue size and no more.
+    """
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, dropping the oldest one if it is full."""
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class _BatchingFileHandler(logging.handlers.MemoryHandler):
+    """
+    Buffer records and hand them to the file handler in batches.
+    
+    The buffer is written out when it holds ``capacity`` records, when an
+    ERROR or worse arrives, or when a new record comes in more than
+    LOG_BATCH_INTERVAL seconds after the last write.
+    """
+    
+    def __init__(self, capacity: int, target: logging.Handler) -> None:
+        """
+        Initialize the batching handler.
+        
+        Args:
+            capacity: Number of records to buffer before writing
+            target: Handler that writes the records to the file
+        """
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self._last_flush = time.monotonic()
+    
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        """Check whether the buffer should be written out after this record."""
+        return (
+            super().shouldFlush(record)
+            or time.monotonic() - self._last_flush >= LOG_BATCH_INTERVAL
+        )
+    
+    def flush(self) -> None:
+        """Write the buffered records to the file handler."""
+        super().flush()
+        self._last_flush = time.monotonic()
+
+
+class _FileQueueListener(logging.handlers.QueueListener):
+    """Queue listener whose shutdown waits for room instead of failing on a full queue."""
+    
+    def enqueue_sentinel(self) -> None:
+        """Queue the stop sentinel, waiting for the drain thread if needed."""
+        self.queue.put(self._sentinel)
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records to the log file and stop the background writer.
+    
+    Registered with atexit; call it directly to flush the file earlier.
+    """
+    global _queue_listener, _configured_key
+    
+    # Write out buffered ticks while the handlers are still open
+    for tick_logger in list(_tick_loggers):
+        tick_logger.flush()
+    
+    # The file handler is gone, so the next setup_logging must rebuild it
+    _configured_key = None
+    if _queue_listener is None:
+        return
+    
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        # Closing the batching handler flushes it and detaches the file handler
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+    _queue_listener = None
+
+
+atexit.register(stop_logging)
+
 
 def setup_logging(
     level: str = "INFO",
@@ -17,11 +178,19 @@ def setup_logging(
     max_file_size: int = 10 * 1024 * 1024,  # 10MB
     backup_count: int = 5,
     console_output: bool = True,
-    format_string: Optional[str] = None
+    format_string: Optional[str] = None,
+    queue_size: int = 10000,
+    batch_size: Optional[int] = None
 ) -> None:
     """
     Set up logging configuration for the SCLU system.
     
+    Console output is written synchronously. File output goes through a
+    bounded queue drained by a background thread, so logging calls never
+    wait on disk writes or rotation; if the queue fills up, the oldest
+    pending records are dropped. The background thread writes records in
+    batches, flushing early on ERROR records and after LOG_BATCH_INTERVAL.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (optional)
@@ -29,22 +198,43 @@ def setup_logging(
         backup_count: Number of backup log files to keep
         console_output: Whether to output logs to console
         format_string: Custom format string for log messages
+        queue_size: Maximum number of records waiting to be written to the log file
+        batch_size: Records written to the log file per batch (defaults to
+            the SCLU_LOG_BATCH environment variable, or DEFAULT_LOG_BATCH)
     """
     # Convert string level to logging level
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     
-    # Default format
+    # Default format; console-only debug sessions skip the timestamp
     if format_string is None:
-        format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        if console_output and not log_file and numeric_level == logging.DEBUG:
+            format_string = "%(levelname)s %(name)s %(message)s"
+        else:
+            format_string = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    
+    if log_file and batch_size is None:
+        batch_size = int(os.getenv("SCLU_LOG_BATCH", DEFAULT_LOG_BATCH))
+    
+    # Nothing to do if logging is already set up exactly like this
+    global _configured_key
+    key = (
+        numeric_level, log_file, max_file_size, backup_count, console_output,
+        format_string, queue_size, batch_size
+    )
+    if key == _configured_key:
+        return
     
     # Create formatter
-    formatter = logging.Formatter(format_string)
+    formatter = _CachedTimeFormatter(format_string)
     
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
     
-    # Clear existing handlers
+    # Close existing handlers, flushing any previous log file first
+    stop_logging()
+    for handler in root_logger.handlers:
+        handler.close()
     root_logger.handlers.clear()
     
     # Console handler
@@ -60,14 +250,37 @@ def setup_logging(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # delay=True: the file is only opened once something is written to it
         file_handler = logging.handlers.RotatingFileHandler(
             log_file,
             maxBytes=max_file_size,
-            backupCount=backup_count
+            backupCount=backup_count,
+            delay=True
         )
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        
+        batch_handler = _BatchingFileHandler(batch_size, file_handler)
+        batch_handler.setLevel(numeric_level)
+        
+        # The file is written from a background thread fed by a queue
+        global _queue_listener
+        log_queue = queue.Queue(maxsize=queue_size)
+        root_logger.addHandler(_DropOldestQueueHandler(log_queue))
+        _queue_listener = _FileQueueListener(log_queue, batch_handler, respect_handler_level=True)
+        _queue_listener.start()
+    
+    # Trading loggers cache which levels are enabled; re-read them for the new level
+    for trading_logger in list(_trading_loggers):
+        trading_logger.refresh_levels()
+    
+    _configured_key = key
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_logger(name: str) -> logging.Logger:
+    """Look up a logger once per name instead of locking the manager every time."""
+    return logging.getLogger(name)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -80,7 +293,7 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         logging.Logger: Configured logger instance
     """
-    return logging.getLogger(name)
+    return _cached_logger(name)
 
 
 class TradingLogger:
@@ -100,6 +313,21 @@ class TradingLogger:
         """
         self.logger = get_logger(name)
         self.trade_count = 0
+        # next() on a count is a single C call, so concurrent closes never lose an update
+        self._trade_counter = itertools.count(1)
+        self.refresh_levels()
+        _trading_loggers.add(self)
+    
+    def refresh_levels(self) -> None:
+        """
+        Re-read which levels the logger emits.
+        
+        The result is cached for the per-tick methods. setup_logging
+        refreshes every TradingLogger; call this after changing logger
+        levels any other way.
+        """
+        self._debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        self._info_enabled = self.logger.isEnabledFor(logging.INFO)
     
     def log_signal(self, signal_type: str, symbol: str, price: float, reason: str) -> None:
         """
@@ -111,9 +339,9 @@ class TradingLogger:
             price: Current price
             reason: Reason for the signal
         """
-        self.logger.info(
-            f"SIGNAL | {signal_type} | {symbol} | Price: {price:.2f} | Reason: {reason}"
-        )
+        if not self._info_enabled:
+            return
+        self.logger.info(_FMT_SIGNAL, signal_type, symbol, price, reason)
     
     def log_order(self, order_type: str, symbol: str, quantity: int, price: float, order_id: str) -> None:
         """
@@ -126,9 +354,7 @@ class TradingLogger:
             price: Order price
             order_id: Order ID from broker
         """
-        self.logger.info(
-            f"ORDER | {order_type} | {symbol} | Qty: {quantity} | Price: {price:.2f} | ID: {order_id}"
-        )
+        self.logger.info(_FMT_ORDER, order_type, symbol, quantity, price, order_id)
     
     def log_execution(self, symbol: str, quantity: int, price: float, commission: float) -> None:
         """
@@ -140,9 +366,7 @@ class TradingLogger:
             price: Execution price
             commission: Commission paid
         """
-        self.logger.info(
-            f"EXECUTION | {symbol} | Qty: {quantity} | Price: {price:.2f} | Commission: {commission:.2f}"
-        )
+        self.logger.info(_FMT_EXEC, symbol, quantity, price, commission)
     
     def log_trade_closed(self, symbol: str, pnl: float, duration: str, reason: str) -> None:
         """
@@ -154,12 +378,11 @@ class TradingLogger:
             duration: Trade duration
             reason: Reason for closing
         """
-        self.trade_count += 1
-        status = "PROFIT" if pnl > 0 else "LOSS"
-        
+        trade_number = next(self._trade_counter)
+        self.trade_count = trade_number
         self.logger.info(
-            f"TRADE CLOSED | {symbol} | {status}: {pnl:.2f} | Duration: {duration} | "
-            f"Reason: {reason} | Trade #{self.trade_count}"
+            _FMT_TRADE_CLOSED, symbol, _TRADE_STATUS[pnl > 0], pnl, duration, reason,
+            trade_number
         )
     
     def log_portfolio_status(self, total_value: float, cash: float, positions: int) -> None:
@@ -171,9 +394,7 @@ class TradingLogger:
             cash: Available cash
             positions: Number of open positions
         """
-        self.logger.info(
-            f"PORTFOLIO | Total: {total_value:.2f} | Cash: {cash:.2f} | Positions: {positions}"
-        )
+        self.logger.info(_FMT_PORTFOLIO, total_value, cash, positions)
     
     def log_error(self, error_type: str, message: str, symbol: str = None) -> None:
         """
@@ -184,8 +405,10 @@ class TradingLogger:
             message: Error message
             symbol: Related trading symbol (optional)
         """
-        symbol_part = f" | {symbol}" if symbol else ""
-        self.logger.error(f"ERROR | {error_type} | {message}{symbol_part}")
+        if symbol:
+            self.logger.error(_FMT_ERROR_SYMBOL, error_type, message, symbol)
+        else:
+            self.logger.error(_FMT_ERROR, error_type, message)
     
     def log_market_data(self, symbol: str, price: float, volume: int, oi: int = None) -> None:
         """
@@ -197,10 +420,90 @@ class TradingLogger:
             volume: Volume
             oi: Open Interest (optional)
         """
-        oi_part = f" | OI: {oi}" if oi is not None else ""
-        self.logger.debug(
-            f"MARKET DATA | {symbol} | Price: {price:.2f} | Volume: {volume}{oi_part}"
-        )
+        # Called on every tick; skip building the record when DEBUG is off
+        if not self._debug_enabled:
+            return
+        if oi is not None:
+            self.logger.debug(_FMT_MKT_OI, symbol, price, volume, oi)
+        else:
+            self.logger.debug(_FMT_MKT, symbol, price, volume)
+
+
+class TickRingLogger:
+    """
+    Buffer market data ticks in memory and log them in bulk.
+    
+    ``log_market_data`` only appends a tuple to a bounded ring buffer; no
+    LogRecord is built and nothing is formatted. ``flush`` turns the
+    buffered ticks into DEBUG records, stamped with the time each tick was
+    received, and is also run by stop_logging, so at interpreter exit. When
+    the buffer is full the oldest ticks are dropped.
+    """
+    
+    def __init__(self, name: str = "trading", maxlen: int = 10000) -> None:
+        """
+        Initialize tick ring logger.
+        
+        Args:
+            name: Logger name the ticks are written to
+            maxlen: Maximum number of ticks held between flushes
+        """
+        self.logger = get_logger(name)
+        self._buf: collections.deque = collections.deque(maxlen=maxlen)
+        _tick_loggers.add(self)
+    
+    def log_market_data(self, symbol: str, price: float, volume: int, oi: int = None) -> None:
+        """
+        Record a market data update.
+        
+        Args:
+            symbol: Trading symbol
+            price: Current price
+            volume: Volume
+            oi: Open Interest (optional)
+        """
+        self._buf.append((time.time(), symbol, price, volume, oi))
+    
+    def flush(self) -> None:
+        """Write the buffered ticks to the logger and empty the buffer."""
+        buf = self._buf
+        logger = self.logger
+        if not logger.isEnabledFor(logging.DEBUG):
+            buf.clear()
+            return
+        
+        while buf:
+            created, symbol, price, volume, oi = buf.popleft()
+            if oi is not None:
+                msg, args = _FMT_MKT_OI, (symbol, price, volume, oi)
+            else:
+                msg, args = _FMT_MKT, (symbol, price, volume)
+            record = logger.makeRecord(logger.name, logging.DEBUG, __file__, 0, msg, args, None)
+            record.created = created
+            record.msecs = int((created - int(created)) * 1000) + 0.0
+            logger.handle(record)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_trading_logger(name: str) -> TradingLogger:
+    """Create the TradingLogger for ``name`` on first use."""
+    return TradingLogger(name)
+
+
+def get_trading_logger(name: str = "trading") -> TradingLogger:
+    """
+    Get the shared TradingLogger for ``name``.
+    
+    Every call with the same name returns the same instance, so signal,
+    order and execution logging share one trade count.
+    
+    Args:
+        name: Logger name
+        
+    Returns:
+        TradingLogger: Process-wide trading logger for this name
+    """
+    return _shared_trading_logger(name)
 
 
 # Initialize default logging if not already configured
@@ -3,15 +3,21 @@ Pytest configuration and shared fixtures for SCLU tests.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from unittest.mock import Mock, MagicMock
 from pathlib import Path
+import sys
 import tempfile
 import shutil
 
-from src.sclu.utils import Config
-from src.sclu.api import KiteClient
+# Import the package as `sclu`, the same name the scripts and examples use;
+# numba's on-disk kernel cache records the module name it was built under
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sclu.utils import Config
+from sclu.api import KiteClient
 
 
 @pytest.fixture
@@ -26,49 +32,58 @@ def sample_config():
     return config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ohlcv_data():
-    """Provide sample OHLCV data for testing."""
+    """
+    Provide sample OHLCV data for testing.
+    
+    Built once per session and shared; tests must not modify it in place
+    (take a ``.copy()`` first).
+    """
     dates = pd.date_range(
         start=datetime.now() - timedelta(days=10),
         end=datetime.now(),
-        freq='3T'
+        freq='3min'
     )
+    idx = np.arange(len(dates), dtype=np.float64)
     
     data = {
-        'open': [100 + i * 0.1 for i in range(len(dates))],
-        'high': [101 + i * 0.1 for i in range(len(dates))],
-        'low': [99 + i * 0.1 for i in range(len(dates))],
-        'close': [100.5 + i * 0.1 for i in range(len(dates))],
-        'volume': [1000 + i * 10 for i in range(len(dates))],
-        'oi': [500000 + i * 1000 for i in range(len(dates))]
+        'open': 100.0 + 0.1 * idx,
+        'high': 101.0 + 0.1 * idx,
+        'low': 99.0 + 0.1 * idx,
+        'close': 100.5 + 0.1 * idx,
+        'volume': (1000 + 10 * idx).astype(np.int64),
+        'oi': (500000 + 1000 * idx).astype(np.int64)
     }
     
     df = pd.DataFrame(data, index=dates)
     return df
 
 
-@pytest.fixture
-def sample_csv_data(sample_ohlcv_data, tmp_path):
-    """Create a temporary CSV file with sample data."""
-    csv_file = tmp_path / "sample_data.csv"
+@pytest.fixture(scope="session")
+def sample_csv_data(sample_ohlcv_data, tmp_path_factory):
+    """
+    Create a temporary CSV file with sample data.
     
-    # Reset index to include datetime as a column
-    data_with_datetime = sample_ohlcv_data.reset_index()
-    data_with_datetime.rename(columns={'index': 'datetime'}, inplace=True)
+    Written once per session; tests must not modify the file.
+    """
+    csv_file = tmp_path_factory.mktemp("data") / "sample_data.csv"
     
-    # Format datetime to match expected format
-    data_with_datetime['datetime'] = data_with_datetime['datetime'].dt.strftime(
-        '%Y-%m-%d %H:%M:%S+05:30'
+    # Write the index as the datetime column, formatted as the loader expects
+    sample_ohlcv_data.to_csv(
+        csv_file, index_label='datetime', date_format='%Y-%m-%d %H:%M:%S+05:30'
     )
-    
-    data_with_datetime.to_csv(csv_file, index=False)
     return str(csv_file)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_kite_client():
-    """Provide a mocked Kite client for testing."""
+    """
+    Provide a mocked Kite client for testing.
+    
+    Shared across the session, so call history accumulates; call
+    ``reset_mock()`` before asserting on calls.
+    """
     mock_client = Mock(spec=KiteClient)
     
     # Mock typical responses
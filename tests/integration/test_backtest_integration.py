@@ -8,8 +8,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import backtrader as bt
-from src.sclu.strategies import SCLUStrategy
-from src.sclu.data import DataLoader
+from sclu.strategies import SCLUStrategy
+from sclu.data import DataLoader
 
 
 @pytest.mark.integration
@@ -72,12 +72,24 @@ class TestBacktestIntegration:
         
         results = []
         
+        # Parse the CSV once; each run gets its own feed over the same arrays
+        df = DataLoader().load_csv_data(sample_csv_data)
+        
         for params in test_params:
             cerebro = bt.Cerebro()
             
-            # Load data
-            loader = DataLoader()
-            data_feed = loader.create_backtrader_feed(sample_csv_data)
+            # Feeds keep per-run state, so build a new one on a shallow copy
+            data_feed = bt.feeds.PandasData(
+                dataname=df.copy(deep=False),
+                datetime=None,  # Use index
+                open='open',
+                high='high',
+                low='low',
+                close='close',
+                volume='volume',
+                openinterest='oi',
+                timeframe=bt.TimeFrame.Minutes
+            )
             cerebro.resampledata(data_feed, timeframe=bt.TimeFrame.Minutes, compression=3)
             
             # Add strategy with specific parameters
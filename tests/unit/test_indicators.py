@@ -5,149 +5,143 @@ Unit tests for SCLU indicators.
 import pytest
 import numpy as np
 import pandas as pd
-from unittest.mock import Mock
+import backtrader as bt
 
-from src.sclu.indicators.open_interest import (
+from sclu.indicators.open_interest import (
     OpenInterestIndicator,
     OpenInterestDerivative,
-    OpenInterestSecondDerivative
+    OpenInterestSecondDerivative,
+    OpenInterestAnalytics
 )
 
 
+@pytest.fixture
+def oi_data():
+    """Provide 200 bars of OHLCV+OI data with a non-linear open interest."""
+    rng = np.random.default_rng(7)
+    n = 200
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+
+    return pd.DataFrame({
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.integers(1000, 5000, n).astype(float),
+        'openinterest': 500000 + np.cumsum(rng.normal(0, 2000, n)).round()
+    }, index=pd.date_range('2024-01-01 09:15', periods=n, freq='3min'))
+
+
+def run_indicator(df, indicator_cls, runonce=True, **kwargs):
+    """Run ``indicator_cls`` over ``df`` in a cerebro and return the indicator."""
+    class Harness(bt.Strategy):
+        def __init__(self):
+            self.indicator = indicator_cls(self.data, **kwargs)
+
+    cerebro = bt.Cerebro(runonce=runonce, stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(Harness)
+    return cerebro.run()[0].indicator
+
+
+def line_values(line):
+    """Return the values of a backtrader line as a NumPy array."""
+    return np.asarray(line.array)
+
+
+@pytest.mark.parametrize("runonce", [True, False])
 class TestOpenInterestIndicator:
     """Test cases for OpenInterestIndicator."""
-    
-    def test_initialization(self):
-        """Test indicator initialization."""
-        mock_data = Mock()
-        mock_data.openinterest = [1000, 1100, 1200, 1150, 1300]
-        
-        indicator = OpenInterestIndicator(mock_data)
-        assert indicator is not None
-        assert hasattr(indicator, 'lines')
-        assert 'oi' in indicator.lines._getnames()
-    
-    def test_next_calculation(self):
-        """Test the next() method calculation."""
-        mock_data = Mock()
-        mock_data.openinterest = Mock()
-        mock_data.openinterest.__getitem__ = Mock(return_value=1500)
-        
-        indicator = OpenInterestIndicator(mock_data)
-        indicator.lines = Mock()
-        indicator.lines.oi = Mock()
-        
-        indicator.next()
-        
-        # Verify that the OI value is set correctly
-        indicator.lines.oi.__setitem__.assert_called_with(0, 1500)
 
+    def test_tracks_open_interest(self, oi_data, runonce):
+        """Test that the oi line repeats the feed's open interest."""
+        indicator = run_indicator(oi_data, OpenInterestIndicator, runonce)
 
+        assert 'oi' in indicator.lines.getlinealiases()
+        np.testing.assert_array_equal(
+            line_values(indicator.lines.oi), oi_data['openinterest'].to_numpy()
+        )
+
+
+@pytest.mark.parametrize("runonce", [True, False])
 class TestOpenInterestDerivative:
     """Test cases for OpenInterestDerivative."""
-    
-    def test_initialization(self):
-        """Test derivative indicator initialization."""
-        mock_data = Mock()
-        indicator = OpenInterestDerivative(mock_data)
-        
-        assert indicator is not None
-        assert hasattr(indicator, 'params')
-        assert indicator.params.time_period == 3  # Default value
-    
-    def test_derivative_calculation(self):
+
+    def test_derivative_calculation(self, oi_data, runonce):
         """Test first derivative calculation."""
-        mock_data = Mock()
-        
-        # Mock the openinterest data
-        oi_values = [1000, 1100, 1200, 1150, 1300]
-        mock_data.openinterest = Mock()
-        mock_data.openinterest.__getitem__ = Mock(side_effect=lambda x: oi_values[x] if x < 0 else oi_values[0])
-        mock_data.openinterest.__len__ = Mock(return_value=len(oi_values))
-        
-        indicator = OpenInterestDerivative(mock_data)
-        indicator.lines = Mock()
-        indicator.lines.doi = Mock()
-        
-        # Simulate calculation for the latest value
-        indicator.next()
-        
-        # Expected calculation: (1300 - 1150) / 3 = 50
-        expected_doi = (oi_values[0] - oi_values[-1]) / 3
-        indicator.lines.doi.__setitem__.assert_called_with(0, expected_doi)
-    
-    def test_insufficient_data(self):
-        """Test behavior with insufficient data."""
-        mock_data = Mock()
-        mock_data.openinterest = Mock()
-        mock_data.openinterest.__len__ = Mock(return_value=0)
-        
-        indicator = OpenInterestDerivative(mock_data)
-        indicator.lines = Mock()
-        indicator.lines.doi = Mock()
-        
-        indicator.next()
-        
-        # Should set DOI to 0 when insufficient data
-        indicator.lines.doi.__setitem__.assert_called_with(0, 0)
+        indicator = run_indicator(oi_data, OpenInterestDerivative, runonce)
+        oi = oi_data['openinterest'].to_numpy()
+        doi = line_values(indicator.lines.doi)
+
+        assert indicator.params.time_period == 3  # Default value
+        np.testing.assert_allclose(doi[1:], np.diff(oi) / 3)
+        assert indicator.lines.doi[0] == pytest.approx((oi[-1] - oi[-2]) / 3)
+
+    def test_custom_time_period(self, oi_data, runonce):
+        """Test that time_period scales the derivative."""
+        indicator = run_indicator(oi_data, OpenInterestDerivative, runonce, time_period=5)
+        oi = oi_data['openinterest'].to_numpy()
 
+        np.testing.assert_allclose(line_values(indicator.lines.doi)[1:], np.diff(oi) / 5)
 
+    def test_minimum_period(self, oi_data, runonce):
+        """Test that the first bar is left unset instead of reading oi[-1]."""
+        indicator = run_indicator(oi_data, OpenInterestDerivative, runonce)
+
+        assert indicator._minperiod == 2
+        assert np.isnan(line_values(indicator.lines.doi)[0])
+
+
+@pytest.mark.parametrize("runonce", [True, False])
 class TestOpenInterestSecondDerivative:
     """Test cases for OpenInterestSecondDerivative."""
-    
-    def test_initialization(self):
-        """Test second derivative indicator initialization."""
-        mock_data = Mock()
-        indicator = OpenInterestSecondDerivative(mock_data)
-        
-        assert indicator is not None
-        assert hasattr(indicator, 'params')
-        assert indicator.params.time_period == 3  # Default value
-    
-    def test_second_derivative_calculation(self):
+
+    def test_second_derivative_calculation(self, oi_data, runonce):
         """Test second derivative calculation."""
-        mock_data = Mock()
-        
-        # Mock the openinterest data
-        oi_values = [1000, 1100, 1200, 1150, 1300]  # Current at index 0
-        mock_data.openinterest = Mock()
-        mock_data.openinterest.__getitem__ = Mock(side_effect=lambda x: {
-            0: oi_values[0],    # current
-            -1: oi_values[1],   # previous
-            -2: oi_values[2]    # previous-2
-        }.get(x, oi_values[0]))
-        mock_data.openinterest.__len__ = Mock(return_value=len(oi_values))
-        
-        indicator = OpenInterestSecondDerivative(mock_data)
-        indicator.lines = Mock()
-        indicator.lines.d2oi = Mock()
-        
-        indicator.next()
-        
-        # Expected: (1000 + 1200 - 2*1100) / 9 = 0
-        expected_d2oi = (oi_values[0] + oi_values[2] - 2 * oi_values[1]) / 9
-        indicator.lines.d2oi.__setitem__.assert_called_with(0, expected_d2oi)
-    
-    def test_insufficient_data_handling(self):
-        """Test handling of insufficient data for second derivative."""
-        mock_data = Mock()
-        mock_data.openinterest = Mock()
-        mock_data.openinterest.__len__ = Mock(return_value=1)
-        
-        indicator = OpenInterestSecondDerivative(mock_data)
-        indicator.lines = Mock()
-        indicator.lines.d2oi = Mock()
-        
-        indicator.next()
-        
-        # Should set D2OI to 0 when insufficient data
-        indicator.lines.d2oi.__setitem__.assert_called_with(0, 0)
-    
-    def test_minimum_period(self):
+        indicator = run_indicator(oi_data, OpenInterestSecondDerivative, runonce)
+        oi = oi_data['openinterest'].to_numpy()
+
+        assert indicator.params.time_period == 3  # Default value
+        # f(n) + f(n-2) - 2*f(n-1), over time_period squared
+        np.testing.assert_allclose(
+            line_values(indicator.lines.d2oi)[2:], (oi[2:] + oi[:-2] - 2 * oi[1:-1]) / 9
+        )
+
+    def test_minimum_period(self, oi_data, runonce):
         """Test that minimum period is set correctly."""
-        mock_data = Mock()
-        indicator = OpenInterestSecondDerivative(mock_data)
-        
-        # Should have addminperiod called to ensure enough data
-        # This is typically handled by backtrader's framework
-        assert hasattr(indicator, 'addminperiod')
+        indicator = run_indicator(oi_data, OpenInterestSecondDerivative, runonce)
+
+        # next() only runs once oi[-2] exists
+        assert indicator._minperiod == 3
+        assert np.isnan(line_values(indicator.lines.d2oi)[:2]).all()
+
+
+@pytest.mark.parametrize("runonce", [True, False])
+class TestOpenInterestAnalytics:
+    """Test cases for OpenInterestAnalytics."""
+
+    def test_matches_separate_indicators(self, oi_data, runonce):
+        """Test that the fused lines match the individual indicators."""
+        analytics = run_indicator(oi_data, OpenInterestAnalytics, runonce)
+        doi = run_indicator(oi_data, OpenInterestDerivative, runonce)
+        d2oi = run_indicator(oi_data, OpenInterestSecondDerivative, runonce)
+
+        np.testing.assert_array_equal(
+            line_values(analytics.lines.oi), oi_data['openinterest'].to_numpy()
+        )
+        np.testing.assert_array_equal(
+            line_values(analytics.lines.doi)[1:], line_values(doi.lines.doi)[1:]
+        )
+        np.testing.assert_array_equal(
+            line_values(analytics.lines.d2oi)[2:], line_values(d2oi.lines.d2oi)[2:]
+        )
+
+    def test_start_up_values(self, oi_data, runonce):
+        """Test the values produced before enough history exists."""
+        analytics = run_indicator(oi_data, OpenInterestAnalytics, runonce)
+        oi = oi_data['openinterest'].to_numpy()
+
+        assert line_values(analytics.lines.doi)[0] == 0
+        assert line_values(analytics.lines.d2oi)[0] == 0
+        # The missing oi[-2] repeats oi[-1] on the second bar
+        assert line_values(analytics.lines.d2oi)[1] == pytest.approx((oi[1] - oi[0]) / 9)
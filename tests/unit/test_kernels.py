@@ -0,0 +1,71 @@
+"""
+Unit tests for the compiled SCLU kernels.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from sclu.kernels import _bollinger, _rolling_zscore, _rsi
+
+
+@pytest.fixture
+def close_with_nan():
+    """Provide 5000 close prices with a single NaN early in the series."""
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, 5000))
+    close[50] = np.nan
+    return close
+
+
+class TestBollinger:
+    """Test cases for the Bollinger band kernel."""
+
+    def test_nan_only_affects_its_windows(self, close_with_nan):
+        """Test that a NaN close only blanks the windows containing it, like pandas."""
+        middle, upper, lower, width, position = _bollinger(close_with_nan, 20, 2.0)
+
+        rolling = pd.Series(close_with_nan).rolling(20)
+        expected_middle = rolling.mean().to_numpy()
+        expected_band = 2.0 * rolling.std().to_numpy()
+
+        np.testing.assert_array_equal(np.isnan(middle), np.isnan(expected_middle))
+        assert np.isnan(middle).sum() == 19 + 20
+        np.testing.assert_allclose(middle, expected_middle, equal_nan=True)
+        np.testing.assert_allclose(upper, expected_middle + expected_band, equal_nan=True)
+        np.testing.assert_allclose(lower, expected_middle - expected_band, equal_nan=True)
+        np.testing.assert_allclose(width, 2 * expected_band, equal_nan=True)
+        np.testing.assert_allclose(
+            position, (close_with_nan - lower) / (upper - lower), equal_nan=True
+        )
+
+
+class TestRollingZscore:
+    """Test cases for the rolling z-score kernel."""
+
+    def test_nan_only_affects_its_windows(self, close_with_nan):
+        """Test that a NaN value only blanks the windows containing it, like pandas."""
+        zscore = _rolling_zscore(close_with_nan, 20)
+
+        rolling = pd.Series(close_with_nan).rolling(20)
+        expected = ((close_with_nan - rolling.mean()) / rolling.std()).to_numpy()
+
+        assert np.isnan(zscore).sum() == 19 + 20
+        np.testing.assert_allclose(zscore, expected, rtol=1e-6, equal_nan=True)
+
+
+class TestRsi:
+    """Test cases for the RSI kernel."""
+
+    def test_nan_restarts_seed(self, close_with_nan):
+        """Test that a NaN close blanks its bars and restarts the Wilder seed."""
+        rsi = _rsi(close_with_nan, 14)
+
+        # Changes into and out of the NaN are NaN, then 14 changes re-seed
+        assert np.isnan(rsi[:14]).all()
+        assert not np.isnan(rsi[14:50]).any()
+        assert np.isnan(rsi[50:65]).all()
+        assert not np.isnan(rsi[65:]).any()
+
+        # After the gap the RSI matches a fresh run over the clean tail
+        np.testing.assert_allclose(rsi[51:], _rsi(close_with_nan[51:], 14))
@@ -2,252 +2,228 @@
 Unit tests for SCLU trading strategy.
 """
 
+import copy
+import logging
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime
+import numpy as np
+import pandas as pd
+import backtrader as bt
+from unittest.mock import Mock, patch
+
+from sclu.strategies.sclu_strategy import SCLUStrategy
+
+# OI moving average the mocked strategy sees, and the default signal
+# thresholds at that level
+_OI_MA = 500000.0
+_ENTRY_D2OI = -SCLUStrategy.params.entry_threshold_pct * _OI_MA
+_EXIT_DOI = -SCLUStrategy.params.exit_doi_threshold_pct * _OI_MA
+_EXIT_D2OI = -SCLUStrategy.params.exit_d2oi_threshold_pct * _OI_MA
+
+
+class _StrategyUnderTest(SCLUStrategy):
+    """SCLUStrategy whose ``position`` can be replaced by a test double."""
+
+    position = None
+
+
+class _Idx:
+    """Stand-in for an indicator line whose every index gives one value."""
+
+    __slots__ = ('v',)
+
+    def __init__(self, v):
+        self.v = v
+
+    def __getitem__(self, _):
+        return self.v
 
-from src.sclu.strategies.sclu_strategy import SCLUStrategy
+
+@pytest.fixture(scope="module")
+def _base_strategy():
+    """
+    Build one strategy instance with mocked indicators for the module.
+
+    The strategy is created by a cerebro run over fewer bars than the OI
+    moving average needs, so next() never runs on the real feed.
+    """
+    n = 10
+    df = pd.DataFrame({
+        'open': 100.0,
+        'high': 101.0,
+        'low': 99.0,
+        'close': 100.0,
+        'volume': 1000.0,
+        'openinterest': 500000 + 1000.0 * np.arange(n)
+    }, index=pd.date_range('2024-01-01 09:15', periods=n, freq='3min'))
+
+    cerebro = bt.Cerebro(runonce=False, stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(_StrategyUnderTest)
+    strategy = cerebro.run()[0]
+
+    # Mock the indicators
+    strategy.oi_indicator = object()
+    strategy.doi_indicator = _Idx(0.0)
+    strategy.d2oi_indicator = _Idx(0.0)
+    strategy.oi_ma = _Idx(_OI_MA)
+
+    # Mock other attributes
+    strategy.order = None
+    strategy.dataclose = _Idx(100.0)
+    return strategy
+
+
+@pytest.fixture
+def strategy(_base_strategy):
+    """Provide a shallow copy of the module strategy with a flat position."""
+    strategy = copy.copy(_base_strategy)
+    strategy.position = SimpleNamespace(size=0)
+    return strategy
 
 
 class TestSCLUStrategy:
     """Test cases for SCLU trading strategy."""
-    
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        # Create a mock data feed
-        self.mock_data = Mock()
-        self.mock_data.close = Mock()
-        self.mock_data.openinterest = Mock()
-        self.mock_data.datetime = Mock()
-        self.mock_data.datetime.date.return_value = datetime.now().date()
-        
-        # Create strategy instance with mock data
-        self.strategy = SCLUStrategy()
-        self.strategy.datas = [self.mock_data]
-        
-        # Mock the indicators
-        self.strategy.oi_indicator = Mock()
-        self.strategy.doi_indicator = Mock()
-        self.strategy.d2oi_indicator = Mock()
-        self.strategy.oi_ma = Mock()
-        
-        # Mock other attributes
-        self.strategy.position = Mock()
-        self.strategy.position.size = 0
-        self.strategy.order = None
-        self.strategy.dataclose = Mock()
-        self.strategy.dataclose.__getitem__ = Mock(return_value=100.0)
-    
+
     def test_initialization(self):
         """Test strategy initialization."""
-        strategy = SCLUStrategy()
-        
+        # The class carries the defaults every instance starts from
+        params = SCLUStrategy.params
+
         # Check that strategy has required parameters
-        assert hasattr(strategy, 'params')
-        assert hasattr(strategy.params, 'sensitivity')
-        assert hasattr(strategy.params, 'feeling')
-        assert hasattr(strategy.params, 'oi_ma_period')
-        
+        assert hasattr(params, 'oi_ma_period')
+        assert hasattr(params, 'entry_threshold_pct')
+        assert hasattr(params, 'exit_doi_threshold_pct')
+        assert hasattr(params, 'exit_d2oi_threshold_pct')
+
         # Check default parameter values
-        assert strategy.params.sensitivity == 10/1000
-        assert strategy.params.feeling == 3000000
-        assert strategy.params.oi_ma_period == 30
-    
-    def test_log_method(self):
+        assert params.oi_ma_period == 50
+        assert params.entry_threshold_pct == 0.005
+        assert params.exit_doi_threshold_pct == 0.001
+        assert params.exit_d2oi_threshold_pct == 0.005
+
+    def test_log_method(self, strategy, caplog):
         """Test the logging method."""
-        with patch('builtins.print') as mock_print:
-            self.strategy.log("Test message")
-            mock_print.assert_called_once()
-            args = mock_print.call_args[0][0]
-            assert "Test message" in args
-    
-    def test_should_enter_long_buy_signal(self):
-        """Test buy signal generation."""
-        # Set up indicators for buy signal
-        self.strategy.doi_indicator.__getitem__ = Mock(return_value=-1.0)
-        self.strategy.d2oi_indicator.__getitem__ = Mock(return_value=-500.0)
-        
-        result = self.strategy._should_enter_long()
-        assert result is True
-    
-    def test_should_enter_long_no_signal(self):
-        """Test no buy signal when conditions not met."""
-        # Set up indicators for no signal
-        self.strategy.doi_indicator.__getitem__ = Mock(return_value=1.0)  # Positive DOI
-        self.strategy.d2oi_indicator.__getitem__ = Mock(return_value=0.0)
-        
-        result = self.strategy._should_enter_long()
-        assert result is False
-    
-    def test_should_exit_long_doi_exit(self):
-        """Test exit signal based on DOI."""
-        # Set up indicators for DOI-based exit
-        sens = self.strategy.params.sensitivity
-        feel = self.strategy.params.feeling
-        
-        self.strategy.doi_indicator.__getitem__ = Mock(return_value=sens * feel * 0.5)  # Above threshold
-        self.strategy.d2oi_indicator.__getitem__ = Mock(return_value=-100.0)
-        
-        result = self.strategy._should_exit_long()
-        assert result is True
-    
-    def test_should_exit_long_d2oi_exit(self):
-        """Test exit signal based on D2OI."""
-        # Set up indicators for D2OI-based exit
-        sens = self.strategy.params.sensitivity
-        feel = self.strategy.params.feeling
-        
-        self.strategy.doi_indicator.__getitem__ = Mock(return_value=-100.0)
-        self.strategy.d2oi_indicator.__getitem__ = Mock(return_value=sens * feel * 0.05)  # Above threshold
-        
-        result = self.strategy._should_exit_long()
-        assert result is True
-    
-    def test_check_stop_loss_triggered(self):
-        """Test stop loss functionality."""
-        self.strategy.position.size = 1  # In position
-        self.strategy.buyprice = 100.0
-        self.strategy.dataclose.__getitem__ = Mock(return_value=95.0)  # 5% loss
-        
-        result = self.strategy._check_stop_loss_take_profit()
-        assert result is True
-    
-    def test_check_take_profit_triggered(self):
-        """Test take profit functionality."""
-        self.strategy.position.size = 1  # In position
-        self.strategy.buyprice = 100.0
-        self.strategy.dataclose.__getitem__ = Mock(return_value=110.0)  # 10% gain
-        
-        result = self.strategy._check_stop_loss_take_profit()
-        assert result is True
-    
-    def test_check_stop_loss_not_triggered(self):
-        """Test stop loss not triggered when within limits."""
-        self.strategy.position.size = 1  # In position
-        self.strategy.buyprice = 100.0
-        self.strategy.dataclose.__getitem__ = Mock(return_value=98.0)  # 2% loss (within limit)
-        
-        result = self.strategy._check_stop_loss_take_profit()
-        assert result is False
-    
-    def test_next_method_buy_signal(self):
-        """Test next() method with buy signal."""
-        # Set up for buy signal
-        self.strategy.position.size = 0  # Not in position
-        self.strategy.order = None
-        
-        # Mock the signal generation methods
-        with patch.object(self.strategy, '_should_enter_long', return_value=True), \
-             patch.object(self.strategy, 'buy') as mock_buy:
-            
-            self.strategy.next()
-            mock_buy.assert_called_once()
-    
-    def test_next_method_sell_signal(self):
-        """Test next() method with sell signal."""
-        # Set up for sell signal
-        self.strategy.position.size = 1  # In position
-        self.strategy.order = None
-        
-        # Mock the signal generation methods
-        with patch.object(self.strategy, '_should_exit_long', return_value=True), \
-             patch.object(self.strategy, '_check_stop_loss_take_profit', return_value=False), \
-             patch.object(self.strategy, 'sell') as mock_sell:
-            
-            self.strategy.next()
-            mock_sell.assert_called_once()
-    
-    def test_next_method_pending_order(self):
-        """Test next() method with pending order."""
-        # Set up with pending order
-        self.strategy.order = Mock()  # Pending order
-        
-        with patch.object(self.strategy, '_should_enter_long') as mock_enter, \
-             patch.object(self.strategy, 'buy') as mock_buy:
-            
-            self.strategy.next()
-            
-            # Should not place new order when one is pending
-            mock_enter.assert_not_called()
-            mock_buy.assert_not_called()
-    
-    def test_notify_order_completed_buy(self):
-        """Test order notification for completed buy order."""
-        order = Mock()
-        order.status = order.Completed
-        order.isbuy.return_value = True
-        order.executed.price = 50.0
-        order.executed.value = 1250.0
-        order.executed.comm = 1.25
-        
-        with patch.object(self.strategy, 'log') as mock_log:
-            self.strategy.notify_order(order)
-            mock_log.assert_called()
-            assert self.strategy.buyprice == 50.0
-            assert self.strategy.buycomm == 1.25
-    
-    def test_notify_order_completed_sell(self):
-        """Test order notification for completed sell order."""
+        with caplog.at_level(logging.INFO, logger='sclu.strategies.sclu_strategy'):
+            strategy.log("Test message")
+        assert "Test message" in caplog.text
+
+    @pytest.mark.parametrize("size,doi,d2oi,method,expected", [
+        (0, -1.0, 2 * _ENTRY_D2OI, "buy", True),  # DOI negative, D2OI below entry threshold
+        (0, 1.0, 0.0, "buy", False),  # Positive DOI
+        (1, 0.5 * _EXIT_DOI, 2 * _EXIT_D2OI, "sell", True),  # DOI above exit threshold
+        (1, 2 * _EXIT_DOI, 0.5 * _EXIT_D2OI, "sell", True),  # D2OI above exit threshold
+    ])
+    def test_signal(self, strategy, size, doi, d2oi, method, expected):
+        """Test entry and exit signals from the OI derivatives."""
+        strategy.position.size = size
+        strategy.doi_indicator = _Idx(doi)
+        strategy.d2oi_indicator = _Idx(d2oi)
+
+        with patch.object(strategy, method) as mock_order:
+            strategy.next()
+            assert mock_order.called is expected
+
+    @pytest.mark.parametrize("close_price,expected", [
+        (80.0, True),  # 20% loss
+        (135.0, True),  # 35% gain
+        (98.0, False),  # 2% loss (within limit)
+    ])
+    def test_stop_loss_take_profit(self, strategy, close_price, expected):
+        """Test stop loss and take profit exits."""
+        strategy.position.size = 1  # In position
+        strategy.buyprice = 100.0
+        # No strategy exit, so only the stop loss / take profit can sell
+        strategy.doi_indicator = _Idx(2 * _EXIT_DOI)
+        strategy.d2oi_indicator = _Idx(2 * _EXIT_D2OI)
+        strategy.dataclose = _Idx(close_price)
+
+        with patch.object(strategy, 'sell') as mock_sell:
+            strategy.next()
+            assert mock_sell.called is expected
+
+    @pytest.mark.parametrize("position_size,order,enter,expect_buy,expect_sell", [
+        (0, None, True, True, False),  # Buy signal
+        (1, None, False, False, True),  # Sell signal: DOI of 0 is above the exit threshold
+        (0, object(), True, False, False),  # Pending order
+    ])
+    def test_next_method(self, strategy, position_size, order, enter, expect_buy, expect_sell):
+        """Test the orders next() places."""
+        strategy.position.size = position_size
+        strategy.order = order
+
+        with patch.multiple(
+            strategy,
+            _is_short_covering_signal=Mock(return_value=enter),
+            buy=Mock(),
+            sell=Mock()
+        ):
+            strategy.next()
+
+            assert strategy.buy.called is expect_buy
+            assert strategy.sell.called is expect_sell
+            if order is not None:
+                # Should not look for signals when an order is pending
+                strategy._is_short_covering_signal.assert_not_called()
+
+    @pytest.mark.parametrize("is_buy,price,value,comm,expect_buyprice", [
+        (True, 50.0, 1250.0, 1.25, 50.0),
+        (False, 55.0, 1375.0, 1.375, None),
+    ])
+    def test_notify_order_completed(self, strategy, is_buy, price, value, comm, expect_buyprice):
+        """Test order notification for completed buy and sell orders."""
         order = Mock()
         order.status = order.Completed
-        order.isbuy.return_value = False
-        order.executed.price = 55.0
-        order.executed.value = 1375.0
-        order.executed.comm = 1.375
-        
-        with patch.object(self.strategy, 'log') as mock_log:
-            self.strategy.notify_order(order)
+        order.isbuy.return_value = is_buy
+        order.executed.price = price
+        order.executed.value = value
+        order.executed.comm = comm
+        strategy._verbose = True
+
+        with patch.object(strategy, '_log_event') as mock_log:
+            strategy.notify_order(order)
             mock_log.assert_called()
-    
-    def test_notify_trade_closed(self):
+            if expect_buyprice is not None:
+                assert strategy.buyprice == expect_buyprice
+                assert strategy.buycomm == comm
+
+    @pytest.mark.parametrize("pnl,pnlcomm,expected_wins", [
+        (125.0, 122.5, 1),  # Winning trade
+        (-75.0, -76.25, 0),  # Losing trade
+    ])
+    def test_notify_trade(self, strategy, pnl, pnlcomm, expected_wins):
         """Test trade notification when trade is closed."""
         trade = Mock()
         trade.isclosed = True
-        trade.pnl = 125.0
-        trade.pnlcomm = 122.5
-        
-        self.strategy.trade_count = 0
-        self.strategy.winning_trades = 0
-        
-        with patch.object(self.strategy, 'log') as mock_log:
-            self.strategy.notify_trade(trade)
-            mock_log.assert_called()
-            assert self.strategy.trade_count == 1
-            assert self.strategy.winning_trades == 1  # Positive PnL
-    
-    def test_notify_trade_losing_trade(self):
-        """Test trade notification for losing trade."""
-        trade = Mock()
-        trade.isclosed = True
-        trade.pnl = -75.0
-        trade.pnlcomm = -76.25
-        
-        self.strategy.trade_count = 0
-        self.strategy.winning_trades = 0
-        
-        with patch.object(self.strategy, 'log') as mock_log:
-            self.strategy.notify_trade(trade)
-            mock_log.assert_called()
-            assert self.strategy.trade_count == 1
-            assert self.strategy.winning_trades == 0  # Negative PnL
-    
-    def test_strategy_parameters_customization(self):
+        trade.pnl = pnl
+        trade.pnlcomm = pnlcomm
+
+        strategy.trade_count = 0
+        strategy.winning_trades = 0
+
+        strategy.notify_trade(trade)
+        assert strategy.trade_count == 1
+        assert strategy.winning_trades == expected_wins
+
+    def test_strategy_parameters_customization(self, strategy):
         """Test strategy with custom parameters."""
         custom_params = {
-            'sensitivity': 0.005,
-            'feeling': 5000000,
             'oi_ma_period': 20,
+            'entry_threshold_pct': 0.01,
+            'exit_doi_threshold_pct': 0.002,
             'stop_loss_pct': 0.03,
             'take_profit_pct': 0.15
         }
-        
-        # This would typically be done when adding strategy to cerebro
-        strategy = SCLUStrategy()
+
+        # Copies share params with the module strategy, so customize a copy of them
+        params = copy.copy(strategy.params)
         for param, value in custom_params.items():
-            setattr(strategy.params, param, value)
-        
-        assert strategy.params.sensitivity == 0.005
-        assert strategy.params.feeling == 5000000
-        assert strategy.params.oi_ma_period == 20
-        assert strategy.params.stop_loss_pct == 0.03
-        assert strategy.params.take_profit_pct == 0.15
+            setattr(params, param, value)
+
+        assert params.oi_ma_period == 20
+        assert params.entry_threshold_pct == 0.01
+        assert params.exit_doi_threshold_pct == 0.002
+        assert params.stop_loss_pct == 0.03
+        assert params.take_profit_pct == 0.15
+        assert strategy.params.oi_ma_period == 50